@@ -0,0 +1,299 @@
+"""
+Benchmark export and import of a large synthetic URLconf.
+
+Usage, from the repo root:
+
+    PYTHONPATH=src python -m benchmarks.run_benchmarks --output benchmarks/results/before.json
+    # ... make changes ...
+    PYTHONPATH=src python -m benchmarks.run_benchmarks --compare benchmarks/results/before.json
+
+Run with --help for the URLconf options.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.conf.global_settings import LANGUAGES as ALL_LANGUAGES
+
+IMPORTED_URLCONF = "benchmark_imported_urlconf"
+LAZY_IMPORTED_URLCONF = "benchmark_lazy_imported_urlconf"
+
+
+def _configure_django(languages):
+    if settings.configured:
+        return
+    settings.configure(
+        USE_I18N=True,
+        LANGUAGE_CODE=languages[0] if languages else "en-us",
+        LANGUAGES=[(language, language) for language in languages] or [("en-us", "English")],
+        SECRET_KEY="benchmark",
+        ROOT_URLCONF="benchmark_urlconf",
+    )
+    django.setup()
+
+
+def _get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time(function, repeat):
+    """
+    :param function: function to time
+    :param repeat: int - number of times to call the function
+    :return: tuple(float - fastest time in seconds, the last result)
+    """
+    best_time = None
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function()
+        elapsed_time = time.perf_counter() - start_time
+        if best_time is None or elapsed_time < best_time:
+            best_time = elapsed_time
+    return best_time, result
+
+
+def run_benchmarks(options):
+    """
+    :param options: argparse.Namespace from get_parser
+    :return: dict of results, that can be saved as JSON
+    """
+    languages = [language for language, _ in ALL_LANGUAGES[: options.languages]]
+    _configure_django(languages)
+
+    from django.test import override_settings
+    from django.urls import clear_url_caches, reverse
+    from django.utils import translation
+
+    from benchmarks.urlconf_generator import generate_urlconf
+    from django_urlconf_export import compression, export_urlconf, import_urlconf
+    from django_urlconf_export.reverser import Reverser
+
+    url_names = generate_urlconf(
+        patterns=options.patterns,
+        include_depth=options.include_depth,
+        namespaces=options.namespaces,
+        regex_ratio=options.regex_ratio,
+        languages=languages,
+        translated_ratio=options.translated_ratio,
+        seed=options.seed,
+    )
+    timings = {}
+
+    def export():
+        clear_url_caches()
+        return export_urlconf.as_json("benchmark_urlconf")
+
+    timings["export"], json_urlpatterns = _time(export, options.repeat)
+    timings["serialize"], json_string = _time(lambda: json.dumps(json_urlpatterns), options.repeat)
+    timings["deserialize"], _ = _time(lambda: json.loads(json_string), options.repeat)
+
+    def import_json():
+        import_urlconf.from_json(json_urlpatterns, urlconf=IMPORTED_URLCONF)
+        clear_url_caches()
+
+    timings["import"], _ = _time(import_json, options.repeat)
+
+    # Into its own module, so the reverse timings below use the default import
+    def import_json_lazy_namespaces():
+        with override_settings(URLCONF_IMPORT_LAZY_NAMESPACES=True):
+            import_urlconf.from_json(json_urlpatterns, urlconf=LAZY_IMPORTED_URLCONF)
+        clear_url_caches()
+
+    timings["import_lazy_namespaces"], _ = _time(import_json_lazy_namespaces, options.repeat)
+
+    # Load files written by export_urlconf_to_file --fingerprint, with and without compression
+    fingerprint = export_urlconf.get_fingerprint(json_urlpatterns)
+    envelope = json.dumps(export_urlconf.with_fingerprint(json_urlpatterns, fingerprint)).encode()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for codec in (None, "gzip"):
+            label = codec or "plain"
+            file_path = os.path.join(temp_dir, f"urlconf-{label}.json")
+            with open(file_path, "wb") as json_file:
+                json_file.write(compression.compress(envelope, codec) if codec else envelope)
+
+            def read_and_parse():
+                with open(file_path, "rb") as json_file:
+                    return json.loads(compression.decompress(json_file.read()))
+
+            timings[f"file_read_and_parse_{label}"], _ = _time(read_and_parse, options.repeat)
+            loaded_files = [import_urlconf.load_file(file_path) for _ in range(options.repeat)]
+            timings[f"file_load_{label}"] = min(loaded.load_time for loaded in loaded_files)
+            timings[f"file_parse_{label}"] = min(loaded.parse_time for loaded in loaded_files)
+            timings[f"file_unchanged_{label}"], _ = _time(
+                lambda: import_urlconf.load_file(file_path, unless_fingerprint=fingerprint),
+                options.repeat,
+            )
+
+    # Reverse a url deep in the last namespace, so the whole URLconf is involved
+    url_name = url_names[-1]
+    reverse_kwargs = {"slug": "benchmark"}
+    first_reverse_times = {}
+    for language in languages or [None]:
+        with translation.override(language):
+            start_time = time.perf_counter()
+            reverse(url_name, urlconf=IMPORTED_URLCONF, kwargs=reverse_kwargs)
+            first_reverse_times[language or ""] = time.perf_counter() - start_time
+    timings["first_reverse_total"] = sum(first_reverse_times.values())
+    timings["first_reverse_max"] = max(first_reverse_times.values())
+
+    for threads in (0, 4):
+        clear_url_caches()
+        warm_up_result = import_urlconf.warm_up(
+            IMPORTED_URLCONF, languages=languages or [settings.LANGUAGE_CODE], threads=threads
+        )
+        timings[f"warm_up_{threads}_threads"] = warm_up_result.total_time
+
+    with translation.override(languages[0] if languages else None):
+
+        def reverse_many():
+            for _ in range(options.reverse_count):
+                reverse(url_name, urlconf=IMPORTED_URLCONF, kwargs=reverse_kwargs)
+
+        reverse_time, _ = _time(reverse_many, options.repeat)
+    timings["reverse_each"] = reverse_time / options.reverse_count
+
+    reverser = Reverser(json_urlpatterns)
+    start_time = time.perf_counter()
+    for language in languages or [None]:
+        reverser.reverse(url_name, reverse_kwargs, language)
+    timings["reverser_first_total"] = time.perf_counter() - start_time
+
+    def reverser_many():
+        language = languages[0] if languages else None
+        for _ in range(options.reverse_count):
+            reverser.reverse(url_name, reverse_kwargs, language)
+
+    reverser_time, _ = _time(reverser_many, options.repeat)
+    timings["reverser_each"] = reverser_time / options.reverse_count
+
+    def reverser_bulk():
+        language = languages[0] if languages else None
+        all_kwargs = [reverse_kwargs] * options.reverse_count
+        for _ in reverser.reverse_many(url_name, all_kwargs, language):
+            pass
+
+    reverser_bulk_time, _ = _time(reverser_bulk, options.repeat)
+    timings["reverser_many_each"] = reverser_bulk_time / options.reverse_count
+
+    def measure_import_memory(**import_settings):
+        clear_url_caches()
+        gc.collect()
+        tracemalloc.start()
+        with override_settings(**import_settings):
+            import_urlconf.from_json(json.loads(json_string), urlconf=IMPORTED_URLCONF)
+        gc.collect()
+        retained_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return retained_size
+
+    # Bytes still allocated after parsing and importing the JSON, once the JSON is freed
+    memory = {
+        "import": measure_import_memory(),
+        "import_low_memory": measure_import_memory(URLCONF_IMPORT_LOW_MEMORY=True),
+        "import_lazy_namespaces": measure_import_memory(URLCONF_IMPORT_LAZY_NAMESPACES=True),
+    }
+
+    return {
+        "commit": _get_git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "options": {
+            "patterns": options.patterns,
+            "include_depth": options.include_depth,
+            "namespaces": options.namespaces,
+            "regex_ratio": options.regex_ratio,
+            "languages": options.languages,
+            "translated_ratio": options.translated_ratio,
+            "seed": options.seed,
+        },
+        "json_size": len(json_string),
+        "timings": timings,
+        "memory": memory,
+    }
+
+
+def format_results(results, previous_results=None):
+    """
+    :param results: dict from run_benchmarks
+    :param previous_results: dict from an earlier run_benchmarks to compare with, or None
+    :return: string
+    """
+    lines = [f"commit {results['commit']}, json size {results['json_size']} characters"]
+    if previous_results:
+        lines.append(f"compared with commit {previous_results['commit']}")
+        if previous_results["options"] != results["options"]:
+            lines.append("WARNING: the benchmark options are different")
+    for name, seconds in results["timings"].items():
+        line = f"{name:>20}: {seconds * 1000:10.3f}ms"
+        previous_seconds = previous_results and previous_results["timings"].get(name)
+        if previous_seconds:
+            line += f"  {previous_seconds * 1000:10.3f}ms before  x{seconds / previous_seconds:.2f}"
+        lines.append(line)
+    for name, size in results.get("memory", {}).items():
+        line = f"{name:>20}: {size / 1e6:10.3f}MB"
+        previous_size = previous_results and previous_results.get("memory", {}).get(name)
+        if previous_size:
+            line += f"  {previous_size / 1e6:10.3f}MB before  x{size / previous_size:.2f}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patterns", type=int, default=5000, help="Number of url patterns")
+    parser.add_argument("--include-depth", type=int, default=3, help="Levels of includes")
+    parser.add_argument("--namespaces", type=int, default=20, help="Number of namespaces")
+    parser.add_argument(
+        "--regex-ratio", type=float, default=0.5, help="Proportion of regexes, not routes"
+    )
+    parser.add_argument("--languages", type=int, default=10, help="Number of languages")
+    parser.add_argument(
+        "--translated-ratio", type=float, default=0.5, help="Proportion of translated patterns"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the URLconf")
+    parser.add_argument("--repeat", type=int, default=3, help="Keep the fastest of this many runs")
+    parser.add_argument(
+        "--reverse-count", type=int, default=10000, help="Number of steady-state reverses"
+    )
+    parser.add_argument("--output", type=str, help="Save the results to this JSON file")
+    parser.add_argument("--compare", type=str, help="Compare with results saved in this file")
+    return parser
+
+
+def main(argv=None):
+    options = get_parser().parse_args(argv)
+    results = run_benchmarks(options)
+
+    previous_results = None
+    if options.compare:
+        with open(options.compare) as previous_file:
+            previous_results = json.load(previous_file)
+    sys.stdout.write(format_results(results, previous_results))
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Generate large synthetic URLconf, to benchmark export and import.
+
+The URLconf is made of modules in sys.modules, so it can be exported like any other URLconf.
+"""
+
+import random
+import sys
+import types
+
+from django.conf.urls.i18n import i18n_patterns
+from django.urls import include, path, re_path
+from django.utils.functional import lazy
+from django.utils.translation import get_language
+from django.views import View
+
+
+def _get_translated_pattern(patterns_by_language, default_pattern):
+    def get_pattern():
+        return patterns_by_language.get(get_language(), default_pattern)
+
+    return lazy(get_pattern, str)()
+
+
+def _make_pattern(url_index, use_regex, translated_languages):
+    """
+    :param url_index: int - makes the pattern unique
+    :param use_regex: boolean - make a regex, rather than a route
+    :param translated_languages: list of language codes where the pattern is different.
+        The pattern is lazy if this is not empty.
+    :return: string or lazy string
+    """
+    if use_regex:
+        default_pattern = rf"^page-{url_index}/(?P<slug>[\w-]+)/$"
+        patterns_by_language = {
+            language: rf"^{language}-page-{url_index}/(?P<slug>[\w-]+)/$"
+            for language in translated_languages
+        }
+    else:
+        default_pattern = f"page-{url_index}/<slug:slug>/"
+        patterns_by_language = {
+            language: f"{language}-page-{url_index}/<slug:slug>/"
+            for language in translated_languages
+        }
+    if not translated_languages:
+        return default_pattern
+    return _get_translated_pattern(patterns_by_language, default_pattern)
+
+
+def generate_urlconf(
+    urlconf="benchmark_urlconf",
+    patterns=1000,
+    include_depth=2,
+    namespaces=10,
+    regex_ratio=0.5,
+    languages=(),
+    translated_ratio=0.5,
+    differing_languages_ratio=0.5,
+    locale_prefix=True,
+    seed=0,
+):
+    """
+    Generate URLconf and save it in sys.modules.
+
+    Urls are spread evenly over the root URLconf and the namespaces.
+    Each namespace has a chain of include_depth nested includes, with urls on every level.
+
+    :param urlconf: string - module name of the root URLconf
+    :param patterns: int - number of url patterns
+    :param include_depth: int - levels of includes in each namespace
+    :param namespaces: int - number of included namespaces
+    :param regex_ratio: float - proportion of patterns that are regexes rather than routes
+    :param languages: list of language codes that patterns are translated into
+    :param translated_ratio: float - proportion of patterns that are translated
+    :param differing_languages_ratio: float - proportion of languages where a translated
+        pattern is different to the default
+    :param locale_prefix: boolean - put the urls inside i18n_patterns
+    :param seed: int - random seed, so the same arguments always make the same URLconf
+    :return: list of url names, with namespaces
+    """
+    rng = random.Random(seed)
+    view = View.as_view()
+    url_names = []
+    # The root level, then each level of each namespace
+    if not include_depth:
+        namespaces = 0
+    levels = [None] + [
+        (namespace, depth) for namespace in range(namespaces) for depth in range(include_depth)
+    ]
+    urls_by_level = {level: [] for level in levels}
+
+    for url_index in range(patterns):
+        level = levels[url_index % len(levels)]
+        use_regex = rng.random() < regex_ratio
+        translated_languages = []
+        if languages and rng.random() < translated_ratio:
+            translated_languages = [
+                language for language in languages if rng.random() < differing_languages_ratio
+            ]
+        pattern = _make_pattern(url_index, use_regex, translated_languages)
+        name = f"url-{url_index}"
+        url_function = re_path if use_regex else path
+        urls_by_level[level].append(url_function(pattern, view, name=name))
+        if level is None:
+            url_names.append(name)
+        else:
+            url_names.append(f"namespace-{level[0]}:{name}")
+
+    root_urlpatterns = list(urls_by_level[None])
+    for namespace in range(namespaces):
+        included_urlpatterns = []
+        # Build the chain of includes from the inside out
+        for depth in reversed(range(include_depth)):
+            level_urlpatterns = list(urls_by_level[(namespace, depth)])
+            if included_urlpatterns:
+                level_urlpatterns.append(path(f"level-{depth + 1}/", include(included_urlpatterns)))
+            included_urlpatterns = level_urlpatterns
+        module_name = f"{urlconf}_namespace_{namespace}"
+        module = types.ModuleType(module_name)
+        module.app_name = f"namespace-{namespace}"
+        module.urlpatterns = included_urlpatterns
+        sys.modules[module_name] = module
+        root_urlpatterns.append(
+            path(
+                f"namespace-{namespace}/", include(module_name, namespace=f"namespace-{namespace}")
+            )
+        )
+
+    module = types.ModuleType(urlconf)
+    module.urlpatterns = i18n_patterns(*root_urlpatterns) if locale_prefix else root_urlpatterns
+    sys.modules[urlconf] = module
+    return url_names
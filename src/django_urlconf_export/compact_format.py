@@ -0,0 +1,170 @@
+"""
+Compact URLconf JSON format.
+
+The normal format repeats the same strings, and the same language keys
+for every translated url. The compact format stores each of them once:
+
+{
+    "format": "django-urlconf-export-compact",
+    "version": 1,
+    # Every distinct string: regexes, routes, names, namespaces, language codes etc.
+    "strings": ["^colors/", "colors", "^red/$", "red", "en", "fr", "^rouge/$"],
+    # Every distinct list of languages, as indexes into "strings"
+    "languages": [[4, 5]],
+    # Every distinct translated regex: index into "languages", then a string index per language
+    "translations": [[0, 2, 6]],
+    "urlpatterns": [
+        {"r": 0, "a": 1, "s": 1, "i": [{"R": 0, "n": 3}]},
+    ],
+}
+
+Url keys are:
+    "r" / "t" - regex / route, as an index into "strings"
+    "R" / "T" - translated regex / route, as an index into "translations"
+    "n" - name
+    "i" - includes
+    "a" / "s" - app_name / namespace, or null
+    "c" - classPath of a locale prefix
+"""
+
+FORMAT = "django-urlconf-export-compact"
+VERSION = 1
+
+_PATTERN_KEYS = {"regex": ("r", "R"), "route": ("t", "T")}
+
+
+class _StringTable:
+    """
+    Assign an index to each distinct value, in the order they are first seen.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._indexes = {}
+
+    def get_index(self, value):
+        index = self._indexes.get(value)
+        if index is None:
+            index = self._indexes[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def is_compact(json_data):
+    """
+    :param json_data: JSON loaded from an export
+    :return: boolean - is this data in the compact format?
+    """
+    return isinstance(json_data, dict) and json_data.get("format") == FORMAT
+
+
+def compact(json_urlpatterns):
+    """
+    Convert exported URLconf to the compact format.
+
+    :param json_urlpatterns: list of JSON URLconf dicts
+    :return: compact JSON URLconf dict
+    """
+    strings = _StringTable()
+    languages = _StringTable()
+    translations = _StringTable()
+
+    def get_string_index(value):
+        if value is None:
+            return None
+        return strings.get_index(value)
+
+    def compact_urlpatterns(json_urlpatterns):
+        compact_urls = []
+        for json_url in json_urlpatterns:
+            compact_url = {}
+            for pattern_type, (key, translated_key) in _PATTERN_KEYS.items():
+                regex = json_url.get(pattern_type)
+                if isinstance(regex, dict):
+                    language_indexes = tuple(strings.get_index(language) for language in regex)
+                    translation = (languages.get_index(language_indexes),) + tuple(
+                        strings.get_index(language_regex) for language_regex in regex.values()
+                    )
+                    compact_url[translated_key] = translations.get_index(translation)
+                elif regex is not None:
+                    compact_url[key] = strings.get_index(regex)
+
+            includes = json_url.get("includes")
+            if includes:
+                compact_url["i"] = compact_urlpatterns(includes)
+                if json_url.get("isLocalePrefix"):
+                    compact_url["c"] = get_string_index(json_url["classPath"])
+                else:
+                    compact_url["a"] = get_string_index(json_url["app_name"])
+                    compact_url["s"] = get_string_index(json_url["namespace"])
+            else:
+                compact_url["n"] = get_string_index(json_url["name"])
+            compact_urls.append(compact_url)
+        return compact_urls
+
+    compact_urls = compact_urlpatterns(json_urlpatterns)
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "strings": strings.values,
+        "languages": [list(language_indexes) for language_indexes in languages.values],
+        "translations": [list(translation) for translation in translations.values],
+        "urlpatterns": compact_urls,
+    }
+
+
+def expand(compact_json):
+    """
+    Convert compact format URLconf back to the normal format.
+
+    Translated regexes that were shared in the compact format
+    are shared by the expanded urls too, so must not be modified.
+
+    :param compact_json: compact JSON URLconf dict
+    :return: list of JSON URLconf dicts
+    """
+    if compact_json.get("version") != VERSION:
+        raise ValueError(
+            f"Unsupported compact URLconf version: {compact_json.get('version')}. "
+            f"This version of django-urlconf-export supports version {VERSION}."
+        )
+
+    strings = compact_json["strings"]
+    languages = [
+        [strings[language_index] for language_index in language_indexes]
+        for language_indexes in compact_json["languages"]
+    ]
+    translations = [
+        dict(zip(languages[languages_index], (strings[index] for index in regex_indexes)))
+        for languages_index, *regex_indexes in compact_json["translations"]
+    ]
+
+    def get_string(index):
+        if index is None:
+            return None
+        return strings[index]
+
+    def expand_urlpatterns(compact_urls):
+        json_urlpatterns = []
+        for compact_url in compact_urls:
+            json_url = {}
+            for pattern_type, (key, translated_key) in _PATTERN_KEYS.items():
+                if key in compact_url:
+                    json_url[pattern_type] = strings[compact_url[key]]
+                elif translated_key in compact_url:
+                    json_url[pattern_type] = translations[compact_url[translated_key]]
+
+            if "i" in compact_url:
+                json_url["includes"] = expand_urlpatterns(compact_url["i"])
+                if "c" in compact_url:
+                    json_url["isLocalePrefix"] = True
+                    json_url["classPath"] = get_string(compact_url["c"])
+                else:
+                    json_url["app_name"] = get_string(compact_url["a"])
+                    json_url["namespace"] = get_string(compact_url["s"])
+            else:
+                json_url["name"] = get_string(compact_url["n"])
+            json_urlpatterns.append(json_url)
+        return json_urlpatterns
+
+    return expand_urlpatterns(compact_json["urlpatterns"])
@@ -0,0 +1,112 @@
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+
+
+def _open_gzip_writer(fileobj):
+    # mtime=0 so the same JSON always compresses to the same bytes
+    return gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=0)
+
+
+def _open_bz2_writer(fileobj):
+    return bz2.BZ2File(fileobj, mode="wb")
+
+
+def _open_xz_writer(fileobj):
+    return lzma.LZMAFile(fileobj, mode="wb", format=lzma.FORMAT_XZ)
+
+
+def _make_gzip_decompressor():
+    # wbits=31 means a gzip header and trailer
+    return zlib.decompressobj(wbits=31)
+
+
+# codec name -> (magic bytes, open compressing writer, decompress, make incremental decompressor)
+_CODECS = {
+    "gzip": (b"\x1f\x8b", _open_gzip_writer, gzip.decompress, _make_gzip_decompressor),
+    "bz2": (b"BZh", _open_bz2_writer, bz2.decompress, bz2.BZ2Decompressor),
+    "xz": (b"\xfd7zXZ\x00", _open_xz_writer, lzma.decompress, lzma.LZMADecompressor),
+}
+
+CODECS = tuple(_CODECS)
+
+_HEAD_CHUNK_SIZE = 64 * 1024
+
+
+def open_writer(fileobj, codec):
+    """
+    Wrap a binary file, so everything written to it is compressed.
+    Closing the writer does not close the file.
+
+    :param fileobj: binary file-like object
+    :param codec: string - one of CODECS
+    :return: binary file-like object
+    """
+    if codec not in _CODECS:
+        raise ValueError(f"Invalid compression codec: {codec}")
+    _, open_compressing_writer, _, _ = _CODECS[codec]
+    return open_compressing_writer(fileobj)
+
+
+def compress(data, codec):
+    """
+    :param data: bytes
+    :param codec: string - one of CODECS
+    :return: bytes
+    """
+    buffer = io.BytesIO()
+    with open_writer(buffer, codec) as writer:
+        writer.write(data)
+    return buffer.getvalue()
+
+
+def get_codec(data):
+    """
+    Detect how some data was compressed, from its magic bytes.
+
+    :param data: bytes
+    :return: string - one of CODECS, or None if the data is not compressed
+    """
+    for codec, (magic, _, _, _) in _CODECS.items():
+        if data[: len(magic)] == magic:
+            return codec
+    return None
+
+
+def decompress(data):
+    """
+    Decompress data if it is compressed, otherwise return it unchanged.
+
+    :param data: bytes
+    :return: bytes
+    """
+    codec = get_codec(data)
+    if codec is None:
+        return data
+    _, _, decompress_codec, _ = _CODECS[codec]
+    return decompress_codec(data)
+
+
+def decompress_head(data, size):
+    """
+    Decompress only the start of some data, if it is compressed.
+
+    :param data: bytes-like object e.g. bytes or mmap
+    :param size: int - number of bytes to return, at most
+    :return: bytes
+    """
+    codec = get_codec(data)
+    if codec is None:
+        return bytes(data[:size])
+    _, _, _, make_decompressor = _CODECS[codec]
+    decompressor = make_decompressor()
+    head = b""
+    # Decompress a chunk at a time, so the rest of the data is not copied
+    for start in range(0, len(data), _HEAD_CHUNK_SIZE):
+        end = start + _HEAD_CHUNK_SIZE
+        head += decompressor.decompress(data[start:end])
+        if len(head) >= size:
+            break
+    return head[:size]
@@ -0,0 +1,196 @@
+"""
+Structural differences between two exports of the same URLconf.
+
+Each url is addressed by a path of keys, one per level of includes.
+A key is made from the url name, the namespace of an include,
+the class of a locale prefix, or else the pattern of an include.
+If siblings have the same key, the second gets "#1" appended, the third "#2" etc.
+
+A delta looks like:
+
+{
+    # Paths of urls that were removed, with any included urls
+    "removed": [["namespace:admin", "name:secret"]],
+    # Urls whose data changed. Included urls are not listed here, they have their own entries.
+    "changed": [{"path": ["name:login"], "url": {"route": "sign-in/", "name": "login"}}],
+    # Urls that were added or moved, with any included urls.
+    # "path" is the path of the parent, "after" is the key of the previous sibling,
+    # or None if the url comes first.
+    "added": [{"path": [], "after": "name:login", "url": {"route": "logout/", "name": "logout"}}],
+}
+"""
+
+import bisect
+import json
+
+
+def _get_key(json_url):
+    if json_url.get("includes"):
+        if json_url.get("isLocalePrefix"):
+            return f"prefix:{json_url['classPath']}"
+        if json_url.get("namespace") is not None:
+            return f"namespace:{json_url['namespace']}"
+        pattern = json_url.get("regex", json_url.get("route"))
+        return f"include:{json.dumps(pattern, sort_keys=True)}"
+    return f"name:{json_url['name']}"
+
+
+def _get_keyed_urls(json_urlpatterns):
+    """
+    :param json_urlpatterns: list of JSON URLconf dicts
+    :return: list of tuple(key, JSON URLconf dict), in the same order
+    """
+    keyed_urls = []
+    key_counts = {}
+    for json_url in json_urlpatterns:
+        key = _get_key(json_url)
+        count = key_counts.get(key, 0)
+        key_counts[key] = count + 1
+        if count:
+            key = f"{key}#{count}"
+        keyed_urls.append((key, json_url))
+    return keyed_urls
+
+
+def _get_url_data(json_url):
+    return {key: value for key, value in json_url.items() if key != "includes"}
+
+
+def _get_unmoved_keys(old_keys, new_keys):
+    """
+    Find the largest set of keys that are in the same order in both lists.
+    The other keys that are in both lists have moved.
+
+    :param old_keys: list of keys in both lists, in old order
+    :param new_keys: list of the same keys, in new order
+    :return: set of keys
+    """
+    # Longest increasing subsequence of old positions, in new order
+    old_positions = {key: position for position, key in enumerate(old_keys)}
+    positions = [old_positions[key] for key in new_keys]
+    tails = []
+    tail_indexes = []
+    previous_indexes = [None] * len(positions)
+    for index, position in enumerate(positions):
+        insert_at = bisect.bisect_left(tails, position)
+        if insert_at:
+            previous_indexes[index] = tail_indexes[insert_at - 1]
+        if insert_at == len(tails):
+            tails.append(position)
+            tail_indexes.append(index)
+        else:
+            tails[insert_at] = position
+            tail_indexes[insert_at] = index
+
+    unmoved_keys = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        unmoved_keys.add(new_keys[index])
+        index = previous_indexes[index]
+    return unmoved_keys
+
+
+def make_delta(old_json_urlpatterns, new_json_urlpatterns):
+    """
+    Work out how to change one export into another.
+
+    :param old_json_urlpatterns: list of JSON URLconf dicts
+    :param new_json_urlpatterns: list of JSON URLconf dicts
+    :return: delta dict, see module docstring
+    """
+    delta = {"removed": [], "changed": [], "added": []}
+
+    def compare(old_json_urlpatterns, new_json_urlpatterns, path):
+        old_urls = dict(_get_keyed_urls(old_json_urlpatterns))
+        new_keyed_urls = _get_keyed_urls(new_json_urlpatterns)
+        new_urls = dict(new_keyed_urls)
+
+        common_keys = [key for key, _ in new_keyed_urls if key in old_urls]
+        unmoved_keys = _get_unmoved_keys([key for key in old_urls if key in new_urls], common_keys)
+
+        for key in old_urls:
+            if key not in unmoved_keys:
+                delta["removed"].append(path + [key])
+
+        previous_key = None
+        for key, new_json_url in new_keyed_urls:
+            if key in unmoved_keys:
+                old_json_url = old_urls[key]
+                new_url_data = _get_url_data(new_json_url)
+                if _get_url_data(old_json_url) != new_url_data:
+                    delta["changed"].append({"path": path + [key], "url": new_url_data})
+                if new_json_url.get("includes"):
+                    compare(old_json_url["includes"], new_json_url["includes"], path + [key])
+            else:
+                delta["added"].append({"path": path, "after": previous_key, "url": new_json_url})
+            previous_key = key
+
+    compare(old_json_urlpatterns, new_json_urlpatterns, [])
+    return delta
+
+
+def apply_delta(old_json_urlpatterns, delta):
+    """
+    Apply a delta from make_delta. The old URLconf is not modified.
+
+    :param old_json_urlpatterns: list of JSON URLconf dicts
+    :param delta: delta dict, see module docstring
+    :return: list of JSON URLconf dicts
+    """
+
+    class Node:
+        def __init__(self, key, json_url):
+            self.key = key
+            self.base_key = _get_key(json_url)
+            self.url_data = _get_url_data(json_url)
+            self.children = build_tree(json_url.get("includes") or [])
+
+    def build_tree(json_urlpatterns):
+        return [Node(key, json_url) for key, json_url in _get_keyed_urls(json_urlpatterns)]
+
+    def find_children(path):
+        children = tree
+        for key in path:
+            children = next(node.children for node in children if node.key == key)
+        return children
+
+    tree = build_tree(old_json_urlpatterns)
+
+    for path in delta["removed"]:
+        siblings = find_children(path[:-1])
+        siblings[:] = [node for node in siblings if node.key != path[-1]]
+
+    for changed in delta["changed"]:
+        path = changed["path"]
+        node = next(node for node in find_children(path[:-1]) if node.key == path[-1])
+        node.url_data = dict(changed["url"])
+
+    # Added urls are listed in their new order, so when each one is added,
+    # the siblings before it are the same as in the new export.
+    for added in delta["added"]:
+        siblings = find_children(added["path"])
+        if added["after"] is None:
+            index = 0
+        else:
+            index = next(i for i, node in enumerate(siblings) if node.key == added["after"]) + 1
+        node = Node(None, added["url"])
+        count = sum(1 for sibling in siblings[:index] if sibling.base_key == node.base_key)
+        node.key = f"{node.base_key}#{count}" if count else node.base_key
+        siblings.insert(index, node)
+
+    def build_json_urlpatterns(nodes):
+        json_urlpatterns = []
+        for node in nodes:
+            json_url = {}
+            if node.children and "regex" not in node.url_data and "route" not in node.url_data:
+                # A locale prefix has no pattern, so "includes" comes first
+                json_url["includes"] = build_json_urlpatterns(node.children)
+            for key, value in node.url_data.items():
+                json_url[key] = value
+                # "includes" comes straight after the pattern
+                if key in ("regex", "route") and node.children:
+                    json_url["includes"] = build_json_urlpatterns(node.children)
+            json_urlpatterns.append(json_url)
+        return json_urlpatterns
+
+    return build_json_urlpatterns(tree)
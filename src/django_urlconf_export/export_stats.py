@@ -0,0 +1,177 @@
+"""
+Measure where export time goes.
+
+Usage:
+
+    with export_stats.record() as stats:
+        export_urlconf.write_json(export_urlconf.as_json(), stream)
+    print(stats.format())
+
+Recording is per thread. When nothing is being recorded, export only pays for a None check.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+def get_active():
+    """
+    :return: ExportStats being recorded in this thread, or None
+    """
+    return getattr(_local, "stats", None)
+
+
+@contextmanager
+def record():
+    """
+    Record stats for exports in this block.
+
+    :return: context manager giving an ExportStats
+    """
+    stats = ExportStats()
+    previous_stats = get_active()
+    _local.stats = stats
+    start_time = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.total_time += time.perf_counter() - start_time
+        _local.stats = previous_stats
+
+
+class ExportStats:
+    """
+    Stats for one or more exports.
+
+    total_time - seconds spent in the record() block
+    include_stats - dict of include path e.g. "admin > ^users/" -> dict of
+        "time" - seconds spent walking and exporting the include, with its own includes.
+            Translation is done afterwards for all urls together, so is not included.
+        "patterns" - number of url patterns exported from the include
+        "translated_patterns" - number of those url patterns that are translated
+        "translation_time" - seconds spent translating the include's url patterns,
+            without activating languages.
+        All are for the include with its own includes.
+    translation_activations - number of times a language was activated to translate urls
+    translation_time - seconds spent translating urls, including activating languages
+    pattern_counts - Counter of exported url patterns by type: "route", "regex" or "prefix"
+    output_size - number of characters written by export_urlconf.write_json
+    """
+
+    def __init__(self):
+        self.total_time = 0.0
+        self.include_stats = {}
+        self.translation_activations = 0
+        self.translation_time = 0.0
+        self.pattern_counts = Counter()
+        self.output_size = 0
+        # For each include being walked: tuple(label, start time, pattern count at start)
+        self._open_includes = []
+
+    def _get_include_stats(self, include_path):
+        """
+        :param include_path: tuple of include labels
+        :return: dict of stats for the include, see include_stats
+        """
+        return self.include_stats.setdefault(
+            " > ".join(include_path),
+            {"time": 0.0, "patterns": 0, "translated_patterns": 0, "translation_time": 0.0},
+        )
+
+    def get_include_path(self):
+        """
+        :return: tuple of labels of the includes being walked
+        """
+        return tuple(label for label, _, _ in self._open_includes)
+
+    def enter_include(self, label):
+        self._open_includes.append((label, time.perf_counter(), sum(self.pattern_counts.values())))
+
+    def leave_include(self):
+        include_stats = self._get_include_stats(self.get_include_path())
+        _, start_time, start_pattern_count = self._open_includes.pop()
+        include_stats["time"] += time.perf_counter() - start_time
+        include_stats["patterns"] += sum(self.pattern_counts.values()) - start_pattern_count
+
+    def add_translated_pattern(self, include_path):
+        """
+        :param include_path: tuple of labels of the includes the pattern is in, or None
+        """
+        # A pattern in an include is also in the includes around it
+        for depth in range(1, len(include_path or ()) + 1):
+            self._get_include_stats(include_path[:depth])["translated_patterns"] += 1
+
+    def add_include_translation(self, include_path, elapsed_time):
+        """
+        :param include_path: tuple of labels of the includes the pattern is in, or None
+        :param elapsed_time: seconds spent translating the pattern into one language
+        """
+        for depth in range(1, len(include_path or ()) + 1):
+            self._get_include_stats(include_path[:depth])["translation_time"] += elapsed_time
+
+    def add_pattern(self, pattern_type):
+        self.pattern_counts[pattern_type] += 1
+
+    def add_translation(self, elapsed_time):
+        self.translation_activations += 1
+        self.translation_time += elapsed_time
+
+    def add_output(self, size):
+        self.output_size += size
+
+    def as_dict(self):
+        """
+        :return: dict of stats, that can be saved as JSON
+        """
+        return {
+            "total_time": self.total_time,
+            "translation_activations": self.translation_activations,
+            "translation_time": self.translation_time,
+            "pattern_counts": dict(self.pattern_counts),
+            "output_size": self.output_size,
+            "includes": self.include_stats,
+        }
+
+    def format(self, max_includes=10):
+        """
+        :param max_includes: int - number of slowest includes to list
+        :return: string - human readable report
+        """
+        lines = [
+            "URLconf export stats",
+            f"Total time: {self.total_time:.3f}s",
+            f"Translation: {self.translation_activations} language activations, "
+            f"{self.translation_time:.3f}s",
+            "Patterns: "
+            + (
+                ", ".join(
+                    f"{pattern_type} {count}"
+                    for pattern_type, count in sorted(self.pattern_counts.items())
+                )
+                or "none"
+            ),
+            f"Output size: {self.output_size} characters",
+        ]
+        slowest_includes = sorted(
+            self.include_stats.items(),
+            key=lambda item: item[1]["time"] + item[1]["translation_time"],
+            reverse=True,
+        )[:max_includes]
+        if slowest_includes:
+            lines.append("Slowest includes (walking + translating):")
+            for path, include_stats in slowest_includes:
+                if self.translation_time:
+                    translation_share = include_stats["translation_time"] / self.translation_time
+                else:
+                    translation_share = 0.0
+                lines.append(
+                    f"  {include_stats['time']:.3f}s + {include_stats['translation_time']:.3f}s"
+                    f" ({translation_share:.0%} of translation)"
+                    f"  {include_stats['patterns']} patterns"
+                    f" ({include_stats['translated_patterns']} translated)  {path}"
+                )
+        return "\n".join(lines) + "\n"
@@ -1,13 +1,21 @@
+import hashlib
+import itertools
+import json
 import re
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
 
 from django import urls as django_urls
 from django.conf import settings
-from django.urls import LocalePrefixPattern, URLPattern, URLResolver
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import LocalePrefixPattern, URLResolver
 from django.urls.resolvers import RegexPattern, RoutePattern
 from django.utils import translation
 from django.utils.functional import Promise
 
-from django_urlconf_export import language_utils
+from django_urlconf_export import export_stats, language_utils, traversal
 
 
 def _get_url_languages(language_without_country):
@@ -17,75 +25,241 @@ def _get_url_languages(language_without_country):
 
     :param language_without_country: boolean
         Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
-    :return: language code e.g. "en" or "en-us"
+    :return: list of language codes e.g. "en" or "en-us", in settings.LANGUAGES order
     """
     if language_without_country:
-        return {language_utils.get_without_country(language) for language, _ in settings.LANGUAGES}
+        languages = (
+            language_utils.get_without_country(language) for language, _ in settings.LANGUAGES
+        )
     else:
-        return {language for language, _ in settings.LANGUAGES}
+        languages = (language for language, _ in settings.LANGUAGES)
+    return list(dict.fromkeys(languages))
+
+
+def _get_fallback_language(url_languages):
+    """
+    :param url_languages: list of language codes from _get_url_languages
+    :return: the language code for settings.LANGUAGE_CODE,
+        or the first language if it is not one of url_languages
+    """
+    language_code = settings.LANGUAGE_CODE.lower()
+    for language in (language_code, language_code.partition("-")[0]):
+        if language in url_languages:
+            return language
+    return url_languages[0] if url_languages else None
 
 
-def _get_regex_pattern(url_pattern, language_without_country):
+def get_export_languages(language_without_country=False, languages=None):
+    """
+    Get the languages that translated urls are exported in.
+
+    If only some languages are wanted, the fallback language (settings.LANGUAGE_CODE) is
+    exported too, and so is the language without country for each language with a country.
+    Languages that are not in settings.LANGUAGES are ignored.
+
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :param languages: list of language codes e.g. ["fr", "pt-br"], or None for all languages
+    :return: list of language codes, in settings.LANGUAGES order
+    """
+    url_languages = _get_url_languages(language_without_country)
+    if languages is None:
+        return url_languages
+
+    wanted_languages = {_get_fallback_language(url_languages)}
+    for language in languages:
+        language = language.lower()
+        wanted_languages.add(language)
+        wanted_languages.add(language.partition("-")[0])
+    return [language for language in url_languages if language in wanted_languages]
+
+
+def _get_regex_pattern(url_pattern):
     """
     Export data from a Django URLPattern as JSON
 
     :param url_pattern: URLPattern
-    :param language_without_country:
-    :return: tuple(string, string or None)
+    :return: tuple(string, string or lazy string or None)
         pattern_type - 'route', 'regex' or 'prefix'
-        pattern_regex - string or None
+        pattern_regex - string, lazy string (if the url is translated) or None
     """
     if isinstance(url_pattern, LocalePrefixPattern):
         return "prefix", None
     elif isinstance(url_pattern, RegexPattern):
-        pattern_type = "regex"
-        pattern_regex = url_pattern._regex
+        return "regex", url_pattern._regex
     elif isinstance(url_pattern, RoutePattern):
-        pattern_type = "route"
-        pattern_regex = url_pattern._route
+        return "route", url_pattern._route
     else:
         raise ValueError(f"Invalid URL Pattern type: {url_pattern}")
 
-    if isinstance(pattern_regex, Promise):
-        language_regexes = {}
-        for lang in _get_url_languages(language_without_country):
-            with translation.override(lang):
-                language_regexes[lang] = str(pattern_regex)
-        return pattern_type, language_regexes
-    else:
-        return pattern_type, pattern_regex
 
+def _collapse_translations(regex_by_language):
+    """
+    Store a translated regex as a default regex, plus only the languages that are different.
 
-def _is_allowed(name, whitelist, blacklist):
+    A language is left out if import_urlconf would fall back to the same regex without it:
+    first to the language without country (e.g. "en" for "en-gb"), then to the default.
+
+    :param regex_by_language: dict of language code -> regex string
+    :return: string if the regex is the same for all languages,
+        otherwise dict like {"default": "^color/$", "en-gb": "^colour/$", "fr": "^couleur/$"}
     """
-    Check if this url (or url namespace) is allowed to be exported.
+    regexes = Counter(regex_by_language.values())
+    if len(regexes) == 1:
+        return next(iter(regexes))
 
-    :param name: url name OR included urls namespace
-    :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
-    :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
-    :return: boolean - is this url or namespace allowed to be exported?
+    default_regex = regexes.most_common(1)[0][0]
+    # Languages without country first, because languages with a country fall back to them
+    kept_regexes = {}
+    for language in sorted(regex_by_language, key=language_utils.includes_country):
+        regex = regex_by_language[language]
+        fallback_language = language_utils.get_without_country(language)
+        if regex != kept_regexes.get(fallback_language, default_regex):
+            kept_regexes[language] = regex
+
+    collapsed_regex = {"default": default_regex}
+    for language in regex_by_language:
+        if language in kept_regexes:
+            collapsed_regex[language] = kept_regexes[language]
+    return collapsed_regex
+
+
+def _translate_regex_patterns(translated_urls, languages, collapse_translations=False):
+    """
+    Fill in the regex for each language, for all translated urls.
+
+    Each language is activated once, then every lazy pattern is evaluated under it.
+    This is much faster than activating every language for every url.
+
+    :param translated_urls: list of tuple(JSON URLconf dict, string, lazy string, include path)
+        The JSON dict to update, its pattern_type key, the lazy pattern regex, and the
+        tuple of labels of the includes it is in, or None. The include path is only used to
+        record export stats for each include.
+        JSON dicts can share a dict of translated regexes, which is only filled in once.
+    :param languages: list of language codes
+    :param collapse_translations: boolean - see _collapse_translations
+    :return: None
     """
-    if not whitelist and not blacklist:
-        return True
+    stats = export_stats.get_active()
+    # id of dict of translated regexes -> tuple(the dict, lazy string, include path)
+    regexes_to_translate = {}
+    for json_url, pattern_type, pattern_regex, include_path in translated_urls:
+        regex_by_language = json_url[pattern_type]
+        regexes_to_translate[id(regex_by_language)] = (
+            regex_by_language,
+            pattern_regex,
+            include_path,
+        )
+    if stats is not None:
+        for _, _, include_path in regexes_to_translate.values():
+            stats.add_translated_pattern(include_path)
 
-    if blacklist and not whitelist:
-        return not any(re.match(pattern, name) for pattern in blacklist)
+    for language in languages:
+        start_time = time.perf_counter()
+        with translation.override(language):
+            if stats is None:
+                for regex_by_language, pattern_regex, _ in regexes_to_translate.values():
+                    regex_by_language[language] = str(pattern_regex)
+            else:
+                # Time each pattern, to find which includes are slow to translate
+                for regex_by_language, pattern_regex, include_path in regexes_to_translate.values():
+                    pattern_start_time = time.perf_counter()
+                    regex_by_language[language] = str(pattern_regex)
+                    stats.add_include_translation(
+                        include_path, time.perf_counter() - pattern_start_time
+                    )
+        if stats is not None:
+            stats.add_translation(time.perf_counter() - start_time)
 
-    if whitelist and not blacklist:
-        return any(re.match(pattern, name) for pattern in whitelist)
+    if collapse_translations:
+        collapsed_regexes = {
+            regex_id: _collapse_translations(regex_by_language)
+            for regex_id, (regex_by_language, _, _) in regexes_to_translate.items()
+        }
+        for json_url, pattern_type, _, _ in translated_urls:
+            json_url[pattern_type] = collapsed_regexes[id(json_url[pattern_type])]
 
-    if whitelist and blacklist:
-        for whitelisted_pattern in whitelist:
-            if re.match(whitelisted_pattern, name):
-                # It's whitelisted. Check it's not blacklisted.
-                if not any(
-                    re.match(blacklisted_pattern, name) for blacklisted_pattern in blacklist
-                ):
-                    return True
-        return False
 
+UrlNameDecision = namedtuple("UrlNameDecision", ["allowed", "reason", "rule"])
+UrlNameDecision.__doc__ = """
+Why a url name or namespace is exported or not.
+
+allowed - boolean, is it exported?
+reason - what decided:
+    None - there is no whitelist, and no blacklist item matched
+    "whitelist" - a whitelist item matched, or none did if not allowed
+    "blacklist" - a blacklist item matched
+    "namespace" - it is included in a namespace that is not exported
+    "empty" - the namespace is allowed, but none of its urls are, so it is left out
+rule - the whitelist or blacklist item that matched, or the namespace that is not exported.
+    None if no item matched.
+"""
+
+
+class _UrlNameFilter:
+    """
+    Whitelist and blacklist, compiled once per export.
+
+    Each decision is memoized by url name or namespace,
+    so every list item is matched at most once per name.
+    """
+
+    def __init__(self, whitelist=None, blacklist=None):
+        """
+        :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
+        :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
+        """
+        self.whitelist = [re.compile(pattern) for pattern in whitelist or ()]
+        self.blacklist = [re.compile(pattern) for pattern in blacklist or ()]
+        self._decisions = {}
+
+    def is_allowed(self, name):
+        """
+        Check if this url (or url namespace) is allowed to be exported.
+
+        :param name: url name OR included urls namespace
+        :return: boolean - is this url or namespace allowed to be exported?
+        """
+        try:
+            return self._decisions[name]
+        except KeyError:
+            allowed = self._decisions[name] = self._is_allowed(name)
+            return allowed
+
+    def _is_allowed(self, name):
+        return self.get_decision(name).allowed
+
+    def get_decision(self, name):
+        """
+        Explain why a url name or namespace is allowed or not.
+
+        :param name: url name OR included urls namespace
+        :return: UrlNameDecision
+        """
+        # The whitelist is applied first, then the blacklist.
+        whitelist_rule = None
+        if self.whitelist:
+            whitelist_rule = next(
+                (pattern.pattern for pattern in self.whitelist if pattern.match(name)), None
+            )
+            if whitelist_rule is None:
+                return UrlNameDecision(False, "whitelist", None)
+        for pattern in self.blacklist:
+            if pattern.match(name):
+                return UrlNameDecision(False, "blacklist", pattern.pattern)
+        if whitelist_rule is None:
+            return UrlNameDecision(True, None, None)
+        return UrlNameDecision(True, "whitelist", whitelist_rule)
 
-def _get_json_urlpatterns(resolver, whitelist=None, blacklist=None, language_without_country=False):
+
+def _get_json_urlpatterns(
+    resolver,
+    whitelist=None,
+    blacklist=None,
+    language_without_country=False,
+    languages=None,
+    collapse_translations=False,
+):
     """
     Export URLconf data from a Django URLResolver, as list of JSON dictionaries
 
@@ -94,78 +268,247 @@ def _get_json_urlpatterns(resolver, whitelist=None, blacklist=None, language_wit
     :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
     :param language_without_country: boolean
         Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :param languages: list of language codes to export, or None for all. See get_export_languages
+    :param collapse_translations: boolean
+        Should translated URLs only list the languages that differ from a default?
     :return: list of JSON URLconf dicts
     """
-    json_urlpatterns = []
-    for django_url in resolver.url_patterns:
-        json_url = {}
-
-        # Example values:
-        # pattern_type | pattern_regex
-        # ----------------------------
-        # 'route'      | '/home/'
-        # 'regex'      | '^/home/$'
-        # 'prefix'     | None
-        pattern_type, pattern_regex = _get_regex_pattern(
-            django_url.pattern, language_without_country
+    url_filter = _UrlNameFilter(whitelist, blacklist)
+    translated_urls = []
+    [json_urlpatterns] = _get_filtered_json_urlpatterns(resolver, [url_filter], translated_urls)
+    if translated_urls:
+        _translate_regex_patterns(
+            translated_urls,
+            get_export_languages(language_without_country, languages),
+            collapse_translations,
         )
-        if pattern_type in ["route", "regex"]:
-            json_url[pattern_type] = pattern_regex
+    return json_urlpatterns
+
+
+def _is_exported(django_url, url_filter):
+    """
+    Check if a Django URLResolver or URLPattern is allowed to be exported.
+
+    :param django_url: URLResolver or URLPattern
+    :param url_filter: _UrlNameFilter - which url names and namespaces are allowed
+    :return: boolean
+    """
+    if isinstance(django_url, URLResolver):
+        # If a namespace is set, check it is allowed
+        # before spending any time on the included urls.
+        return (
+            isinstance(django_url.pattern, LocalePrefixPattern)
+            or not django_url.namespace
+            or url_filter.is_allowed(django_url.namespace)
+        )
+    # Ignore urls without a name,
+    # they are typically dead or redirecting.
+    # Without a name, we cannot reverse the django_url anyway.
+    return bool(django_url.name) and url_filter.is_allowed(django_url.name)
+
+
+def _start_json_url(django_url, include_path=None):
+    """
+    Start exporting a Django URLResolver or URLPattern, with its pattern only.
+
+    Translated url patterns are exported as empty dicts,
+    so the regex for each language can be filled in afterwards.
+
+    :param django_url: URLResolver or URLPattern
+    :param include_path: tuple of labels of the includes the url is in, for export stats, or None
+    :return: tuple(JSON URLconf dict, translated_url)
+        translated_url - tuple(JSON URLconf dict, pattern_type, lazy string, include_path)
+        for _translate_regex_patterns, or None if the pattern is not translated
+    """
+    json_url = {}
+    # Example values:
+    # pattern_type | pattern_regex
+    # ----------------------------
+    # 'route'      | '/home/'
+    # 'regex'      | '^/home/$'
+    # 'prefix'     | None
+    pattern_type, pattern_regex = _get_regex_pattern(django_url.pattern)
+    if isinstance(pattern_regex, Promise):
+        # Regex for each language is filled in later
+        json_url[pattern_type] = {}
+        return json_url, (json_url, pattern_type, pattern_regex, include_path)
+    if pattern_type in ["route", "regex"]:
+        json_url[pattern_type] = pattern_regex
+    return json_url, None
+
+
+def _finish_json_url(json_url, django_url, includes):
+    """
+    Finish exporting a Django URLResolver or URLPattern.
+
+    :param json_url: JSON URLconf dict from _start_json_url
+    :param django_url: URLResolver or URLPattern
+    :param includes: exported included urls, or None for a URLPattern
+    :return: None
+    """
+    if isinstance(django_url, URLResolver):
+        json_url["includes"] = includes
+        if isinstance(django_url.pattern, LocalePrefixPattern):
+            json_url["isLocalePrefix"] = True
+            # classPath = "package.subpackage.ClassName"
+            json_url["classPath"] = ".".join(
+                [
+                    django_url.pattern.__class__.__module__,
+                    django_url.pattern.__class__.__qualname__,
+                ]
+            )
+        else:
+            json_url["app_name"] = django_url.app_name
+            json_url["namespace"] = django_url.namespace
+    else:
+        json_url["name"] = django_url.name
+
+
+def _get_include_label(django_url):
+    """
+    :param django_url: URLResolver
+    :return: string to show for the URLResolver in export stats
+    """
+    if isinstance(django_url.pattern, LocalePrefixPattern):
+        return django_url.pattern.__class__.__name__
+    return django_url.namespace or str(django_url.pattern)
+
+
+def _get_filtered_json_urlpatterns(resolver, url_filters, translated_urls):
+    """
+    Export URLconf data from a Django URLResolver, as lists of JSON dictionaries.
+
+    The resolver is walked once for all the filters.
+    Urls exported for more than one filter share their translated regexes.
 
+    :param resolver: URLResolver - resolver to export URLconf data from
+    :param url_filters: list of _UrlNameFilter - which url names and namespaces are allowed
+    :param translated_urls: list - translated urls are appended here,
+        to be translated afterwards by _translate_regex_patterns
+    :return: list of lists of JSON URLconf dicts, one for each filter
+    """
+    # Filter index -> JSON URLconf dicts exported so far on this level.
+    # Only filters that allow the URLResolvers we are in have an entry.
+    json_urlpatterns = {index: [] for index in range(len(url_filters))}
+    # For each URLResolver we are in: tuple(json_urlpatterns of its level, _start_json_url result)
+    open_resolvers = []
+
+    stats = export_stats.get_active()
+
+    def is_exported_by_any_filter(django_url, _):
+        return any(_is_exported(django_url, url_filters[index]) for index in json_urlpatterns)
+
+    def start_json_url(django_url):
+        include_path = stats.get_include_path() if stats is not None else None
+        return _start_json_url(django_url, include_path)
+
+    for event, django_url, _ in traversal.walk_resolver(resolver, is_exported_by_any_filter):
+        if event == traversal.ENTER:
+            if stats is not None:
+                stats.enter_include(_get_include_label(django_url))
+            open_resolvers.append((json_urlpatterns, start_json_url(django_url)))
+            json_urlpatterns = {
+                index: []
+                for index in json_urlpatterns
+                if _is_exported(django_url, url_filters[index])
+            }
+            continue
+
+        if event == traversal.LEAVE:
+            if stats is not None:
+                stats.leave_include()
+            all_includes = json_urlpatterns
+            json_urlpatterns, (json_url, translated_url) = open_resolvers.pop()
+            # If no live urls are included,
+            # skip this URLResolver in the json
+            exported = [(index, includes) for index, includes in all_includes.items() if includes]
+        else:
+            exported = [
+                (index, None)
+                for index in json_urlpatterns
+                if _is_exported(django_url, url_filters[index])
+            ]
+            if exported:
+                json_url, translated_url = start_json_url(django_url)
+
+        if not exported:
+            continue
+        # Copy the json_url for all but the last filter.
+        # The copies share the dict of translated regexes.
+        for index, includes in exported[:-1]:
+            filter_json_url = dict(json_url)
+            _finish_json_url(filter_json_url, django_url, includes)
+            json_urlpatterns[index].append(filter_json_url)
+            if translated_url:
+                translated_urls.append((filter_json_url,) + translated_url[1:])
+        index, includes = exported[-1]
+        _finish_json_url(json_url, django_url, includes)
+        json_urlpatterns[index].append(json_url)
+        if translated_url:
+            translated_urls.append(translated_url)
+        if stats is not None:
+            stats.add_pattern(_get_regex_pattern(django_url.pattern)[0])
+
+    return [json_urlpatterns[index] for index in range(len(url_filters))]
+
+
+def _iter_filtered_json_urlpatterns(resolver, url_filter, languages, collapse_translations=False):
+    """
+    Export URLconf data from a Django URLResolver, one JSON dictionary at a time.
+
+    Included urls are exported lazily too, so only the urls on the path
+    to the current url are held in memory.
+    The urls on each level are translated together, one language at a time.
+
+    :param resolver: URLResolver - resolver to export URLconf data from
+    :param url_filter: _UrlNameFilter - which url names and namespaces are allowed
+    :param languages: list of language codes to translate urls into
+    :param collapse_translations: boolean - see _collapse_translations
+    :return: iterator of JSON URLconf dicts
+    """
+    stats = export_stats.get_active()
+    exported_urls = []
+    translated_urls = []
+    for django_url in resolver.url_patterns:
+        if _is_exported(django_url, url_filter):
+            json_url, translated_url = _start_json_url(django_url)
+            if translated_url:
+                translated_urls.append(translated_url)
+            exported_urls.append((json_url, django_url))
+
+    if translated_urls:
+        _translate_regex_patterns(translated_urls, languages, collapse_translations)
+
+    for json_url, django_url in exported_urls:
+        includes = None
         if isinstance(django_url, URLResolver):
-            includes = _get_json_urlpatterns(
-                django_url, whitelist, blacklist, language_without_country
+            includes = _iter_filtered_json_urlpatterns(
+                django_url, url_filter, languages, collapse_translations
             )
             # If no live urls are included,
             # skip this URLResolver in the json
-            if not includes:
-                continue
-            json_url["includes"] = includes
-            if isinstance(django_url.pattern, LocalePrefixPattern):
-                json_url["isLocalePrefix"] = True
-                # classPath = "package.subpackage.ClassName"
-                json_url["classPath"] = ".".join(
-                    [
-                        django_url.pattern.__class__.__module__,
-                        django_url.pattern.__class__.__qualname__,
-                    ]
-                )
-            else:
-                # If a namespace is set, check it is allowed
-                if django_url.namespace and not _is_allowed(
-                    django_url.namespace, whitelist, blacklist
-                ):
-                    continue
-                json_url["app_name"] = django_url.app_name
-                json_url["namespace"] = django_url.namespace
-
-        elif isinstance(django_url, URLPattern):
-            # Ignore urls without a name,
-            # they are typically dead or redirecting.
-            # Without a name, we cannot reverse the django_url anyway.
-            if not django_url.name:
-                continue
-            # Check this url name is allowed
-            if not _is_allowed(django_url.name, whitelist, blacklist):
+            first_include = next(includes, None)
+            if first_include is None:
                 continue
-            json_url["name"] = django_url.name
+            includes = itertools.chain([first_include], includes)
 
-        json_urlpatterns.append(json_url)
-    return json_urlpatterns
+        _finish_json_url(json_url, django_url, includes)
+        if stats is not None:
+            stats.add_pattern(_get_regex_pattern(django_url.pattern)[0])
+        yield json_url
 
 
-def as_json(urlconf=None, whitelist=None, blacklist=None, language_without_country=None):
+def get_export_options(urlconf=None, whitelist=None, blacklist=None, language_without_country=None):
     """
-    Export URLconf data from a module, as list of JSON dictionaries.
+    Fill in export options that were not specified, from Django settings.
 
     :param urlconf: string - root module name to export URLconf from
     :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
     :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
     :param language_without_country: boolean
         Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
-    :return: list of JSON URLconf dicts
+    :return: tuple(urlconf, whitelist, blacklist, language_without_country)
     """
-
     if urlconf is None:
         urlconf = getattr(settings, "URLCONF_EXPORT_ROOT_URLCONF", settings.ROOT_URLCONF)
 
@@ -180,9 +523,246 @@ def as_json(urlconf=None, whitelist=None, blacklist=None, language_without_count
             settings, "URLCONF_EXPORT_LANGUAGE_WITHOUT_COUNTRY", False
         )
 
+    return urlconf, whitelist, blacklist, language_without_country
+
+
+def get_export_key(export_options):
+    """
+    Make a hashable key from export options, e.g. for caching exports.
+
+    :param export_options: tuple(urlconf, whitelist, blacklist, language_without_country)
+        as returned by get_export_options
+    :return: tuple
+    """
+    urlconf, whitelist, blacklist, language_without_country = export_options
+    return (
+        urlconf,
+        frozenset(whitelist) if whitelist else None,
+        frozenset(blacklist) if blacklist else None,
+        bool(language_without_country),
+    )
+
+
+def _get_collapse_translations(collapse_translations):
+    if collapse_translations is None:
+        return getattr(settings, "URLCONF_EXPORT_COLLAPSE_TRANSLATIONS", False)
+    return collapse_translations
+
+
+def as_json(
+    urlconf=None,
+    whitelist=None,
+    blacklist=None,
+    language_without_country=None,
+    languages=None,
+    collapse_translations=None,
+):
+    """
+    Export URLconf data from a module, as list of JSON dictionaries.
+
+    :param urlconf: string - root module name to export URLconf from
+    :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
+    :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :param languages: list of language codes to export, or None for all. See get_export_languages
+    :param collapse_translations: boolean
+        Should translated URLs only list the languages that differ from a default?
+    :return: list of JSON URLconf dicts
+    """
+    urlconf, whitelist, blacklist, language_without_country = get_export_options(
+        urlconf, whitelist, blacklist, language_without_country
+    )
+
     root_resolver = django_urls.get_resolver(urlconf)
 
-    return _get_json_urlpatterns(root_resolver, whitelist, blacklist, language_without_country)
+    return _get_json_urlpatterns(
+        root_resolver,
+        whitelist,
+        blacklist,
+        language_without_country,
+        languages,
+        _get_collapse_translations(collapse_translations),
+    )
+
+
+def as_json_for_profiles(
+    profiles,
+    urlconf=None,
+    language_without_country=None,
+    languages=None,
+    collapse_translations=None,
+):
+    """
+    Export URLconf data from a module, with several whitelists and blacklists at once.
+
+    This is much faster than calling as_json for each profile,
+    because the URLconf is only walked and translated once.
+    The exports share their dicts of translated regexes, so must not be modified.
+
+    :param profiles: dict of profile name -> dict with optional "whitelist" and "blacklist",
+        e.g. {"public": {"blacklist": ["admin"]}, "internal": {}}
+        A missing whitelist or blacklist defaults to the Django setting, like as_json.
+    :param urlconf: string - root module name to export URLconf from
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :param languages: list of language codes to export, or None for all. See get_export_languages
+    :param collapse_translations: boolean
+        Should translated URLs only list the languages that differ from a default?
+    :return: dict of profile name -> list of JSON URLconf dicts
+    """
+    url_filters = []
+    for profile in profiles.values():
+        urlconf, whitelist, blacklist, language_without_country = get_export_options(
+            urlconf, profile.get("whitelist"), profile.get("blacklist"), language_without_country
+        )
+        url_filters.append(_UrlNameFilter(whitelist, blacklist))
+    if not url_filters:
+        return {}
+
+    root_resolver = django_urls.get_resolver(urlconf)
+
+    translated_urls = []
+    profile_json_urlpatterns = _get_filtered_json_urlpatterns(
+        root_resolver, url_filters, translated_urls
+    )
+    if translated_urls:
+        _translate_regex_patterns(
+            translated_urls,
+            get_export_languages(language_without_country, languages),
+            _get_collapse_translations(collapse_translations),
+        )
+    return dict(zip(profiles, profile_json_urlpatterns))
+
+
+def iter_json_urlpatterns(
+    urlconf=None,
+    whitelist=None,
+    blacklist=None,
+    language_without_country=None,
+    languages=None,
+    collapse_translations=None,
+):
+    """
+    Export URLconf data from a module, one JSON dictionary at a time.
+
+    This uses much less memory than as_json for very large URLconf.
+    The "includes" of each dict are not lists, but iterators of JSON dicts in the same format.
+    Each iterator must be consumed before moving on to the next dict.
+    write_json can write the output as JSON, without building it all in memory.
+
+    :param urlconf: string - root module name to export URLconf from
+    :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
+    :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :param languages: list of language codes to export, or None for all. See get_export_languages
+    :param collapse_translations: boolean
+        Should translated URLs only list the languages that differ from a default?
+    :return: iterator of JSON URLconf dicts
+    """
+    urlconf, whitelist, blacklist, language_without_country = get_export_options(
+        urlconf, whitelist, blacklist, language_without_country
+    )
+
+    root_resolver = django_urls.get_resolver(urlconf)
+
+    return _iter_filtered_json_urlpatterns(
+        root_resolver,
+        _UrlNameFilter(whitelist, blacklist),
+        get_export_languages(language_without_country, languages),
+        _get_collapse_translations(collapse_translations),
+    )
+
+
+_json_encoder = json.JSONEncoder()
+
+
+def _iter_json_chunks(value):
+    """
+    Encode a value as JSON, one chunk at a time.
+
+    Like json.JSONEncoder.iterencode, but lists may also be iterators.
+
+    :param value: JSON value - lists may be iterators
+    :return: iterator of strings
+    """
+    if isinstance(value, dict):
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                yield ", "
+            yield _json_encoder.encode(key)
+            yield ": "
+            yield from _iter_json_chunks(item)
+        yield "}"
+    elif value is None or isinstance(value, (str, int, float)):
+        yield _json_encoder.encode(value)
+    else:
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ", "
+            yield from _iter_json_chunks(item)
+        yield "]"
+
+
+def write_json(json_urlpatterns, stream, buffer_size=64 * 1024):
+    """
+    Write exported URLconf to a stream as JSON, without building the whole string in memory.
+
+    The output is identical to json.dumps(json_urlpatterns).
+
+    :param json_urlpatterns: list or iterator of JSON URLconf dicts
+        e.g. from as_json or iter_json_urlpatterns
+    :param stream: text file-like object to write to
+    :param buffer_size: int - approximate number of characters to write at a time
+    :return: None
+    """
+    stats = export_stats.get_active()
+    chunks = []
+    buffered = 0
+    for chunk in _iter_json_chunks(json_urlpatterns):
+        chunks.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            stream.write("".join(chunks))
+            if stats is not None:
+                stats.add_output(buffered)
+            chunks = []
+            buffered = 0
+    stream.write("".join(chunks))
+    if stats is not None:
+        stats.add_output(buffered)
+
+
+def get_fingerprint(json_urlpatterns):
+    """
+    Make a stable hash of exported URLconf.
+    The hash only changes when the URLconf changes, so it can be used
+    to check if URLconf needs to be imported or uploaded again.
+
+    :param json_urlpatterns: list of JSON URLconf dicts
+    :return: string - hex digest
+    """
+    # Canonical JSON, so e.g. the order of languages does not matter
+    canonical_json = json.dumps(json_urlpatterns, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+
+def with_fingerprint(json_urlpatterns, fingerprint=None):
+    """
+    Wrap exported URLconf in an envelope, with its fingerprint.
+    import_urlconf accepts the envelope, and skips importing if the fingerprint has not changed.
+
+    :param json_urlpatterns: list of JSON URLconf dicts, or a compact_format dict
+    :param fingerprint: string - fingerprint of the URLconf, if already known.
+        Pass this when wrapping the compact format, which is not fingerprinted itself.
+    :return: dict like {"fingerprint": "...", "urlpatterns": json_urlpatterns}
+    """
+    if fingerprint is None:
+        fingerprint = get_fingerprint(json_urlpatterns)
+    return {"fingerprint": fingerprint, "urlpatterns": json_urlpatterns}
 
 
 def get_all_exported_url_names(json_urlpatterns):
@@ -190,17 +770,46 @@ def get_all_exported_url_names(json_urlpatterns):
     Get all names and namespaces in some URLconf JSON.
 
     :param json_urlpatterns: list of JSON URLconf dicts
-    :return: list of strings; url_names and namespaces
+    :return: set of strings; url_names and namespaces
     """
     url_names = set()
-    for url in json_urlpatterns:
-        included_urls = url.get("includes")
-        if included_urls:
-            if url["namespace"] is not None:
-                url_names.add(url["namespace"])
-            url_names |= get_all_exported_url_names(included_urls)
-        else:
-            url_names.add(url["name"])
+    for event, json_url, _ in traversal.walk_json(json_urlpatterns):
+        if event == traversal.URL:
+            url_names.add(json_url["name"])
+        elif event == traversal.ENTER and json_url.get("namespace") is not None:
+            url_names.add(json_url["namespace"])
+    return url_names
+
+
+def _get_allowed_url_names(resolver, url_filter):
+    """
+    Get the names and namespaces that would be exported from a Django URLResolver.
+    Patterns are not exported or translated, so this is much faster than as_json.
+
+    :param resolver: URLResolver - resolver to export URLconf data from
+    :param url_filter: _UrlNameFilter - which url names and namespaces are allowed
+    :return: set of strings; url_names and namespaces
+    """
+    url_names = set()
+    # For each URLResolver we are in: were any of its urls exported?
+    exported = [False]
+    for event, django_url, _ in traversal.walk_resolver(
+        resolver, lambda django_url, _: _is_exported(django_url, url_filter)
+    ):
+        if event == traversal.ENTER:
+            exported.append(False)
+        elif event == traversal.LEAVE:
+            # Empty includes are not exported, so neither is their namespace
+            if exported.pop():
+                exported[-1] = True
+                if (
+                    not isinstance(django_url.pattern, LocalePrefixPattern)
+                    and django_url.namespace is not None
+                ):
+                    url_names.add(django_url.namespace)
+        elif _is_exported(django_url, url_filter):
+            url_names.add(django_url.name)
+            exported[-1] = True
     return url_names
 
 
@@ -215,7 +824,217 @@ def get_all_allowed_url_names(
     :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
     :param language_without_country: boolean
         Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
-    :return: list of strings; url_names and namespaces
+    :return: set of strings; url_names and namespaces
+    """
+    urlconf, whitelist, blacklist, language_without_country = get_export_options(
+        urlconf, whitelist, blacklist, language_without_country
+    )
+    root_resolver = django_urls.get_resolver(urlconf)
+    return _get_allowed_url_names(root_resolver, _UrlNameFilter(whitelist, blacklist))
+
+
+def _get_url_name_index(resolver, url_filter):
     """
-    json_urlpatterns = as_json(urlconf, whitelist, blacklist, language_without_country)
-    return get_all_exported_url_names(json_urlpatterns)
+    Decide which url names and namespaces in a Django URLResolver are exported, and why.
+    Unlike export, urls in namespaces that are not exported are walked too.
+    Patterns are not exported or translated.
+
+    :param resolver: URLResolver - resolver to export URLconf data from
+    :param url_filter: _UrlNameFilter - which url names and namespaces are allowed
+    :return: dict of namespaced url name (e.g. "admin:index") or namespace (e.g. "admin")
+        -> UrlNameDecision
+    """
+    index = {}
+    decisions = {}
+
+    def get_decision(name):
+        try:
+            return decisions[name]
+        except KeyError:
+            decision = decisions[name] = url_filter.get_decision(name)
+            return decision
+
+    def add(key, decision):
+        # The same name can be used more than once, it is exported if any of them are
+        if key not in index or decision.allowed:
+            index[key] = decision
+
+    # For each URLResolver we are in, a dict of:
+    # prefix - namespaces to add to url names e.g. "admin:"
+    # namespace - its namespaced key e.g. "admin", or None if it has no namespace
+    # decision - UrlNameDecision for its namespace, or None
+    # rejected - namespaced key of the namespace it is in that is not exported, or None
+    # exported - were any of its urls exported?
+    root = {"prefix": "", "namespace": None, "decision": None, "rejected": None, "exported": False}
+    open_resolvers = [root]
+    for event, django_url, _ in traversal.walk_resolver(resolver):
+        parent = open_resolvers[-1]
+
+        if event == traversal.ENTER:
+            open_resolver = dict(parent, namespace=None, decision=None, exported=False)
+            if not isinstance(django_url.pattern, LocalePrefixPattern) and django_url.namespace:
+                namespace = parent["prefix"] + django_url.namespace
+                if parent["rejected"]:
+                    decision = UrlNameDecision(False, "namespace", parent["rejected"])
+                else:
+                    decision = get_decision(django_url.namespace)
+                    if not decision.allowed:
+                        open_resolver["rejected"] = namespace
+                open_resolver.update(prefix=f"{namespace}:", namespace=namespace, decision=decision)
+            open_resolvers.append(open_resolver)
+
+        elif event == traversal.LEAVE:
+            open_resolver = open_resolvers.pop()
+            if open_resolver["exported"]:
+                open_resolvers[-1]["exported"] = True
+            if open_resolver["namespace"]:
+                decision = open_resolver["decision"]
+                if decision.allowed and not open_resolver["exported"]:
+                    decision = UrlNameDecision(False, "empty", None)
+                add(open_resolver["namespace"], decision)
+
+        elif django_url.name:
+            if parent["rejected"]:
+                decision = UrlNameDecision(False, "namespace", parent["rejected"])
+            else:
+                decision = get_decision(django_url.name)
+                if decision.allowed:
+                    parent["exported"] = True
+            add(parent["prefix"] + django_url.name, decision)
+    return index
+
+
+def get_url_name_index(urlconf=None, whitelist=None, blacklist=None, language_without_country=None):
+    """
+    Useful to find out why the whitelist and blacklist allow or don't allow each url.
+
+    :param urlconf: string - root module name to export URLconf from
+    :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
+    :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :return: dict of namespaced url name (e.g. "admin:index") or namespace (e.g. "admin")
+        -> UrlNameDecision
+    """
+    urlconf, whitelist, blacklist, language_without_country = get_export_options(
+        urlconf, whitelist, blacklist, language_without_country
+    )
+    root_resolver = django_urls.get_resolver(urlconf)
+    return _get_url_name_index(root_resolver, _UrlNameFilter(whitelist, blacklist))
+
+
+# Memoized exports, most recently used last.
+# Values are tuple(root URLResolver, result).
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_DEFAULT_CACHE_SIZE = 32
+
+
+def _get_cached(function, urlconf, whitelist, blacklist, language_without_country, *extra_args):
+    """
+    Call an export function, or return its memoized result.
+
+    Results are remembered until Django's URL caches are cleared
+    (get_resolver then returns a new root resolver) or export settings change.
+
+    :param function: export function taking the export options, then extra_args, as arguments
+    :param extra_args: more hashable arguments for the function, which are part of the cache key
+    :return: the (shared) result of the function
+    """
+    export_options = get_export_options(urlconf, whitelist, blacklist, language_without_country)
+    resolver = django_urls.get_resolver(export_options[0])
+    languages = tuple(language for language, _ in settings.LANGUAGES)
+    key = (function.__name__, get_export_key(export_options), languages, extra_args)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] is resolver:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    result = function(*export_options, *extra_args)
+
+    with _cache_lock:
+        _cache[key] = (resolver, result)
+        _cache.move_to_end(key)
+        max_size = getattr(settings, "URLCONF_EXPORT_CACHE_SIZE", _DEFAULT_CACHE_SIZE)
+        while len(_cache) > max_size:
+            _cache.popitem(last=False)
+    return result
+
+
+def cached_as_json(
+    urlconf=None,
+    whitelist=None,
+    blacklist=None,
+    language_without_country=None,
+    languages=None,
+    collapse_translations=None,
+):
+    """
+    Same as as_json, but the result is memoized.
+
+    The same list is returned to every caller, so it must not be modified.
+
+    :param urlconf: string - root module name to export URLconf from
+    :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
+    :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :param languages: list of language codes to export, or None for all. See get_export_languages
+    :param collapse_translations: boolean
+        Should translated URLs only list the languages that differ from a default?
+    :return: list of JSON URLconf dicts
+    """
+    return _get_cached(
+        as_json,
+        urlconf,
+        whitelist,
+        blacklist,
+        language_without_country,
+        tuple(languages) if languages is not None else None,
+        _get_collapse_translations(collapse_translations),
+    )
+
+
+def _get_all_allowed_url_names_frozenset(*export_options):
+    return frozenset(get_all_allowed_url_names(*export_options))
+
+
+def cached_get_all_allowed_url_names(
+    urlconf=None, whitelist=None, blacklist=None, language_without_country=None
+):
+    """
+    Same as get_all_allowed_url_names, but the result is memoized.
+
+    :param urlconf: string - root module name to export URLconf from
+    :param whitelist: list of strings; url_names and namespaces, allowed to be exported.
+    :param blacklist: list of strings; url_names and namespaces, not allowed to be exported.
+    :param language_without_country: boolean
+        Should translated URLs be keyed by e.g. "en" rather than "en-gb" and "en-us"?
+    :return: frozenset of strings; url_names and namespaces
+    """
+    return _get_cached(
+        _get_all_allowed_url_names_frozenset,
+        urlconf,
+        whitelist,
+        blacklist,
+        language_without_country,
+    )
+
+
+def clear_cache():
+    """
+    Forget all memoized exports.
+
+    :return: None
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+@receiver(setting_changed)
+def _clear_cache_when_settings_change(setting, **kwargs):
+    if setting in ("ROOT_URLCONF", "LANGUAGES") or setting.startswith("URLCONF_EXPORT_"):
+        clear_cache()
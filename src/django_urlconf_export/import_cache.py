@@ -0,0 +1,147 @@
+"""
+Last-known-good cache of downloaded URLconf, so services can start without waiting for it.
+
+Usage:
+
+    import_cache.from_uri("https://www.example.com/urlconf/", "/var/cache/urlconf.json")
+
+If the cache file is there, and not older than max_age, URLconf is imported from it straight away,
+and downloaded again in a background thread. Otherwise URLconf is downloaded before returning.
+Every successful download is saved to the cache file.
+
+The cache file is a fingerprint envelope (see export_urlconf.with_fingerprint) in plain JSON,
+with the ETag and Last-Modified headers of the download, so the next refresh is conditional.
+Plain JSON is the fastest of the export formats to load. The age of the cache is the time since
+it was last saved or confirmed unchanged by a download, from the file's modification time.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from django import conf as django_conf
+
+from django_urlconf_export import export_urlconf, import_urlconf
+
+
+def save(cache_path, json_urlpatterns, fingerprint=None, http_validators=None):
+    """
+    Save URLconf to a cache file.
+    The file is replaced atomically, so readers see the old or new file, never part of one.
+
+    :param cache_path: string - path of the cache file
+    :param json_urlpatterns: list of JSON URLconf dicts
+    :param fingerprint: string, or None to work it out
+    :param http_validators: dict of "uri", "etag" and "last_modified" from the download, or None
+    :return: None
+    """
+    if fingerprint is None:
+        fingerprint = export_urlconf.get_fingerprint(json_urlpatterns)
+    cache_dir = os.path.dirname(os.path.abspath(cache_path))
+    # The temporary file is in the same directory, so it can be renamed over the cache file
+    file_descriptor, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=".urlconf-", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as temp_file:
+            cached = export_urlconf.with_fingerprint(json_urlpatterns, fingerprint)
+            cached["httpValidators"] = http_validators
+            json.dump(cached, temp_file)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load(cache_path, max_age=None):
+    """
+    Load URLconf from a cache file.
+
+    :param cache_path: string - path of the cache file
+    :param max_age: seconds, or None for no limit
+    :return: dict - envelope from save, or None if the file is missing, unreadable or too old
+    """
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(cache_path) > max_age:
+            return None
+        with open(cache_path, "rb") as cache_file:
+            cached = json.loads(cache_file.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or "urlpatterns" not in cached:
+        return None
+    return cached
+
+
+def _get_max_age(max_age):
+    if max_age is None:
+        return getattr(django_conf.settings, "URLCONF_IMPORT_CACHE_MAX_AGE", None)
+    return max_age
+
+
+def refresh(uri, cache_path, urlconf=None, use_delta=False):
+    """
+    Download URLconf, import it, and save it to the cache file.
+
+    :param uri: string - URI to download URLconf JSON from
+    :param cache_path: string - path of the cache file
+    :param urlconf: string - name of module to import URLconf into
+    :param use_delta: boolean - see import_urlconf.from_uri
+    :return: boolean - was URLconf imported? See import_urlconf.from_uri
+    """
+    imported = import_urlconf.from_uri(uri, urlconf, use_delta=use_delta, retain_json=True)
+    urlconf_module = sys.modules.get(import_urlconf._get_urlconf_module_name(urlconf))
+    json_urlpatterns = getattr(urlconf_module, "urlconf_json", None)
+    cache_exists = os.path.exists(cache_path)
+    if json_urlpatterns is not None and (imported or not cache_exists):
+        save(
+            cache_path,
+            json_urlpatterns,
+            urlconf_module.urlconf_fingerprint,
+            urlconf_module.urlconf_http_validators,
+        )
+    elif cache_exists:
+        # The cached URLconf is still up to date
+        os.utime(cache_path)
+    return imported
+
+
+def from_uri(uri, cache_path, urlconf=None, max_age=None, use_delta=False, background=True):
+    """
+    Import URLconf from the cache file if possible, then download it. See module docstring.
+
+    :param uri: string - URI to download URLconf JSON from
+    :param cache_path: string - path of the cache file
+    :param urlconf: string - name of module to import URLconf into
+    :param max_age: seconds - don't use a cache older than this.
+        Defaults to settings.URLCONF_IMPORT_CACHE_MAX_AGE, or no limit.
+    :param use_delta: boolean - see import_urlconf.from_uri
+    :param background: boolean - when URLconf was imported from the cache,
+        download it in a background thread. If False, don't download it.
+    :return: threading.Thread downloading URLconf in the background, or None.
+        If the download fails, the exception goes to threading.excepthook,
+        and the URLconf from the cache stays imported.
+    """
+    cached = load(cache_path, _get_max_age(max_age))
+    if cached is None:
+        refresh(uri, cache_path, urlconf, use_delta)
+        return None
+
+    import_urlconf.from_json(cached, urlconf, retain_json=True)
+    # The next download is conditional on the download that was cached
+    urlconf_module = sys.modules[import_urlconf._get_urlconf_module_name(urlconf)]
+    urlconf_module.urlconf_http_validators = cached.get("httpValidators")
+
+    if not background:
+        return None
+    thread = threading.Thread(
+        target=refresh,
+        args=(uri, cache_path, urlconf, use_delta),
+        name="urlconf-cache-refresh",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -1,80 +1,262 @@
 import json
+import mmap
+import re
 import sys
+import threading
+import time
 import types
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pydoc import locate
+from types import MappingProxyType
 
 import django
 import requests
 from django import conf as django_conf
-from django.urls import LocalePrefixPattern, URLPattern, URLResolver, clear_url_caches
-from django.urls.resolvers import RegexPattern, RoutePattern
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import LocalePrefixPattern, URLPattern, URLResolver, clear_url_caches, get_resolver
+from django.urls.resolvers import RegexPattern, RoutePattern, get_ns_resolver
+from django.utils import translation
 from django.utils.functional import lazy
 from django.utils.translation import get_language
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from django_urlconf_export import language_utils
+from django_urlconf_export import compact_format, compression, delta, export_urlconf, language_utils
 from django_urlconf_export.views.http404 import Http404View
 
+# language code -> fallback chain, see language_utils.get_fallback_chain
+_fallback_chains = {}
 
-def _get_regex(regex):
+
+def _get_fallback_chain(language):
+    """
+    :param language: string - language code, or None if translation is deactivated
+    :return: tuple of keys to look for in translated url patterns
+    """
+    fallback_chain = _fallback_chains.get(language)
+    if fallback_chain is None:
+        fallback_chain = language_utils.get_fallback_chain(
+            language or django_conf.settings.LANGUAGE_CODE,
+            getattr(django_conf.settings, "URLCONF_IMPORT_LANGUAGE_FALLBACKS", None),
+        )
+        _fallback_chains[language] = fallback_chain
+    return fallback_chain
+
+
+@receiver(setting_changed)
+def _clear_fallback_chains_when_settings_change(setting, **kwargs):
+    if setting in ("LANGUAGE_CODE", "URLCONF_IMPORT_LANGUAGE_FALLBACKS"):
+        _fallback_chains.clear()
+
+
+class _TranslatedPattern:
+    """
+    Get a translated url pattern in the active language.
+    Each value is only looked up once, then remembered.
+    """
+
+    __slots__ = ("translations", "_values")
+
+    def __init__(self, translations):
+        self.translations = translations
+        # fallback chain -> value.
+        # Languages with the same fallback chain share a value,
+        # and a new chain after a settings change gets a new one.
+        self._values = {}
+
+    def __call__(self):
+        language = get_language()
+        fallback_chain = _fallback_chains.get(language) or _get_fallback_chain(language)
+        value = self._values.get(fallback_chain)
+        if value is None:
+            value = self._values[fallback_chain] = language_utils.get_translation(
+                self.translations, language, fallback_chain
+            )
+        return value
+
+
+def _call(function):
+    return function()
+
+
+def _identity(value):
+    return value
+
+
+# Django's lazy makes a new proxy class each time it is called, with a wrapper for every method
+# of str, so it is called once here, not once for each pattern
+_lazy_str = lazy(_call, str)
+
+
+class _SharedObjects:
+    """
+    Objects shared by all the url patterns in a low-memory import.
+    See settings.URLCONF_IMPORT_LOW_MEMORY.
+    """
+
+    __slots__ = ("view", "translated_patterns")
+
+    # Django only reads these, from every URLPattern and its pattern.
+    # Include patterns keep their own converters, because Django updates them.
+    empty_default_args = MappingProxyType({})
+    empty_converters = MappingProxyType({})
+
+    def __init__(self):
+        self.view = Http404View.as_view()
+        # tuple of translation items -> lazy string
+        self.translated_patterns = {}
+
+    @staticmethod
+    def get_string(string):
+        """
+        :param string: string or None
+        :return: the same string, interned so there is only one copy of it
+        """
+        if string is None:
+            return None
+        return sys.intern(string)
+
+    def get_translated_pattern(self, translations):
+        """
+        :param translations: dict of language -> regex string
+        :return: lazy string, shared by all url patterns with the same translations
+        """
+        key = tuple(translations.items())
+        translated_pattern = self.translated_patterns.get(key)
+        if translated_pattern is None:
+            translations = {
+                sys.intern(language): value if value is None else sys.intern(value)
+                for language, value in translations.items()
+            }
+            translated_pattern = _lazy_str(_TranslatedPattern(translations))
+            self.translated_patterns[key] = translated_pattern
+        return translated_pattern
+
+
+def _get_regex(regex, shared_objects=None):
     """
     For multi-language URLs, return a lazy string.
 
     :param regex: string or dict
         Either a regex string, or a dict where keys are languages and values are regex strings.
+        The dict can have a "default" key, for languages that are not in it.
+        Languages that are not in it fall back to the language without country, then "default",
+        then any fallbacks in settings.URLCONF_IMPORT_LANGUAGE_FALLBACKS.
+    :param shared_objects: _SharedObjects for a low-memory import, or None
     :return: string or lazy string
     """
     if isinstance(regex, str):
+        if shared_objects is not None:
+            return shared_objects.get_string(regex)
         return regex
     if isinstance(regex, dict):
         # regex is like {"en": "hello", "fr": "salut"}
+        # or with collapsed translations, {"default": "hello", "fr": "salut"}
         # create a lazy string that returns the regex
         # for the currently selected language
-        def _get_pattern():
-            language = get_language()
-            if regex.get(language):
-                return regex[language]
-            else:
-                # Fallback to language without country
-                # e.g. if "en-gb" is not defined, use value for "en"
-                language_without_country = language_utils.get_without_country(language)
-                return regex[language_without_country]
-
-        return lazy(_get_pattern, str)()
+        if shared_objects is not None:
+            return shared_objects.get_translated_pattern(regex)
+        return _lazy_str(_TranslatedPattern(regex))
     raise ValueError(f"Invalid regex: {regex}")
 
 
-def _get_pattern_class_and_regex(json_url):
+def _get_pattern_class_and_regex(json_url, shared_objects=None):
     """
     Parse JSON URLconf dict, and return the pattern class and regex
 
     :param json_url: JSON URLconf dict
+    :param shared_objects: _SharedObjects for a low-memory import, or None
     :return: tuple(class, string or lazy string)
     """
     regex = json_url.get("regex")
     if regex is not None:
-        return RegexPattern, _get_regex(regex)
+        return RegexPattern, _get_regex(regex, shared_objects)
 
     route = json_url.get("route")
     if route is not None:
-        return RoutePattern, _get_regex(route)
+        return RoutePattern, _get_regex(route, shared_objects)
 
     raise ValueError(f"Invalid json_url: {json_url}")
 
 
-def _get_django_urlpatterns(json_urlpatterns):
+class _LazyURLResolver(URLResolver):
+    """
+    URLResolver for a namespaced include, that keeps its urls as JSON
+    until something reverses or resolves into the namespace.
+    See settings.URLCONF_IMPORT_LAZY_NAMESPACES.
+    """
+
+    def __init__(
+        self, pattern, json_urlpatterns, shared_objects=None, app_name=None, namespace=None
+    ):
+        """
+        :param pattern: Django RoutePattern or RegexPattern of the include
+        :param json_urlpatterns: list of JSON URLconf dicts in the include
+        :param shared_objects: _SharedObjects for a low-memory import, or None
+        :param app_name: string
+        :param namespace: string
+        """
+        super().__init__(pattern, None, app_name=app_name, namespace=namespace)
+        self._json_urlpatterns = json_urlpatterns
+        self._shared_objects = shared_objects
+        # Django URL patterns, once they are built
+        self._url_patterns = None
+        # Only one thread builds the urls, and others wait for it
+        self._build_lock = threading.Lock()
+
+    @property
+    def url_patterns(self):
+        url_patterns = self._url_patterns
+        if url_patterns is None:
+            with self._build_lock:
+                if self._url_patterns is None:
+                    self._url_patterns = _get_django_urlpatterns(
+                        self._json_urlpatterns, self._shared_objects, lazy_namespaces=True
+                    )
+                    self._json_urlpatterns = None
+                url_patterns = self._url_patterns
+        return url_patterns
+
+    def _populate(self):
+        # The parent resolver populates its namespaced includes, but only uses their
+        # namespace and app_name. So wait until this include's own urls are needed.
+        if self._url_patterns is not None:
+            super()._populate()
+
+    @property
+    def reverse_dict(self):
+        self.url_patterns
+        return super().reverse_dict
+
+    @property
+    def namespace_dict(self):
+        self.url_patterns
+        return super().namespace_dict
+
+    @property
+    def app_dict(self):
+        self.url_patterns
+        return super().app_dict
+
+
+def _get_django_urlpatterns(json_urlpatterns, shared_objects=None, lazy_namespaces=False):
     """
     Parse JSON URLconf, and return a list of Django urlpatterns.
 
     :param json_urlpatterns: list of JSON URLconf dicts
+    :param shared_objects: _SharedObjects for a low-memory import, or None
+    :param lazy_namespaces: boolean - only make namespaced includes' urls when they are used.
+        See _LazyURLResolver.
     :return: list of Django URLResolver and URLPattern objects
     """
+    get_string = _SharedObjects.get_string if shared_objects is not None else _identity
     django_urlpatterns = []
     for json_url in json_urlpatterns:
         includes = json_url.get("includes")
         if includes:
             # Make a URLResolver
-            included_django_urlpatterns = _get_django_urlpatterns(includes)
-
             isLocalePrefix = json_url.get("isLocalePrefix")
             if isLocalePrefix:
                 # Make a LocalePrefixPattern.
@@ -85,42 +267,54 @@ def _get_django_urlpatterns(json_urlpatterns):
                         f"Locale prefix class {json_url.get('classPath')} "
                         f"is not a subclass of LocalePrefixPattern"
                     )
-                django_url = URLResolver(LocalePrefixPatternClass(), included_django_urlpatterns)
+                django_url = URLResolver(
+                    LocalePrefixPatternClass(),
+                    _get_django_urlpatterns(includes, shared_objects, lazy_namespaces),
+                )
 
             else:
                 # Make an include(...)
-                PatternClass, regex = _get_pattern_class_and_regex(json_url)
+                PatternClass, regex = _get_pattern_class_and_regex(json_url, shared_objects)
                 pattern = PatternClass(regex, is_endpoint=False)
-                django_url = URLResolver(
-                    pattern,
-                    included_django_urlpatterns,
-                    app_name=json_url.get("app_name"),
-                    namespace=json_url.get("namespace"),
-                )
+                app_name = get_string(json_url.get("app_name"))
+                namespace = get_string(json_url.get("namespace"))
+                if lazy_namespaces and app_name:
+                    django_url = _LazyURLResolver(
+                        pattern, includes, shared_objects, app_name=app_name, namespace=namespace
+                    )
+                else:
+                    django_url = URLResolver(
+                        pattern,
+                        _get_django_urlpatterns(includes, shared_objects, lazy_namespaces),
+                        app_name=app_name,
+                        namespace=namespace,
+                    )
 
         else:
             # Make a URLPattern
-            name = json_url.get("name")
-            PatternClass, regex = _get_pattern_class_and_regex(json_url)
+            name = get_string(json_url.get("name"))
+            PatternClass, regex = _get_pattern_class_and_regex(json_url, shared_objects)
             pattern = PatternClass(regex, name=name, is_endpoint=True)
             # Make a dummy view so the URL Pattern is valid.
             # If this view is ever actually rendered, it will return 404.
             # Note we're also ignoring the kwargs that can be added to url() definitions.
             # These are not used to generate urls, they are just passed to the view.
-            django_url = URLPattern(pattern, Http404View.as_view(), name=name)
+            if shared_objects is None:
+                django_url = URLPattern(pattern, Http404View.as_view(), name=name)
+            else:
+                django_url = URLPattern(pattern, shared_objects.view, name=name)
+                django_url.default_args = shared_objects.empty_default_args
+                if not pattern.converters:
+                    pattern.converters = shared_objects.empty_converters
 
         django_urlpatterns.append(django_url)
     return django_urlpatterns
 
 
-def _update_django_urlpatterns_in_module(django_urlpatterns, urlconf):
+def _get_urlconf_module_name(urlconf):
     """
-    Update the Django URLconf in a module.
-    Create the module if necessary.
-
-    :param django_urlpatterns: list of Django URLResolver and URLPattern objects
-    :param urlconf: string - name of module to save the urlpatterns in
-    :return: None
+    :param urlconf: string or None - name of module to import URLconf into
+    :return: string - name of module to import URLconf into, defaulting to Django settings
     """
     if urlconf is None:
         urlconf = getattr(django_conf.settings, "URLCONF_IMPORT_ROOT_URLCONF", None)
@@ -135,6 +329,23 @@ def _update_django_urlpatterns_in_module(django_urlpatterns, urlconf):
             "You can use any name you like for the urlconf module, and "
             "it will be created if it doesn't already exist."
         )
+    return urlconf
+
+
+def _update_django_urlpatterns_in_module(
+    django_urlpatterns, urlconf, fingerprint=None, json_urlpatterns=None
+):
+    """
+    Update the Django URLconf in a module.
+    Create the module if necessary.
+
+    :param django_urlpatterns: list of Django URLResolver and URLPattern objects
+    :param urlconf: string - name of module to save the urlpatterns in
+    :param fingerprint: string or None - fingerprint of the imported URLconf
+    :param json_urlpatterns: list of JSON URLconf dicts to keep, so deltas can be applied later
+    :return: None
+    """
+    urlconf = _get_urlconf_module_name(urlconf)
 
     if sys.modules.get(urlconf):
         module_already_existed = True
@@ -148,47 +359,383 @@ def _update_django_urlpatterns_in_module(django_urlpatterns, urlconf):
 
     # Create or overwrite urlpatterns
     urlconf_module.urlpatterns = django_urlpatterns
+    urlconf_module.urlconf_fingerprint = fingerprint
+    urlconf_module.urlconf_json = json_urlpatterns
+    # ETag and Last-Modified of the download, set by from_uri
+    urlconf_module.urlconf_http_validators = None
 
     # If the module already existed, Django might have cached some URLconf from it
     if module_already_existed:
         clear_url_caches()
 
 
-def from_json(json_urlpatterns, urlconf=None):
+def get_fingerprint(urlconf=None):
+    """
+    Get the fingerprint of the URLconf that was last imported into a module.
+
+    :param urlconf: string - name of module URLconf was imported into
+    :return: string, or None if the URLconf was imported without a fingerprint
+    """
+    urlconf_module = sys.modules.get(_get_urlconf_module_name(urlconf))
+    return getattr(urlconf_module, "urlconf_fingerprint", None)
+
+
+def _apply_delta(json_delta, urlconf):
+    """
+    Apply a delta from URLConfExportView to the URLconf last imported into a module.
+
+    :param json_delta: dict like {"fingerprint": "...", "since": "...", "delta": {...}}
+    :param urlconf: string - name of module URLconf was imported into
+    :return: list of JSON URLconf dicts
+    """
+    since = json_delta["since"]
+    urlconf_module = sys.modules.get(_get_urlconf_module_name(urlconf))
+    json_urlpatterns = getattr(urlconf_module, "urlconf_json", None)
+    if json_urlpatterns is None or get_fingerprint(urlconf) != since:
+        raise ValueError(
+            f"Can't apply URLconf delta since {since}, "
+            f"because that URLconf was not the last imported with retain_json=True"
+        )
+
+    json_urlpatterns = delta.apply_delta(json_urlpatterns, json_delta["delta"])
+    if export_urlconf.get_fingerprint(json_urlpatterns) != json_delta["fingerprint"]:
+        raise ValueError(f"URLconf delta since {since} did not give the expected URLconf")
+    return json_urlpatterns
+
+
+def _retain_json(json_urlpatterns, urlconf):
+    """
+    Keep the JSON of the URLconf already imported into a module, if it was not kept,
+    so deltas can be applied to it.
+
+    :param json_urlpatterns: list of JSON URLconf dicts, or a compact_format dict
+    :param urlconf: string - name of module URLconf was imported into
+    :return: None
+    """
+    urlconf_module = sys.modules[_get_urlconf_module_name(urlconf)]
+    if urlconf_module.urlconf_json is None:
+        if compact_format.is_compact(json_urlpatterns):
+            json_urlpatterns = compact_format.expand(json_urlpatterns)
+        urlconf_module.urlconf_json = json_urlpatterns
+
+
+def from_json(json_urlpatterns, urlconf=None, retain_json=False):
     """
     Import URLconf from a list of JSON dict
 
-    :param json_urlpatterns: list of JSON URLconf dicts
+    If the JSON is wrapped in an envelope with a fingerprint (see export_urlconf.with_fingerprint)
+    and the same fingerprint was imported last time, nothing is imported,
+    but the JSON is still kept if retain_json is set.
+
+    :param json_urlpatterns: list of JSON URLconf dicts, or a compact_format dict,
+        or either of these wrapped in an envelope with a fingerprint,
+        or a delta from URLConfExportView
     :param urlconf: string - name of module to import URLconf into
-    :return: None
+    :param retain_json: boolean - keep the JSON, so deltas can be imported later.
+        Always True when importing a delta.
+    :return: boolean - was URLconf imported?
     """
-    django_urlpatterns = _get_django_urlpatterns(json_urlpatterns)
-    _update_django_urlpatterns_in_module(django_urlpatterns, urlconf)
+    fingerprint = None
+    if isinstance(json_urlpatterns, dict) and "fingerprint" in json_urlpatterns:
+        fingerprint = json_urlpatterns["fingerprint"]
+        if fingerprint == get_fingerprint(urlconf):
+            if retain_json and "urlpatterns" in json_urlpatterns:
+                _retain_json(json_urlpatterns["urlpatterns"], urlconf)
+            return False
+        if "delta" in json_urlpatterns:
+            json_urlpatterns = _apply_delta(json_urlpatterns, urlconf)
+            retain_json = True
+        else:
+            json_urlpatterns = json_urlpatterns["urlpatterns"]
+
+    if compact_format.is_compact(json_urlpatterns):
+        json_urlpatterns = compact_format.expand(json_urlpatterns)
+    shared_objects = None
+    if getattr(django_conf.settings, "URLCONF_IMPORT_LOW_MEMORY", False):
+        shared_objects = _SharedObjects()
+    lazy_namespaces = getattr(django_conf.settings, "URLCONF_IMPORT_LAZY_NAMESPACES", False)
+    django_urlpatterns = _get_django_urlpatterns(json_urlpatterns, shared_objects, lazy_namespaces)
+    _update_django_urlpatterns_in_module(
+        django_urlpatterns, urlconf, fingerprint, json_urlpatterns if retain_json else None
+    )
+    return True
+
+
+LoadedFile = namedtuple(
+    "LoadedFile", ["json_urlpatterns", "fingerprint", "codec", "compact", "load_time", "parse_time"]
+)
+LoadedFile.__doc__ = """
+A URLconf file loaded by load_file.
+
+json_urlpatterns - parsed JSON, or None if parsing was skipped because the fingerprint was unchanged
+fingerprint - string from the file's envelope, or None if it has no envelope
+codec - one of compression.CODECS, or None if the file is not compressed
+compact - boolean - is the URLconf in compact_format? None if it was not parsed
+load_time - seconds spent reading and decompressing the file
+parse_time - seconds spent parsing the JSON
+"""
+
+# The start of an envelope written by export_urlconf.with_fingerprint
+_FINGERPRINT_PREFIX = re.compile(rb'\s*\{\s*"fingerprint"\s*:\s*"([^"\\]*)"')
+# Enough of a file to find the fingerprint in
+_FINGERPRINT_PREFIX_SIZE = 256
+
+
+def load_file(file_path, unless_fingerprint=None):
+    """
+    Read, decompress and parse a URLconf file, timing each step.
+
+    The file is memory-mapped, and its compression is detected from its magic bytes.
+    If the file is an envelope with a fingerprint, and it is unless_fingerprint,
+    only the start of the file is decompressed, and the JSON is not parsed.
+
+    :param file_path: string - location of file containing URLconf JSON
+    :param unless_fingerprint: string - fingerprint of URLconf that is already imported, or None
+    :return: LoadedFile
+    """
+    start_time = time.perf_counter()
+    with open(file_path, "rb") as json_file:
+        try:
+            data = mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be memory-mapped
+            data = b""
+        try:
+            codec = compression.get_codec(data)
+            match = _FINGERPRINT_PREFIX.match(
+                compression.decompress_head(data, _FINGERPRINT_PREFIX_SIZE)
+            )
+            fingerprint = match.group(1).decode() if match else None
+            if fingerprint is not None and fingerprint == unless_fingerprint:
+                load_time = time.perf_counter() - start_time
+                return LoadedFile(None, fingerprint, codec, None, load_time, 0.0)
+            if codec is None:
+                # json needs bytes, and reading is faster than copying them from the map
+                content = json_file.read()
+            else:
+                content = compression.decompress(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    load_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    json_urlpatterns = json.loads(content)
+    parse_time = time.perf_counter() - start_time
+
+    json_data = json_urlpatterns
+    if isinstance(json_data, dict) and "urlpatterns" in json_data:
+        json_data = json_data["urlpatterns"]
+    return LoadedFile(
+        json_urlpatterns,
+        fingerprint,
+        codec,
+        compact_format.is_compact(json_data),
+        load_time,
+        parse_time,
+    )
 
 
 def from_file(file_path, urlconf=None):
     """
-    Import URLconf from a file
+    Import URLconf from a file.
+    The file can be compressed with any of compression.CODECS.
+
+    If the file is an envelope with the fingerprint that was imported last time,
+    the file is not parsed, and nothing is imported. See load_file.
 
     :param file_path: string - location of file containing URLconf JSON
     :param urlconf: string - name of module to import URLconf into
+    :return: boolean - was URLconf imported? See from_json
+    """
+    loaded_file = load_file(file_path, unless_fingerprint=get_fingerprint(urlconf))
+    if loaded_file.json_urlpatterns is None:
+        return False
+    return from_json(loaded_file.json_urlpatterns, urlconf)
+
+
+# Shared by all downloads, so connections are reused
+_session = None
+_session_lock = threading.Lock()
+
+_DEFAULT_TIMEOUT = 10
+_DEFAULT_RETRIES = 3
+_DEFAULT_BACKOFF_FACTOR = 0.5
+# Statuses worth retrying, e.g. while the exporting service is being deployed
+_RETRY_STATUSES = (502, 503, 504)
+
+
+def _get_session():
+    """
+    :return: requests.Session that retries with backoff,
+        configured by settings.URLCONF_IMPORT_RETRIES and URLCONF_IMPORT_BACKOFF_FACTOR
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=getattr(django_conf.settings, "URLCONF_IMPORT_RETRIES", _DEFAULT_RETRIES),
+                backoff_factor=getattr(
+                    django_conf.settings, "URLCONF_IMPORT_BACKOFF_FACTOR", _DEFAULT_BACKOFF_FACTOR
+                ),
+                status_forcelist=_RETRY_STATUSES,
+                # Return the last response, so raise_for_status gives the error
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def close_session():
+    """
+    Close the connections used to download URLconf. A new session is made for the next download.
+
     :return: None
     """
-    with open(file_path) as json_file:
-        json_urlpatterns = json.load(json_file)
-    from_json(json_urlpatterns, urlconf)
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
 
+@receiver(setting_changed)
+def _close_session_when_settings_change(setting, **kwargs):
+    if setting in ("URLCONF_IMPORT_RETRIES", "URLCONF_IMPORT_BACKOFF_FACTOR"):
+        close_session()
 
-def from_uri(uri, urlconf=None):
+
+def from_uri(uri, urlconf=None, use_delta=False, retain_json=False):
     """
-    Import URLconf downloaded from a URI
+    Import URLconf downloaded from a URI.
+    The download can be compressed with any of compression.CODECS
+
+    Connections are reused, and requests that fail are retried with backoff.
+    If the last import into this module was from the same URI,
+    the request is conditional on its ETag and Last-Modified headers.
+    If the server responds 304 Not Modified, nothing is parsed or imported.
+
+    Settings:
+        URLCONF_IMPORT_TIMEOUT - seconds, or tuple(connect seconds, read seconds). Default 10.
+        URLCONF_IMPORT_RETRIES - number of retries. Default 3.
+        URLCONF_IMPORT_BACKOFF_FACTOR - retries wait factor * 2 ** (retry - 1) seconds.
+            Default 0.5.
 
     :param uri: string - URI to download URLconf JSON from
     :param urlconf: string - name of module to import URLconf into
-    :return: None
+    :param use_delta: boolean - ask URLConfExportView for only the changes
+        since the last import, if its JSON was retained. The JSON is retained
+        to apply the changes to.
+    :param retain_json: boolean - keep the JSON, see from_json
+    :return: boolean - was URLconf imported? See from_json
+    :raise requests.RequestException: if the download fails
+    """
+    urlconf = _get_urlconf_module_name(urlconf)
+    params = None
+    if use_delta:
+        # A delta can only be applied to retained JSON, so without it, ask for the full URLconf
+        retained_json = getattr(sys.modules.get(urlconf), "urlconf_json", None)
+        since = get_fingerprint(urlconf) if retained_json is not None else None
+        params = {"since": since or ""}
+
+    headers = {}
+    http_validators = getattr(sys.modules.get(urlconf), "urlconf_http_validators", None)
+    if http_validators and http_validators["uri"] == uri:
+        if http_validators["etag"]:
+            headers["If-None-Match"] = http_validators["etag"]
+        if http_validators["last_modified"]:
+            headers["If-Modified-Since"] = http_validators["last_modified"]
+
+    response = _get_session().get(
+        uri,
+        params=params,
+        headers=headers,
+        timeout=getattr(django_conf.settings, "URLCONF_IMPORT_TIMEOUT", _DEFAULT_TIMEOUT),
+    )
+    if response.status_code == 304:
+        return False
+    response.raise_for_status()
+
+    # requests decodes any Content-Encoding, so this only decompresses
+    # e.g. a urlconf.json.gz file that is served as-is.
+    json_urlpatterns = json.loads(compression.decompress(response.content))
+    imported = from_json(json_urlpatterns, urlconf, retain_json=retain_json or use_delta)
+    # Importing clears these, so they always match the imported URLconf
+    sys.modules[urlconf].urlconf_http_validators = {
+        "uri": uri,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return imported
+
+
+WarmUpResult = namedtuple("WarmUpResult", ["total_time", "language_times"])
+WarmUpResult.__doc__ = """
+How long warm_up took.
+
+total_time - seconds for the whole warm-up
+language_times - dict of language code -> seconds to warm up that language.
+    With threads, languages are warmed up at the same time, so these add up to more than total_time.
+"""
+
+
+def _warm_up_language(resolver, language):
     """
-    json_urlpatterns = requests.get(uri).json()
-    from_json(json_urlpatterns, urlconf)
+    Populate a resolver's reverse dictionaries in one language,
+    including the resolvers Django makes to reverse namespaced url names.
+
+    :param resolver: URLResolver
+    :param language: string - language code
+    :return: float - seconds taken
+    """
+    start_time = time.perf_counter()
+    with translation.override(language):
+        # Accessing reverse_dict populates the resolver, and all included resolvers
+        resolver.reverse_dict
+        # Reversing a namespaced url name uses a resolver for the namespace's pattern,
+        # made and populated on first use. Make them now, the same way reverse() does.
+        namespaces = [("", {}, resolver)]
+        while namespaces:
+            namespace_pattern, namespace_converters, namespace_resolver = namespaces.pop()
+            for extra, sub_resolver in namespace_resolver.namespace_dict.values():
+                sub_pattern = namespace_pattern + extra
+                sub_converters = {**namespace_converters, **sub_resolver.pattern.converters}
+                if sub_pattern:
+                    get_ns_resolver(
+                        sub_pattern, sub_resolver, tuple(sub_converters.items())
+                    ).reverse_dict
+                namespaces.append((sub_pattern, sub_converters, sub_resolver))
+    return time.perf_counter() - start_time
+
+
+def warm_up(urlconf=None, languages=None, threads=0):
+    """
+    Prepare Django to reverse url names in every language, e.g. after importing URLconf.
+
+    Django prepares its resolver for each language the first time a url is reversed in it,
+    which can be slow for a large URLconf. Call this before serving requests, so they don't wait.
+
+    :param urlconf: string - name of module URLconf was imported into
+    :param languages: list of language codes, or None for all settings.LANGUAGES
+    :param threads: int - number of threads to warm up languages on, or 0 for this thread
+    :return: WarmUpResult
+    """
+    start_time = time.perf_counter()
+    resolver = get_resolver(_get_urlconf_module_name(urlconf))
+    if languages is None:
+        languages = [language for language, _ in django_conf.settings.LANGUAGES]
+
+    if threads:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            times = executor.map(lambda language: _warm_up_language(resolver, language), languages)
+            language_times = dict(zip(languages, times))
+    else:
+        language_times = {language: _warm_up_language(resolver, language) for language in languages}
+    return WarmUpResult(time.perf_counter() - start_time, language_times)
 
 
 def init_django(**override_settings):
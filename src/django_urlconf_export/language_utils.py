@@ -11,3 +11,66 @@ def get_without_country(language):
     if not includes_country(language):
         return language
     return language.split("-")[0]
+
+
+class MissingTranslationError(KeyError):
+    """
+    A translated url pattern has no value for a language, or any of its fallbacks.
+    """
+
+    def __str__(self):
+        # KeyError would show the message in quotes
+        return str(self.args[0])
+
+
+def get_fallback_chain(language, fallbacks=None):
+    """
+    List the keys to look for in a translated url pattern, in order.
+
+    The language is followed by the language without country, then the "default" key
+    that collapsed translations have, then the fallback languages for the language,
+    or for the language without country.
+
+    :param language: string - language code e.g. "pt-br"
+    :param fallbacks: dict of language code -> list of fallback language codes,
+        e.g. {"pt-br": ["pt", "en"]}, or None
+    :return: tuple of keys e.g. ("pt-br", "pt", "default", "en")
+    """
+    language_without_country = get_without_country(language)
+    chain = [language]
+    if language_without_country != language:
+        chain.append(language_without_country)
+    chain.append("default")
+    if fallbacks:
+        fallback_languages = fallbacks.get(language)
+        if fallback_languages is None:
+            fallback_languages = fallbacks.get(language_without_country, ())
+        for fallback_language in fallback_languages:
+            for key in (fallback_language, get_without_country(fallback_language)):
+                if key not in chain:
+                    chain.append(key)
+    return tuple(chain)
+
+
+def get_translation(translations, language, fallback_chain=None):
+    """
+    Get the value of a translated url pattern in a language.
+
+    :param translations: dict like {"en": "hello", "fr": "salut"}.
+        It can have a "default" key, for languages that are not in it.
+    :param language: string - language code e.g. "en-gb"
+    :param fallback_chain: tuple of keys to look for, from get_fallback_chain,
+        or None for the language, the language without country, then "default"
+    :return: string
+    :raise MissingTranslationError: if none of the keys are in translations
+    """
+    if fallback_chain is None:
+        fallback_chain = get_fallback_chain(language)
+    for key in fallback_chain:
+        value = translations.get(key)
+        if value is not None:
+            return value
+    raise MissingTranslationError(
+        f"Url pattern {translations} has no translation for language {language}. "
+        f"Tried {', '.join(fallback_chain)}"
+    )
@@ -1,8 +1,21 @@
+import io
 import json
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from django_urlconf_export import export_urlconf
+from django_urlconf_export import compact_format, compression, export_stats, export_urlconf
+
+
+class _OutputWrapperStream:
+    """
+    Text stream that writes to a command's stdout, without adding a line ending to each write.
+    """
+
+    def __init__(self, output_wrapper):
+        self.output_wrapper = output_wrapper
+
+    def write(self, text):
+        self.output_wrapper.write(text, ending="")
 
 
 class Command(BaseCommand):
@@ -21,6 +34,43 @@ class Command(BaseCommand):
         --language-without-country \
         > urlconf.json
 
+        django-admin export_urlconf_to_file --output urlconf.json
+
+        django-admin export_urlconf_to_file --languages fr de > urlconf-fr-de.json
+
+        django-admin export_urlconf_to_file --collapse-translations > urlconf.json
+
+        django-admin export_urlconf_to_file --profile > urlconf.json 2> export-stats.txt
+
+        django-admin export_urlconf_to_file --compress > urlconf.json.gz
+
+        django-admin export_urlconf_to_file --compress xz --output urlconf.json.xz
+
+        django-admin export_urlconf_to_file --compact > urlconf.json
+
+        django-admin export_urlconf_to_file --fingerprint > urlconf.json 2> urlconf.fingerprint
+
+        django-admin export_urlconf_to_file \
+        --export-profiles profiles.json \
+        --output 'urlconf-{profile}.json'
+
+    The JSON is written as it is exported, so very large URLconf
+    does not need to fit in memory. Except with --compact or --fingerprint,
+    because the shared strings or the fingerprint must be worked out first,
+    and with --profile, to time each include.
+
+    With --profile, stats about the export are printed to stderr:
+    the time spent in the slowest includes, translation time, pattern counts and output size.
+
+    With --fingerprint, the JSON is wrapped in an envelope with its fingerprint,
+    and the fingerprint is also printed to stderr.
+
+    With --export-profiles, a file is written for each profile in a JSON file like:
+
+        {"public": {"blacklist": ["admin"]}, "partner": {"whitelist": ["partner-.*"]}}
+
+    The URLconf is only walked and translated once for all the profiles.
+    --output must contain "{profile}", which is replaced by each profile name.
     """
 
     def add_arguments(self, parser):
@@ -43,18 +93,171 @@ class Command(BaseCommand):
             action="store_false",
             help="Save multi-language url patterns by language + country",
         )
+        parser.add_argument(
+            "--collapse-translations",
+            dest="collapse_translations",
+            action="store_true",
+            help="Only save the languages that differ from a default in multi-language url patterns",
+        )
+        parser.add_argument(
+            "--languages",
+            type=str,
+            nargs="*",
+            help="Only export translated urls in these languages, and the fallback language",
+        )
+        parser.add_argument(
+            "--output", type=str, help="Write to this file, instead of printing to stdout"
+        )
+        parser.add_argument(
+            "--compress",
+            type=str,
+            nargs="?",
+            const="gzip",
+            choices=compression.CODECS,
+            help="Compress the output with this codec (default: gzip)",
+        )
+        parser.add_argument(
+            "--compact",
+            action="store_true",
+            help="Save in the compact format, where repeated strings are stored once",
+        )
+        parser.add_argument(
+            "--fingerprint",
+            action="store_true",
+            help="Wrap the output in an envelope with its fingerprint, and print it to stderr",
+        )
+        parser.add_argument(
+            "--export-profiles",
+            dest="export_profiles",
+            type=str,
+            help="Export a file for each whitelist and blacklist profile in this JSON file",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print stats about where export time goes to stderr",
+        )
         parser.set_defaults(
-            urlconf=None, whitelist=None, blacklist=None, language_without_country=None
+            urlconf=None,
+            whitelist=None,
+            blacklist=None,
+            language_without_country=None,
+            collapse_translations=None,
+            languages=None,
+            output=None,
+            compress=None,
+            compact=False,
+            fingerprint=False,
+            export_profiles=None,
+            profile=False,
         )
 
     def handle(self, *args, **options):
-        print(
-            json.dumps(
-                export_urlconf.as_json(
-                    options["urlconf"],
-                    options["whitelist"],
-                    options["blacklist"],
-                    options["language_without_country"],
+        if not options["profile"]:
+            self.handle_export(options)
+            return
+
+        with export_stats.record() as stats:
+            self.handle_export(options)
+        self.stderr.write(stats.format(), ending="")
+
+    def handle_export(self, options):
+        if options["export_profiles"]:
+            self.handle_export_profiles(options)
+            return
+
+        export_options = (
+            options["urlconf"],
+            options["whitelist"],
+            options["blacklist"],
+            options["language_without_country"],
+        )
+        language_options = {
+            "languages": options["languages"],
+            "collapse_translations": options["collapse_translations"],
+        }
+        if options["compact"] or options["fingerprint"] or options["profile"]:
+            json_urlpatterns = self.get_output_json(
+                export_urlconf.as_json(*export_options, **language_options), options
+            )
+        else:
+            json_urlpatterns = export_urlconf.iter_json_urlpatterns(
+                *export_options, **language_options
+            )
+        if options["output"]:
+            with open(options["output"], "wb") as output_file:
+                self.write_output(json_urlpatterns, output_file, options["compress"])
+        elif options["compress"]:
+            # Compressed output is bytes, so it is written to the binary stream under stdout
+            binary_stream = getattr(self.stdout, "buffer", None)
+            if binary_stream is None:
+                raise CommandError(
+                    "Compressed output can't be written to this stdout. Use --output instead."
                 )
+            self.stdout.flush()
+            self.write_output(json_urlpatterns, binary_stream, options["compress"])
+            binary_stream.flush()
+        else:
+            stream = _OutputWrapperStream(self.stdout)
+            export_urlconf.write_json(json_urlpatterns, stream)
+            stream.write("\n")
+
+    def handle_export_profiles(self, options):
+        if not options["output"] or "{profile}" not in options["output"]:
+            raise CommandError(
+                '--export-profiles needs an --output file name containing "{profile}"'
+            )
+        if options["whitelist"] is not None or options["blacklist"] is not None:
+            raise CommandError(
+                "--whitelist and --blacklist can't be used with --export-profiles. "
+                "Set them in the profiles instead."
             )
+        with open(options["export_profiles"]) as profiles_file:
+            profiles = json.load(profiles_file)
+
+        profile_json_urlpatterns = export_urlconf.as_json_for_profiles(
+            profiles,
+            options["urlconf"],
+            options["language_without_country"],
+            options["languages"],
+            options["collapse_translations"],
         )
+        for profile, json_urlpatterns in profile_json_urlpatterns.items():
+            json_urlpatterns = self.get_output_json(json_urlpatterns, options)
+            with open(options["output"].replace("{profile}", profile), "wb") as output_file:
+                self.write_output(json_urlpatterns, output_file, options["compress"])
+
+    def get_output_json(self, json_urlpatterns, options):
+        """
+        Convert exported URLconf to the format chosen in the command options.
+
+        :param json_urlpatterns: list of JSON URLconf dicts
+        :param options: dict of command options
+        :return: JSON to write
+        """
+        if not (options["compact"] or options["fingerprint"]):
+            return json_urlpatterns
+        fingerprint = export_urlconf.get_fingerprint(json_urlpatterns)
+        if options["compact"]:
+            json_urlpatterns = compact_format.compact(json_urlpatterns)
+        if options["fingerprint"]:
+            json_urlpatterns = export_urlconf.with_fingerprint(json_urlpatterns, fingerprint)
+            self.stderr.write(fingerprint)
+        return json_urlpatterns
+
+    def write_output(self, json_urlpatterns, binary_stream, codec):
+        if codec:
+            output_stream = compression.open_writer(binary_stream, codec)
+        else:
+            output_stream = binary_stream
+
+        text_stream = io.TextIOWrapper(output_stream, encoding="utf-8", newline="\n")
+        export_urlconf.write_json(json_urlpatterns, text_stream)
+        text_stream.write("\n")
+        text_stream.flush()
+        # Don't let the text wrapper close the output stream
+        text_stream.detach()
+
+        if codec:
+            # Write the end of the compressed stream
+            output_stream.close()
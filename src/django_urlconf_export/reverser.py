@@ -0,0 +1,357 @@
+"""
+Reverse url names from exported URLconf JSON, without Django's resolver.
+
+Usage:
+
+    reverser = Reverser(json_urlpatterns)
+    reverser.reverse("admin:user", kwargs={"pk": 1}, language="fr")
+
+Django settings and the active language are never used, so this works in services
+that have not called import_urlconf.init_django, and in any thread.
+
+The first reverse of each url name in each language compiles a list of candidates,
+like Django's reverse dictionary: a format template for each possible url,
+the set of kwargs it takes, the converters for those kwargs,
+and a regex to check the url against. Later reverses only fill in a template.
+
+Urls are the same as Django's reverse would make from the same JSON
+after import_urlconf.from_json, in the same language.
+Locale prefixes are always "<language>/", like Django's LocalePrefixPattern.
+"""
+
+import re
+from urllib.parse import quote
+
+from django.urls import NoReverseMatch
+from django.urls.resolvers import RoutePattern
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
+from django.utils.regex_helper import normalize
+
+from django_urlconf_export import compact_format, language_utils, traversal
+
+# Safe characters from the pchar definition of RFC 3986, as in Django's reverse
+_SAFE_CHARACTERS = RFC3986_SUBDELIMS + "/~:@"
+# Anything that quote would change
+_NEEDS_QUOTING = re.compile(f"[^A-Za-z0-9_.\\-{re.escape(_SAFE_CHARACTERS)}]")
+
+
+class _Level:
+    """
+    Url names and namespaces that can be reversed from one namespace, or the root URLconf.
+
+    names - dict of url name -> list of tuple(pattern, converters), in URLconf order.
+        Patterns are relative to the namespace.
+    namespaces - dict of namespace -> tuple(pattern, converters, _Level)
+    apps - dict of app_name -> list of namespaces, in URLconf order
+    """
+
+    __slots__ = ("names", "namespaces", "apps")
+
+    def __init__(self):
+        self.names = {}
+        self.namespaces = {}
+        self.apps = {}
+
+
+class _Candidate:
+    """
+    One possible url for a url name.
+    """
+
+    __slots__ = ("template", "params", "converters", "check_regex")
+
+    def __init__(self, template, params, converters, check_regex):
+        # Format string for the url, with a %(param)s for each kwarg
+        self.template = template
+        self.params = params
+        self.converters = converters
+        # The url with the kwargs filled in must match this
+        self.check_regex = check_regex
+
+
+class Reverser:
+    """
+    Make urls from exported URLconf JSON. See module docstring.
+    """
+
+    def __init__(
+        self,
+        json_urlpatterns,
+        default_language="en-us",
+        prefix="/",
+        languages=None,
+        language_fallbacks=None,
+    ):
+        """
+        :param json_urlpatterns: list of JSON URLconf dicts, or a compact_format dict,
+            or either of these wrapped in an envelope with a fingerprint
+        :param default_language: string - language to reverse in, when none is given
+        :param prefix: string - prefix for all urls, like Django's script prefix
+        :param languages: list of language codes to compile all url names for now,
+            or None to compile each url name when it is first reversed
+        :param language_fallbacks: dict of language code -> list of fallback language codes,
+            for translated urls, like settings.URLCONF_IMPORT_LANGUAGE_FALLBACKS
+        """
+        if isinstance(json_urlpatterns, dict) and "urlpatterns" in json_urlpatterns:
+            json_urlpatterns = json_urlpatterns["urlpatterns"]
+        if compact_format.is_compact(json_urlpatterns):
+            json_urlpatterns = compact_format.expand(json_urlpatterns)
+        self.json_urlpatterns = json_urlpatterns
+        self.default_language = default_language
+        self.prefix = prefix
+        self.language_fallbacks = language_fallbacks
+        # language -> root _Level
+        self._levels = {}
+        # tuple(url name, language) -> list of _Candidate
+        self._candidates = {}
+        # Translated patterns are often the same string in many languages,
+        # so each distinct pattern is only parsed once
+        self._route_regexes = {}
+        self._normalized_patterns = {}
+
+        for language in languages or ():
+            for url_name in self.get_url_names(language):
+                self._compile(url_name, language)
+
+    def _get_pattern(self, json_url, language, fallback_chain, is_endpoint):
+        """
+        :param json_url: JSON URLconf dict
+        :param language: string - language code
+        :param fallback_chain: tuple of keys to look for in translated patterns
+        :param is_endpoint: boolean - False for includes
+        :return: tuple(string - regex, without a leading "^", dict of kwarg -> converter)
+        """
+        regex = json_url.get("regex")
+        if regex is not None:
+            if isinstance(regex, dict):
+                regex = language_utils.get_translation(regex, language, fallback_chain)
+            converters = {}
+        else:
+            route = json_url.get("route")
+            if route is None:
+                raise ValueError(f"Invalid json_url: {json_url}")
+            if isinstance(route, dict):
+                route = language_utils.get_translation(route, language, fallback_chain)
+            key = (route, is_endpoint)
+            route_regex = self._route_regexes.get(key)
+            if route_regex is None:
+                route_pattern = RoutePattern(route, is_endpoint=is_endpoint)
+                route_regex = self._route_regexes[key] = (
+                    route_pattern.regex.pattern,
+                    route_pattern.converters,
+                )
+            regex, converters = route_regex
+        if regex.startswith("^"):
+            regex = regex[1:]
+        return regex, converters
+
+    def _get_level(self, language):
+        """
+        Index the URLconf in a language, like Django's URLResolver._populate.
+
+        :param language: string - language code
+        :return: root _Level
+        """
+        root_level = self._levels.get(language)
+        if root_level is not None:
+            return root_level
+
+        root_level = _Level()
+        fallback_chain = language_utils.get_fallback_chain(language, self.language_fallbacks)
+        # For each include being walked: tuple(_Level that its url names are added to,
+        # pattern from that level to the include, converters from that level to the include)
+        stack = [(root_level, "", {})]
+        for event, json_url, _ in traversal.walk_json(self.json_urlpatterns):
+            if event == traversal.LEAVE:
+                stack.pop()
+                continue
+
+            level, level_pattern, level_converters = stack[-1]
+            if json_url.get("isLocalePrefix"):
+                pattern, converters = f"{language}/", {}
+            else:
+                pattern, converters = self._get_pattern(
+                    json_url, language, fallback_chain, is_endpoint=event == traversal.URL
+                )
+            if converters:
+                converters = {**level_converters, **converters}
+            else:
+                converters = level_converters
+
+            if event == traversal.URL:
+                name = json_url.get("name")
+                if name is not None:
+                    level.names.setdefault(name, []).append((level_pattern + pattern, converters))
+            elif json_url.get("app_name"):
+                # Namespaced include. If a namespace is used twice, the first one is reversed.
+                namespace = json_url.get("namespace")
+                sub_level = _Level()
+                level.namespaces.setdefault(
+                    namespace, (level_pattern + pattern, converters, sub_level)
+                )
+                level.apps.setdefault(json_url["app_name"], []).append(namespace)
+                stack.append((sub_level, "", {}))
+            else:
+                stack.append((level, level_pattern + pattern, converters))
+
+        self._levels[language] = root_level
+        return root_level
+
+    def _normalize(self, pattern):
+        normalized_pattern = self._normalized_patterns.get(pattern)
+        if normalized_pattern is None:
+            normalized_pattern = self._normalized_patterns[pattern] = normalize(pattern)
+        return normalized_pattern
+
+    def _compile(self, url_name, language):
+        """
+        :param url_name: string - url name, with any namespaces e.g. "admin:user"
+        :param language: string - language code
+        :return: list of _Candidate, in the order Django tries them
+        """
+        *path, name = url_name.split(":")
+        level = self._get_level(language)
+        namespace_pattern = ""
+        namespace_converters = {}
+        resolved_path = []
+        for namespace in path:
+            # An app_name means its default instance, or else the last instance
+            app_namespaces = level.apps.get(namespace)
+            if app_namespaces is not None and namespace not in app_namespaces:
+                namespace = app_namespaces[-1]
+            try:
+                pattern, converters, level = level.namespaces[namespace]
+            except KeyError:
+                if resolved_path:
+                    raise NoReverseMatch(
+                        f"{namespace} is not a registered namespace inside "
+                        f"'{':'.join(resolved_path)}'"
+                    )
+                raise NoReverseMatch(f"'{namespace}' is not a registered namespace")
+            resolved_path.append(namespace)
+            namespace_pattern += pattern
+            namespace_converters.update(converters)
+
+        escaped_prefix = self.prefix.replace("%", "%%")
+        candidates = []
+        # Django tries the last url with a name first
+        for pattern, converters in reversed(level.names.get(name, ())):
+            pattern = namespace_pattern + pattern
+            if namespace_converters:
+                converters = {**namespace_converters, **converters}
+            check_regex = re.compile(f"^{re.escape(self.prefix)}{pattern}")
+            for template, params in self._normalize(pattern):
+                candidates.append(
+                    _Candidate(escaped_prefix + template, set(params), converters, check_regex)
+                )
+        self._candidates[(url_name, language)] = candidates
+        return candidates
+
+    def get_url_names(self, language=None):
+        """
+        :param language: string - language code, or None for default_language
+        :return: list of url names that can be reversed, with namespaces e.g. "admin:user"
+        """
+        url_names = []
+        levels = [("", self._get_level(language or self.default_language))]
+        while levels:
+            namespace_path, level = levels.pop()
+            url_names.extend(f"{namespace_path}{name}" for name in level.names)
+            for namespace, (_, _, sub_level) in level.namespaces.items():
+                levels.append((f"{namespace_path}{namespace}:", sub_level))
+        return url_names
+
+    def _get_candidates(self, url_name, language):
+        candidates = self._candidates.get((url_name, language))
+        if candidates is None:
+            candidates = self._compile(url_name, language)
+        return candidates
+
+    def _make_url(self, candidates, url_name, kwargs, language):
+        """
+        :param candidates: list of _Candidate for the url name and language
+        :param url_name: string - url name, for errors
+        :param kwargs: dict of url kwargs, or None
+        :param language: string - language code, for errors
+        :return: string - url
+        """
+        if kwargs is None:
+            kwargs = {}
+        kwarg_names = kwargs.keys()
+        for candidate in candidates:
+            if kwarg_names != candidate.params:
+                continue
+            converters = candidate.converters
+            text_kwargs = {}
+            try:
+                for key, value in kwargs.items():
+                    converter = converters.get(key)
+                    text_kwargs[key] = str(value) if converter is None else converter.to_url(value)
+            except ValueError:
+                continue
+            url = candidate.template % text_kwargs
+            if candidate.check_regex.search(url):
+                # Most urls have nothing to quote, and quote is slow.
+                # Django also calls iri_to_uri, but that does nothing after quote.
+                if _NEEDS_QUOTING.search(url):
+                    url = quote(url, safe=_SAFE_CHARACTERS)
+                return escape_leading_slashes(url)
+
+        if candidates:
+            raise NoReverseMatch(
+                f"Reverse for '{url_name}' with keyword arguments '{kwargs}' not found "
+                f"in language '{language}'. {len(candidates)} pattern(s) tried."
+            )
+        raise NoReverseMatch(
+            f"Reverse for '{url_name}' not found. '{url_name}' is not a valid pattern name."
+        )
+
+    def reverse(self, url_name, kwargs=None, language=None):
+        """
+        Make a url, like Django's reverse.
+
+        :param url_name: string - url name, with any namespaces e.g. "admin:user"
+        :param kwargs: dict of url kwargs, or None
+        :param language: string - language code, or None for default_language
+        :return: string - url
+        :raise NoReverseMatch: if there is no url for the name and kwargs
+        """
+        if language is None:
+            language = self.default_language
+        return self._make_url(self._get_candidates(url_name, language), url_name, kwargs, language)
+
+    def reverse_many(self, url_name, kwargs_iterable, language=None):
+        """
+        Make many urls, e.g. for a sitemap.
+        Urls are made as they are iterated, so kwargs_iterable can be a generator.
+
+        Usage:
+
+            reverser.reverse_many("product", ({"pk": pk} for pk in product_ids), "fr")
+            reverser.reverse_many(None, [("product", {"pk": 1}), ("shop", {"slug": "a"})])
+
+        :param url_name: string - url name for all the urls, with any namespaces e.g. "admin:user".
+            Or None, if kwargs_iterable has a url name for each url.
+        :param kwargs_iterable: iterable of dicts of url kwargs,
+            or tuple(url name, dict of url kwargs) if url_name is None
+        :param language: string - language code, or None for default_language
+        :return: iterator of strings - urls
+        :raise NoReverseMatch: when it gets to kwargs that there is no url for
+        """
+        if language is None:
+            language = self.default_language
+        make_url = self._make_url
+
+        if url_name is not None:
+            candidates = self._get_candidates(url_name, language)
+            for kwargs in kwargs_iterable:
+                yield make_url(candidates, url_name, kwargs, language)
+            return
+
+        candidates_by_url_name = {}
+        for url_name, kwargs in kwargs_iterable:
+            candidates = candidates_by_url_name.get(url_name)
+            if candidates is None:
+                candidates = self._get_candidates(url_name, language)
+                candidates_by_url_name[url_name] = candidates
+            yield make_url(candidates, url_name, kwargs, language)
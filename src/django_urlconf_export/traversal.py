@@ -0,0 +1,81 @@
+"""
+Depth-first traversal of URLconf, without recursion.
+
+Deeply nested includes only grow a list of iterators, not the Python call stack,
+and nothing is copied: urls are yielded as they are reached.
+
+walk yields tuple(event, url, parents) where event is one of:
+    URL - a url without includes e.g. a URLPattern
+    ENTER - a url with includes e.g. a URLResolver, before its included urls
+    LEAVE - the same url again, after its included urls
+parents is a tuple of the urls that include this url, outermost first.
+"""
+
+from django.urls import URLResolver
+
+URL = "url"
+ENTER = "enter"
+LEAVE = "leave"
+
+
+def walk(urlpatterns, get_includes, should_enter=None):
+    """
+    Walk URLconf depth first, in urlpatterns order.
+
+    :param urlpatterns: iterable of urls to walk
+    :param get_includes: function(url) -> iterable of included urls,
+        or None if the url does not include other urls
+    :param should_enter: function(url, parents) -> boolean, or None to enter all urls.
+        Return False to skip a url with includes. It is not yielded,
+        and neither are any of its included urls.
+    :return: iterator of tuple(event, url, parents)
+    """
+    iterators = [iter(urlpatterns)]
+    parents = ()
+    while iterators:
+        for url in iterators[-1]:
+            includes = get_includes(url)
+            if includes is None:
+                yield URL, url, parents
+            elif should_enter is None or should_enter(url, parents):
+                yield ENTER, url, parents
+                parents += (url,)
+                iterators.append(iter(includes))
+                break
+        else:
+            # All urls on this level were walked
+            iterators.pop()
+            if parents:
+                parents, url = parents[:-1], parents[-1]
+                yield LEAVE, url, parents
+
+
+def _get_resolver_includes(django_url):
+    if isinstance(django_url, URLResolver):
+        return django_url.url_patterns
+    return None
+
+
+def walk_resolver(resolver, should_enter=None):
+    """
+    Walk the URLResolvers and URLPatterns in a Django URLResolver.
+
+    :param resolver: URLResolver to walk, e.g. from django.urls.get_resolver
+    :param should_enter: function(URLResolver, parents) -> boolean, see walk
+    :return: iterator of tuple(event, URLResolver or URLPattern, parents)
+    """
+    return walk(resolver.url_patterns, _get_resolver_includes, should_enter)
+
+
+def _get_json_includes(json_url):
+    return json_url.get("includes") or None
+
+
+def walk_json(json_urlpatterns):
+    """
+    Walk exported URLconf JSON.
+
+    :param json_urlpatterns: list of JSON URLconf dicts
+    :return: iterator of tuple(event, JSON URLconf dict, parents)
+    """
+    return walk(json_urlpatterns, _get_json_includes)
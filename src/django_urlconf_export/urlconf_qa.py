@@ -2,11 +2,13 @@ import re
 from textwrap import dedent
 
 from django.conf import settings
-from django.urls import LocalePrefixPattern, URLPattern, URLResolver, get_resolver
+from django.urls import LocalePrefixPattern, get_resolver
 from django.urls.resolvers import RegexPattern, RoutePattern
 from django.utils import translation
 from django.utils.functional import Promise
 
+from django_urlconf_export import traversal
+
 
 def assert_url_kwargs_are_the_same_for_all_languages(urlconf=None):
     """
@@ -19,61 +21,58 @@ def assert_url_kwargs_are_the_same_for_all_languages(urlconf=None):
 
     urls_with_translation_errors = []
 
-    def if_not_none(value):
-        if value:
-            return value
-        return ""
-
-    def find_urls_with_translation_errors(urls, parent_pattern=None):
-        for url in urls.url_patterns:
-            if isinstance(url, URLResolver):
-                find_urls_with_translation_errors(
-                    url, if_not_none(parent_pattern) + url.pattern.regex.pattern
+    # Pattern of each URLResolver we are in, joined with its parents' patterns
+    parent_patterns = [""]
+
+    for event, url, _ in traversal.walk_resolver(urls):
+        if event == traversal.ENTER:
+            parent_patterns.append(parent_patterns[-1] + url.pattern.regex.pattern)
+            continue
+        if event == traversal.LEAVE:
+            parent_patterns.pop()
+            continue
+
+        full_pattern = parent_patterns[-1] + url.pattern.regex.pattern
+
+        # Ignore Django Admin urls
+        if full_pattern.startswith("^admin/"):
+            continue
+
+        # Ignore locale prefix pattern urls
+        if isinstance(url.pattern, LocalePrefixPattern):
+            continue
+
+        if isinstance(url.pattern, RegexPattern):
+            pattern_regex = url.pattern._regex
+        elif isinstance(url.pattern, RoutePattern):
+            pattern_regex = url.pattern._route
+        else:
+            raise ValueError(f"Invalid URL Pattern type: {url.pattern}")
+
+        # We only want to check translated URLs.
+        # These will have a promise for their pattern regex.
+        if not isinstance(pattern_regex, Promise):
+            continue
+
+        # we only want to check URLs that have kwargs
+        # i.e. URLs that have named capture groups
+        with translation.override("en"):
+            en_regex = re.compile(str(pattern_regex))
+        if not en_regex.groups or not en_regex.groupindex.keys():
+            continue
+
+        # What are the 'en' kwargs?
+        en_kwargs = set(en_regex.groupindex.keys())
+
+        # Check each language has the same kwargs
+        for language, _ in settings.LANGUAGES:
+            with translation.override(language):
+                language_regex = re.compile(str(pattern_regex))
+                kwargs_for_language = set(language_regex.groupindex.keys())
+            if kwargs_for_language != en_kwargs:
+                urls_with_translation_errors.append(
+                    (url.name, full_pattern, language, en_kwargs, kwargs_for_language)
                 )
-            elif isinstance(url, URLPattern):
-                full_pattern = if_not_none(parent_pattern) + url.pattern.regex.pattern
-
-                # Ignore Django Admin urls
-                if full_pattern.startswith("^admin/"):
-                    continue
-
-                # Ignore locale prefix pattern urls
-                if isinstance(url.pattern, LocalePrefixPattern):
-                    continue
-
-                if isinstance(url.pattern, RegexPattern):
-                    pattern_regex = url.pattern._regex
-                elif isinstance(url.pattern, RoutePattern):
-                    pattern_regex = url.pattern._route
-                else:
-                    raise ValueError(f"Invalid URL Pattern type: {url.pattern}")
-
-                # We only want to check translated URLs.
-                # These will have a promise for their pattern regex.
-                if not isinstance(pattern_regex, Promise):
-                    continue
-
-                # we only want to check URLs that have kwargs
-                # i.e. URLs that have named capture groups
-                with translation.override("en"):
-                    en_regex = re.compile(str(pattern_regex))
-                if not en_regex.groups or not en_regex.groupindex.keys():
-                    continue
-
-                # What are the 'en' kwargs?
-                en_kwargs = set(en_regex.groupindex.keys())
-
-                # Check each language has the same kwargs
-                for language, _ in settings.LANGUAGES:
-                    with translation.override(language):
-                        language_regex = re.compile(str(pattern_regex))
-                        kwargs_for_language = set(language_regex.groupindex.keys())
-                    if kwargs_for_language != en_kwargs:
-                        urls_with_translation_errors.append(
-                            (url.name, full_pattern, language, en_kwargs, kwargs_for_language)
-                        )
-
-    find_urls_with_translation_errors(urls)
 
     error_message = dedent(
         """\
@@ -109,47 +108,46 @@ def assert_all_urls_use_kwargs_not_args(urlconf=None):
 
     non_admin_urls_with_args = []
 
-    def if_not_none(value):
-        if value:
-            return value
-        return ""
+    # Pattern of each URLResolver we are in, joined with its parents' patterns
+    parent_patterns = [""]
 
-    def find_non_admin_urls_with_args(urls, parent_pattern=None):
-        for url in urls.url_patterns:
-            regex = url.pattern.regex
+    for event, url, _ in traversal.walk_resolver(urls):
+        regex = url.pattern.regex
 
-            if isinstance(url, URLResolver):
-                find_non_admin_urls_with_args(url, if_not_none(parent_pattern) + regex.pattern)
-            elif isinstance(url, URLPattern):
-                pattern = if_not_none(parent_pattern) + regex.pattern
+        if event == traversal.ENTER:
+            parent_patterns.append(parent_patterns[-1] + regex.pattern)
+            continue
+        if event == traversal.LEAVE:
+            parent_patterns.pop()
+            continue
 
-                # Ignore Django Admin urls
-                if pattern.startswith("^admin/"):
-                    continue
+        pattern = parent_patterns[-1] + regex.pattern
 
-                # regex.groups = number of capture groups (named or unnamed) in the url
-                # regex.groupindex = dictionary of the named captured groups only.
-                if regex.groups and regex.groups != len(regex.groupindex.keys()):
+        # Ignore Django Admin urls
+        if pattern.startswith("^admin/"):
+            continue
 
-                    # There must be some non-named capture groups.
-                    # I.E. some url 'args' as opposed to 'kwargs'
+        # regex.groups = number of capture groups (named or unnamed) in the url
+        # regex.groupindex = dictionary of the named captured groups only.
+        if regex.groups and regex.groups != len(regex.groupindex.keys()):
 
-                    # Note that this test will also fail for urls like this:
-                    # ^shop/^(?P<gender>(mens|womens))/$
+            # There must be some non-named capture groups.
+            # I.E. some url 'args' as opposed to 'kwargs'
 
-                    # On first glance this doesn't have any 'args'.
-                    # However, the brackets within the named gender group count as a group.
-                    # These brackets are also unnecessary. The URL works fine like this:
-                    # # ^shop/^(?P<gender>mens|womens)/$
+            # Note that this test will also fail for urls like this:
+            # ^shop/^(?P<gender>(mens|womens))/$
 
-                    # In rare cases where the regex requires brackets within a named group
-                    # to work properly, you can write 'non-capturing' brackets that begins
-                    # with '?:' like this:
-                    # (?:mens|womens)
+            # On first glance this doesn't have any 'args'.
+            # However, the brackets within the named gender group count as a group.
+            # These brackets are also unnecessary. The URL works fine like this:
+            # # ^shop/^(?P<gender>mens|womens)/$
 
-                    non_admin_urls_with_args.append((url.name, pattern))
+            # In rare cases where the regex requires brackets within a named group
+            # to work properly, you can write 'non-capturing' brackets that begins
+            # with '?:' like this:
+            # (?:mens|womens)
 
-    find_non_admin_urls_with_args(urls)
+            non_admin_urls_with_args.append((url.name, pattern))
 
     error_message = dedent(
         """\
@@ -1,7 +1,167 @@
-from django.http import JsonResponse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django import urls as django_urls
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
 from django.views import View
 
-from django_urlconf_export import export_urlconf
+from django_urlconf_export import compact_format, compression, delta, export_urlconf
+
+FINGERPRINT_HEADER = "X-URLconf-Fingerprint"
+
+# Serialized exports, keyed by export profile, most recently used last.
+# The URLconf only changes on deploy, so we only export it once per process.
+_cached_exports = OrderedDict()
+
+# Recent exports for each export profile, to make deltas from.
+# Values are OrderedDict of fingerprint -> list of JSON URLconf dicts, most recent last.
+_export_history = {}
+
+# Guards _cached_exports and _export_history, which requests in different threads share
+_cache_lock = threading.Lock()
+
+_DEFAULT_DELTA_HISTORY = 3
+
+# Prefix of keys in the URLCONF_EXPORT_DELTA_CACHE cache
+_DELTA_CACHE_KEY_PREFIX = "django_urlconf_export:export:"
+
+# Clients can ask for any set of languages, so limit how many exports are cached
+_DEFAULT_CACHE_SIZE = 32
+
+
+class _Representation:
+    """
+    Serialized content, and its compressed versions.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.content_hash = hashlib.sha256(content).hexdigest()
+        # content_encoding -> compressed content, compressed when first requested
+        self._compressed_content = {}
+
+    def get_content(self, content_encoding):
+        if content_encoding is None:
+            return self.content
+        compressed_content = self._compressed_content.get(content_encoding)
+        if compressed_content is None:
+            compressed_content = compression.compress(self.content, content_encoding)
+            self._compressed_content[content_encoding] = compressed_content
+        return compressed_content
+
+    def get_etag(self, content_encoding):
+        # Each encoding of the content is a different representation, so needs its own ETag
+        if content_encoding is None:
+            return quote_etag(self.content_hash)
+        return quote_etag(f"{self.content_hash}-{content_encoding}")
+
+
+class _CachedExport:
+    def __init__(self, profile, resolver, json_urlpatterns, fingerprint, compact):
+        self.profile = profile
+        # The root resolver this export was made from.
+        # Django makes a new one when the URL caches are cleared.
+        self.resolver = resolver
+        self.json_urlpatterns = json_urlpatterns
+        self.fingerprint = fingerprint
+        self.compact = compact
+        # variant -> _Representation, serialized when first requested.
+        # Variants are None for the export, "envelope" for the export with its fingerprint,
+        # or ("delta", fingerprint) for a delta from an earlier export.
+        self._representations = {}
+        self._compact_json = None
+
+    def _get_json(self):
+        if not self.compact:
+            return self.json_urlpatterns
+        if self._compact_json is None:
+            self._compact_json = compact_format.compact(self.json_urlpatterns)
+        return self._compact_json
+
+    def get_representation(self, variant, since_json_urlpatterns=None):
+        """
+        :param variant: None, "envelope" or ("delta", fingerprint)
+        :param since_json_urlpatterns: for a delta, the export to make the delta from
+        :return: _Representation
+        """
+        representation = self._representations.get(variant)
+        if representation is None:
+            if variant is None:
+                json_data = self._get_json()
+            elif variant == "envelope":
+                json_data = export_urlconf.with_fingerprint(self._get_json(), self.fingerprint)
+            else:
+                _, since = variant
+                json_data = {
+                    "fingerprint": self.fingerprint,
+                    "since": since,
+                    "delta": delta.make_delta(since_json_urlpatterns, self.json_urlpatterns),
+                }
+            representation = _Representation(json.dumps(json_data, cls=DjangoJSONEncoder).encode())
+            self._representations[variant] = representation
+        return representation
+
+
+def _get_delta_cache():
+    """
+    :return: Django cache that keeps exports to make deltas from, across processes and deploys,
+        or None if settings.URLCONF_EXPORT_DELTA_CACHE is not set
+    """
+    alias = getattr(settings, "URLCONF_EXPORT_DELTA_CACHE", None)
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def _get_accepted_encodings(accept_encoding):
+    """
+    Parse an Accept-Encoding header.
+
+    :param accept_encoding: string e.g. "gzip;q=1.0, identity; q=0.5, *;q=0"
+    :return: dict of content encoding -> quality e.g. {"gzip": 1.0, "identity": 0.5, "*": 0.0}
+    """
+    accepted_encodings = {}
+    for accepted_encoding in accept_encoding.split(","):
+        content_encoding, *params = accepted_encoding.split(";")
+        content_encoding = content_encoding.strip().lower()
+        if not content_encoding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted_encodings[content_encoding] = quality
+    return accepted_encodings
+
+
+def clear_cache():
+    """
+    Forget all cached exports. They will be exported again on the next request.
+
+    :return: None
+    """
+    with _cache_lock:
+        _cached_exports.clear()
+        _export_history.clear()
+
+
+@receiver(setting_changed)
+def _clear_cache_when_settings_change(setting, **kwargs):
+    if setting in ("ROOT_URLCONF", "LANGUAGES") or setting.startswith("URLCONF_EXPORT_"):
+        clear_cache()
 
 
 class URLConfExportView(View):
@@ -9,15 +169,189 @@ class URLConfExportView(View):
     This view returns URLconf json. Usage example:
 
     url(r"^urlconf/", URLConfExportView.as_view(blacklist=["secret-url"])),
+
+    The json is cached, and sent with an ETag.
+    Clients that send the ETag back in an If-None-Match header get a 304 if nothing changed.
+
+    The json is compressed for clients that accept one of content_encodings,
+    in order of preference.
+
+    Set compact=True to return json in the smaller compact_format.
+
+    Set collapse_translations=True to only list the languages that differ from a default
+    in translated urls. Defaults to the URLCONF_EXPORT_COLLAPSE_TRANSLATIONS setting.
+
+    The fingerprint of the URLconf (see export_urlconf.get_fingerprint)
+    is sent in the X-URLconf-Fingerprint header.
+
+    Clients can send the fingerprint they have in a "since" query parameter.
+    If the view still has that export, it returns a delta (see the delta module).
+    Set URLCONF_EXPORT_DELTA_CACHE to a cache alias, to keep exports for deltas across processes.
+    Otherwise it returns the export in an envelope with its fingerprint.
+
+    Clients can ask for only some languages in a "languages" query parameter, e.g. "?languages=fr,de".
+    Translated urls are then exported in those languages, and the fallback language.
+    See export_urlconf.get_export_languages. Set languages to do the same for all requests.
     """
 
     urlconf = None
     whitelist = None
     blacklist = None
     language_without_country = None
+    content_encodings = ("gzip",)
+    compact = False
+    languages = None
+    collapse_translations = None
 
-    def get(self, request):
-        exported_urls = export_urlconf.as_json(
+    def get_languages(self, request):
+        """
+        Choose which languages to export translated urls in.
+
+        :param request: HttpRequest
+        :return: list of language codes, or None for all languages
+        """
+        languages = request.GET.get("languages")
+        if languages is None:
+            return self.languages
+        return [language.strip() for language in languages.split(",") if language.strip()]
+
+    def get_cached_export(self, languages=None):
+        """
+        Get the cached export for this view, exporting it if necessary.
+
+        :param languages: list of language codes, or None for all languages
+        :return: _CachedExport
+        """
+        export_options = export_urlconf.get_export_options(
             self.urlconf, self.whitelist, self.blacklist, self.language_without_country
         )
-        return JsonResponse(exported_urls, safe=False)
+        if languages is not None:
+            # Different requests for the same export languages share the cached export
+            languages = tuple(export_urlconf.get_export_languages(export_options[3], languages))
+        collapse_translations = self.collapse_translations
+        if collapse_translations is None:
+            collapse_translations = getattr(settings, "URLCONF_EXPORT_COLLAPSE_TRANSLATIONS", False)
+        profile = (
+            export_urlconf.get_export_key(export_options),
+            self.compact,
+            languages,
+            bool(collapse_translations),
+        )
+        resolver = django_urls.get_resolver(export_options[0])
+
+        with _cache_lock:
+            cached_export = _cached_exports.get(profile)
+            if cached_export is not None and cached_export.resolver is resolver:
+                _cached_exports.move_to_end(profile)
+                return cached_export
+
+        json_urlpatterns = export_urlconf.as_json(
+            *export_options, languages=languages, collapse_translations=collapse_translations
+        )
+        fingerprint = export_urlconf.get_fingerprint(json_urlpatterns)
+        cached_export = _CachedExport(
+            profile, resolver, json_urlpatterns, fingerprint, self.compact
+        )
+
+        with _cache_lock:
+            _cached_exports[profile] = cached_export
+            _cached_exports.move_to_end(profile)
+            max_size = getattr(settings, "URLCONF_EXPORT_CACHE_SIZE", _DEFAULT_CACHE_SIZE)
+            while len(_cached_exports) > max_size:
+                evicted_profile, _ = _cached_exports.popitem(last=False)
+                _export_history.pop(evicted_profile, None)
+        self.add_to_history(cached_export)
+        return cached_export
+
+    def add_to_history(self, cached_export):
+        """
+        Remember an export, so later exports can be sent as a delta from it.
+        Each process remembers its last few exports. Set URLCONF_EXPORT_DELTA_CACHE
+        to a cache alias to also keep them in that cache, for other processes and after a deploy.
+
+        :param cached_export: _CachedExport
+        :return: None
+        """
+        max_size = getattr(settings, "URLCONF_EXPORT_DELTA_HISTORY", _DEFAULT_DELTA_HISTORY)
+        with _cache_lock:
+            history = _export_history.setdefault(cached_export.profile, OrderedDict())
+            history[cached_export.fingerprint] = cached_export.json_urlpatterns
+            history.move_to_end(cached_export.fingerprint)
+            while len(history) > max_size:
+                history.popitem(last=False)
+
+        delta_cache = _get_delta_cache()
+        if delta_cache is not None:
+            # The fingerprint identifies the export, whichever profile it came from
+            delta_cache.set(
+                _DELTA_CACHE_KEY_PREFIX + cached_export.fingerprint, cached_export.json_urlpatterns
+            )
+
+    def get_representation(self, request, cached_export):
+        """
+        Choose what to send: the export, a delta, or the export in an envelope.
+
+        :param request: HttpRequest
+        :param cached_export: _CachedExport
+        :return: _Representation
+        """
+        since = request.GET.get("since")
+        if since is None:
+            return cached_export.get_representation(None)
+
+        with _cache_lock:
+            since_json_urlpatterns = _export_history.get(cached_export.profile, {}).get(since)
+        if since_json_urlpatterns is None:
+            delta_cache = _get_delta_cache()
+            if delta_cache is not None:
+                since_json_urlpatterns = delta_cache.get(_DELTA_CACHE_KEY_PREFIX + since)
+        if since_json_urlpatterns is None:
+            # We don't have the client's export, so send the whole thing
+            return cached_export.get_representation("envelope")
+        return cached_export.get_representation(("delta", since), since_json_urlpatterns)
+
+    def get_content_encoding(self, request):
+        """
+        Choose how to compress the response.
+
+        :param request: HttpRequest
+        :return: string - one of content_encodings, or None to not compress
+        """
+        accepted_encodings = _get_accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        best_content_encoding = None
+        best_quality = 0.0
+        for content_encoding in self.content_encodings:
+            quality = accepted_encodings.get(content_encoding, accepted_encodings.get("*", 0.0))
+            if quality > best_quality:
+                best_content_encoding = content_encoding
+                best_quality = quality
+        return best_content_encoding
+
+    def get(self, request):
+        cached_export = self.get_cached_export(self.get_languages(request))
+        representation = self.get_representation(request, cached_export)
+        content_encoding = self.get_content_encoding(request)
+        etag = representation.get_etag(content_encoding)
+
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            # If-None-Match uses weak comparison, so ignore any W/ prefix
+            etags = [
+                etag[2:] if etag.startswith("W/") else etag for etag in parse_etags(if_none_match)
+            ]
+            if "*" in etags or etag in etags:
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                response[FINGERPRINT_HEADER] = cached_export.fingerprint
+                patch_vary_headers(response, ["Accept-Encoding"])
+                return response
+
+        response = HttpResponse(
+            representation.get_content(content_encoding), content_type="application/json"
+        )
+        response["ETag"] = etag
+        response[FINGERPRINT_HEADER] = cached_export.fingerprint
+        if content_encoding:
+            response["Content-Encoding"] = content_encoding
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
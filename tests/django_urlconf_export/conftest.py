@@ -1,5 +1,9 @@
 import sys
+import threading
+import time
 import types
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
 
 import django
 import pytest
@@ -41,6 +45,52 @@ def mock_included_module():
     clear_url_caches()
 
 
+class _StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers))
+        # Use the next response, and keep repeating the last one
+        if len(self.server.responses) > 1:
+            response = self.server.responses.pop(0)
+        else:
+            response = self.server.responses[0]
+        status, headers, content, delay = response
+        if delay:
+            time.sleep(delay)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def http_server():
+    """
+    A local HTTP server. Tests add responses to http_server.responses, as
+    tuple(status, headers, content, delay in seconds), and check http_server.requests,
+    a list of tuple(path, headers).
+    """
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    server.responses = []
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/urlconf/"
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
 def pytest_configure():
     settings.configure(
         USE_I18N=True,
@@ -0,0 +1,66 @@
+import json
+import sys
+
+from benchmarks import run_benchmarks
+from benchmarks.urlconf_generator import generate_urlconf
+from django.urls import reverse
+
+
+def test_generate_urlconf():
+    url_names = generate_urlconf(
+        urlconf="test_benchmark_urlconf",
+        patterns=20,
+        include_depth=2,
+        namespaces=2,
+        languages=["en", "fr"],
+        locale_prefix=False,
+    )
+    try:
+        assert len(url_names) == 20
+        assert len(set(url_names)) == 20
+        namespaced_url_names = [url_name for url_name in url_names if ":" in url_name]
+        assert namespaced_url_names
+        for url_name in url_names:
+            assert reverse(url_name, urlconf="test_benchmark_urlconf", kwargs={"slug": "a"})
+    finally:
+        for module_name in list(sys.modules):
+            if module_name.startswith("test_benchmark_urlconf"):
+                del sys.modules[module_name]
+
+
+def test_run_benchmarks(tmpdir):
+    output = tmpdir.join("results.json")
+    results = run_benchmarks.main(
+        ["--patterns", "20", "--languages", "2", "--repeat", "1", "--reverse-count", "10"]
+        + ["--output", str(output)]
+    )
+    assert json.loads(output.read())["timings"] == results["timings"]
+    assert set(results["timings"]) == {
+        "export",
+        "serialize",
+        "deserialize",
+        "import",
+        "import_lazy_namespaces",
+        "file_read_and_parse_plain",
+        "file_load_plain",
+        "file_parse_plain",
+        "file_unchanged_plain",
+        "file_read_and_parse_gzip",
+        "file_load_gzip",
+        "file_parse_gzip",
+        "file_unchanged_gzip",
+        "first_reverse_total",
+        "first_reverse_max",
+        "warm_up_0_threads",
+        "warm_up_4_threads",
+        "reverse_each",
+        "reverser_first_total",
+        "reverser_each",
+        "reverser_many_each",
+    }
+
+    assert set(results["memory"]) == {"import", "import_low_memory", "import_lazy_namespaces"}
+    assert results["memory"]["import_low_memory"] < results["memory"]["import"]
+
+    comparison = run_benchmarks.format_results(results, results)
+    assert "x1.00" in comparison
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import translation
+
+from django_urlconf_export import compact_format, export_urlconf, import_urlconf
+
+from tests.django_urlconf_export.test_export_urlconf import (
+    _mock_supported_languages,
+    _set_complex_urlpatterns,
+)
+
+_json_urlpatterns = [
+    {
+        "regex": "^colors/",
+        "includes": [
+            {"regex": {"en": "^red/$", "fr": "^rouge/$"}, "name": "red"},
+            {"regex": {"en": "^blue/$", "fr": "^bleu/$"}, "name": "blue"},
+            {"route": "colors/", "name": "colors"},
+        ],
+        "app_name": "colors",
+        "namespace": "colors",
+    },
+    {
+        "includes": [{"regex": "^$", "name": "index"}],
+        "isLocalePrefix": True,
+        "classPath": "django.urls.resolvers.LocalePrefixPattern",
+    },
+]
+
+
+def test_compact():
+    compact_json = compact_format.compact(_json_urlpatterns)
+    assert compact_format.is_compact(compact_json)
+    assert compact_json["version"] == compact_format.VERSION
+    # Each string is only stored once
+    assert compact_json["strings"].count("colors") == 1
+    assert len(compact_json["strings"]) == len(set(compact_json["strings"]))
+    # Language keys are only stored once
+    assert len(compact_json["languages"]) == 1
+    assert len(compact_json["translations"]) == 2
+
+
+def test_expand():
+    compact_json = json.loads(json.dumps(compact_format.compact(_json_urlpatterns)))
+    expanded = compact_format.expand(compact_json)
+    # Same key order as an export too
+    assert json.dumps(expanded) == json.dumps(_json_urlpatterns)
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+def test_expand_export(mock_urlconf_module, mock_included_module):
+    _set_complex_urlpatterns(mock_urlconf_module, mock_included_module)
+    json_urlpatterns = export_urlconf.as_json("mock_urlconf_module")
+    compact_json = compact_format.compact(json_urlpatterns)
+    assert len(json.dumps(compact_json)) < len(json.dumps(json_urlpatterns))
+    assert compact_format.expand(compact_json) == json_urlpatterns
+
+
+def test_expand_unsupported_version():
+    compact_json = compact_format.compact(_json_urlpatterns)
+    compact_json["version"] = compact_format.VERSION + 1
+    with pytest.raises(ValueError):
+        compact_format.expand(compact_json)
+
+
+def test_is_compact():
+    assert not compact_format.is_compact(_json_urlpatterns)
+    assert not compact_format.is_compact({})
+
+
+def test_import_compact(mock_urlconf_module):
+    import_urlconf.from_json(
+        compact_format.compact(_json_urlpatterns), urlconf="mock_urlconf_module"
+    )
+    assert reverse("colors:colors", urlconf="mock_urlconf_module") == "/colors/colors/"
+    with translation.override("fr"):
+        assert reverse("colors:red", urlconf="mock_urlconf_module") == "/colors/rouge/"
+        assert reverse("index", urlconf="mock_urlconf_module") == "/fr/"
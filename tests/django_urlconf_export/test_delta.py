@@ -0,0 +1,98 @@
+import copy
+
+import pytest
+
+from django_urlconf_export import delta
+
+OLD_JSON_URLPATTERNS = [
+    {"route": "login/", "name": "login"},
+    {"route": "logout/", "name": "logout"},
+    {
+        "route": "colors/",
+        "includes": [
+            {"route": "red/", "name": "red"},
+            {"route": "blue/", "name": "blue"},
+        ],
+        "app_name": "colors",
+        "namespace": "colors",
+    },
+    {
+        "includes": [{"regex": {"en": "^about/$", "fr": "^a-propos/$"}, "name": "about"}],
+        "isLocalePrefix": True,
+        "classPath": "django.urls.resolvers.LocalePrefixPattern",
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "new_json_urlpatterns",
+    [
+        # No change
+        OLD_JSON_URLPATTERNS,
+        # Removed
+        OLD_JSON_URLPATTERNS[1:],
+        # Moved
+        OLD_JSON_URLPATTERNS[::-1],
+        # Added
+        [{"route": "signup/", "name": "signup"}] + OLD_JSON_URLPATTERNS,
+        # Changed
+        [{"route": "sign-in/", "name": "login"}] + OLD_JSON_URLPATTERNS[1:],
+        # Changed inside an include
+        OLD_JSON_URLPATTERNS[:2]
+        + [
+            {
+                "route": "colours/",
+                "includes": [
+                    {"route": "blue/", "name": "blue"},
+                    {"route": "green/", "name": "green"},
+                ],
+                "app_name": "colors",
+                "namespace": "colors",
+            }
+        ]
+        + OLD_JSON_URLPATTERNS[3:],
+        # Duplicate names
+        OLD_JSON_URLPATTERNS + [{"route": "log-in/", "name": "login"}],
+        # Everything removed
+        [],
+    ],
+)
+def test_apply_delta(new_json_urlpatterns):
+    old_json_urlpatterns = copy.deepcopy(OLD_JSON_URLPATTERNS)
+    json_delta = delta.make_delta(old_json_urlpatterns, new_json_urlpatterns)
+    assert delta.apply_delta(old_json_urlpatterns, json_delta) == new_json_urlpatterns
+    # The old URLconf is not modified
+    assert old_json_urlpatterns == OLD_JSON_URLPATTERNS
+
+
+def test_make_delta():
+    new_json_urlpatterns = [
+        {"route": "sign-in/", "name": "login"},
+        {
+            "route": "colors/",
+            "includes": [{"route": "red/", "name": "red"}],
+            "app_name": "colors",
+            "namespace": "colors",
+        },
+        OLD_JSON_URLPATTERNS[3],
+        {"route": "logout/", "name": "logout"},
+    ]
+    assert delta.make_delta(OLD_JSON_URLPATTERNS, new_json_urlpatterns) == {
+        "removed": [["name:logout"], ["namespace:colors", "name:blue"]],
+        "changed": [{"path": ["name:login"], "url": {"route": "sign-in/", "name": "login"}}],
+        "added": [
+            {
+                "path": [],
+                "after": "prefix:django.urls.resolvers.LocalePrefixPattern",
+                "url": {"route": "logout/", "name": "logout"},
+            }
+        ],
+    }
+
+
+def test_make_delta_without_changes():
+    assert delta.make_delta(OLD_JSON_URLPATTERNS, copy.deepcopy(OLD_JSON_URLPATTERNS)) == {
+        "removed": [],
+        "changed": [],
+        "added": [],
+    }
@@ -0,0 +1,61 @@
+import io
+import json
+
+from django.conf.urls import url
+from django.test import override_settings
+from django.urls import include
+from django.utils.functional import lazy
+from django.views import View
+
+from django_urlconf_export import export_stats, export_urlconf
+
+from tests.django_urlconf_export.test_export_urlconf import (
+    _get_color_url_pattern,
+    _mock_supported_languages,
+)
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+def test_record_export_stats(mock_urlconf_module, mock_included_module):
+    mock_included_module.app_name = "admin"
+    mock_included_module.urlpatterns = [
+        url(r"^secret-1/$", View.as_view(), name="secret-1"),
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color"),
+    ]
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^admin/", include("mock_included_module", namespace="admin")),
+        url(r"^blog/", include([url(r"^post/$", View.as_view(), name="post")])),
+    ]
+
+    with export_stats.record() as stats:
+        assert export_stats.get_active() is stats
+        stream = io.StringIO()
+        export_urlconf.write_json(export_urlconf.as_json("mock_urlconf_module"), stream)
+    assert export_stats.get_active() is None
+
+    assert stats.pattern_counts == {"regex": 6}
+    assert stats.translation_activations == 3
+    assert stats.output_size == len(stream.getvalue())
+    assert set(stats.include_stats) == {"admin", "^blog/"}
+    assert stats.include_stats["admin"]["patterns"] == 2
+    assert stats.include_stats["^blog/"]["patterns"] == 1
+    assert stats.include_stats["admin"]["translated_patterns"] == 1
+    assert stats.include_stats["^blog/"]["translated_patterns"] == 0
+    assert 0 < stats.include_stats["admin"]["translation_time"] <= stats.translation_time
+    assert stats.include_stats["^blog/"]["translation_time"] == 0
+    assert stats.total_time >= stats.include_stats["admin"]["time"]
+
+    report = stats.format()
+    assert "Translation: 3 language activations" in report
+    assert "Patterns: regex 6" in report
+    assert "2 patterns (1 translated)  admin" in report
+    json.dumps(stats.as_dict())
+
+
+def test_export_stats_are_not_recorded_by_default(mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    with export_stats.record() as stats:
+        pass
+    export_urlconf.as_json("mock_urlconf_module")
+    assert stats.pattern_counts == {}
@@ -1,10 +1,16 @@
+import io
+import json
+import sys
+
 import mock
 import pytest
 from django.conf import settings
 from django.conf.urls import url
 from django.conf.urls.i18n import i18n_patterns
 from django.test import override_settings
-from django.urls import LocalePrefixPattern, URLResolver, include, path, re_path
+from django.urls import LocalePrefixPattern, URLResolver, clear_url_caches, include, path, re_path
+from django.urls.resolvers import RoutePattern
+from django.utils import translation
 from django.utils.functional import lazy
 from django.utils.translation import get_language
 from django.views import View
@@ -210,6 +216,19 @@ def test_whitelist_and_blacklist(
         )
         == expected_url_names
     )
+    # get_all_allowed_url_names doesn't export, but gets the same names
+    assert (
+        export_urlconf.get_all_exported_url_names(
+            export_urlconf.as_json("mock_urlconf_module", whitelist=whitelist, blacklist=blacklist)
+        )
+        == expected_url_names
+    )
+    url_name_index = export_urlconf.get_url_name_index(
+        "mock_urlconf_module", whitelist=whitelist, blacklist=blacklist
+    )
+    assert {
+        key.split(":")[-1] for key, decision in url_name_index.items() if decision.allowed
+    } == expected_url_names
 
 
 @mock.patch("django_urlconf_export.export_urlconf._get_json_urlpatterns")
@@ -228,7 +247,7 @@ def test_defaults_to_root_urlconf(mock_get_resolver, mock_get_json_urlpatterns):
     export_urlconf.as_json()
 
     mock_get_resolver.assert_called_once_with(settings.ROOT_URLCONF)
-    mock_get_json_urlpatterns.assert_called_once_with(mock_resolver, None, None, False)
+    mock_get_json_urlpatterns.assert_called_once_with(mock_resolver, None, None, False, None, False)
 
 
 @mock.patch("django_urlconf_export.export_urlconf._get_json_urlpatterns")
@@ -238,6 +257,7 @@ def test_defaults_to_root_urlconf(mock_get_resolver, mock_get_json_urlpatterns):
     URLCONF_EXPORT_WHITELIST=["whitelisted-url-name"],
     URLCONF_EXPORT_BLACKLIST=["blacklisted-url-name"],
     URLCONF_EXPORT_LANGUAGE_WITHOUT_COUNTRY=True,
+    URLCONF_EXPORT_COLLAPSE_TRANSLATIONS=True,
 )
 def test_can_use_django_settings(mock_get_resolver, mock_get_json_urlpatterns):
     mock_resolver = mock.Mock()
@@ -247,5 +267,399 @@ def test_can_use_django_settings(mock_get_resolver, mock_get_json_urlpatterns):
 
     mock_get_resolver.assert_called_once_with("path.to.urlconf")
     mock_get_json_urlpatterns.assert_called_once_with(
-        mock_resolver, ["whitelisted-url-name"], ["blacklisted-url-name"], True
+        mock_resolver, ["whitelisted-url-name"], ["blacklisted-url-name"], True, None, True
+    )
+
+
+def test_blacklisted_namespace_is_not_traversed(mock_urlconf_module, mock_included_module):
+    mock_included_module.app_name = "admin"
+    mock_included_module.urlpatterns = [url(r"^secret-1/$", View.as_view(), name="secret-1")]
+    mock_urlconf_module.urlpatterns = [
+        url(r"^public-a/$", View.as_view(), name="public-a"),
+        url(r"^admin/", include("mock_included_module", namespace="admin")),
+    ]
+    with mock.patch(
+        "django_urlconf_export.export_urlconf._get_regex_pattern",
+        wraps=export_urlconf._get_regex_pattern,
+    ) as mock_get_regex_pattern:
+        assert export_urlconf.as_json("mock_urlconf_module", blacklist={"admin"}) == [
+            {"regex": "^public-a/$", "name": "public-a"}
+        ]
+    # Only the public url pattern was exported, the admin include was skipped
+    assert mock_get_regex_pattern.call_count == 1
+
+
+def test_get_url_name_index(mock_urlconf_module, mock_included_module):
+    mock_included_module.app_name = "admin"
+    mock_included_module.urlpatterns = [
+        url(r"^secret-1/$", View.as_view(), name="secret-1"),
+        url(r"^db-edit/$", View.as_view(), name="db-edit"),
+    ]
+    mock_urlconf_module.urlpatterns = [
+        url(r"^public-a/$", View.as_view(), name="public-a"),
+        url(r"^public-b/$", View.as_view(), name="public-b"),
+        url(r"^private/$", View.as_view(), name="private"),
+        url(r"^admin/", include("mock_included_module", namespace="admin")),
+        url(r"^staff/", include("mock_included_module", namespace="staff")),
+    ]
+    with mock.patch(
+        "django_urlconf_export.export_urlconf._get_regex_pattern"
+    ) as mock_get_regex_pattern:
+        url_name_index = export_urlconf.get_url_name_index(
+            "mock_urlconf_module",
+            whitelist=["public-.", "admin", "staff", "secret-."],
+            blacklist=["public-b", "staff"],
+        )
+    # Patterns are not exported
+    assert not mock_get_regex_pattern.called
+
+    Decision = export_urlconf.UrlNameDecision
+    assert url_name_index == {
+        "public-a": Decision(True, "whitelist", "public-."),
+        "public-b": Decision(False, "blacklist", "public-b"),
+        "private": Decision(False, "whitelist", None),
+        "admin": Decision(True, "whitelist", "admin"),
+        "admin:secret-1": Decision(True, "whitelist", "secret-."),
+        "admin:db-edit": Decision(False, "whitelist", None),
+        "staff": Decision(False, "blacklist", "staff"),
+        "staff:secret-1": Decision(False, "namespace", "staff"),
+        "staff:db-edit": Decision(False, "namespace", "staff"),
+    }
+
+
+def test_get_url_name_index_empty_namespace(mock_urlconf_module, mock_included_module):
+    mock_included_module.app_name = "admin"
+    mock_included_module.urlpatterns = [url(r"^secret-1/$", View.as_view(), name="secret-1")]
+    mock_urlconf_module.urlpatterns = [
+        url(r"^admin/", include("mock_included_module", namespace="admin")),
+    ]
+    url_name_index = export_urlconf.get_url_name_index(
+        "mock_urlconf_module", blacklist=["secret-1"]
+    )
+    assert url_name_index == {
+        "admin": export_urlconf.UrlNameDecision(False, "empty", None),
+        "admin:secret-1": export_urlconf.UrlNameDecision(False, "blacklist", "secret-1"),
+    }
+
+
+def test_url_name_filter_is_memoized():
+    url_filter = export_urlconf._UrlNameFilter(whitelist={"public-."}, blacklist={"public-a"})
+    with mock.patch.object(url_filter, "_is_allowed", wraps=url_filter._is_allowed) as mock_check:
+        assert not url_filter.is_allowed("public-a")
+        assert not url_filter.is_allowed("public-a")
+        assert url_filter.is_allowed("public-b")
+        assert not url_filter.is_allowed("admin")
+    assert mock_check.call_count == 3
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+def test_export_multi_language_activates_each_language_once(mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color-1"),
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color-2"),
+    ]
+    with mock.patch(
+        "django.utils.translation.override", wraps=translation.override
+    ) as mock_override:
+        assert export_urlconf.as_json("mock_urlconf_module", language_without_country=False) == [
+            {
+                "regex": {"en": "^color/$", "en-gb": "^colour/$", "fr": "^couleur/$"},
+                "name": "color-1",
+            },
+            {
+                "regex": {"en": "^color/$", "en-gb": "^colour/$", "fr": "^couleur/$"},
+                "name": "color-2",
+            },
+        ]
+    assert mock_override.call_count == 3
+
+
+@pytest.fixture()
+def clear_export_cache():
+    export_urlconf.clear_cache()
+    yield
+    export_urlconf.clear_cache()
+
+
+def test_cached_as_json(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    with mock.patch(
+        "django_urlconf_export.export_urlconf._get_json_urlpatterns",
+        wraps=export_urlconf._get_json_urlpatterns,
+    ) as mock_get_json_urlpatterns:
+        first_result = export_urlconf.cached_as_json("mock_urlconf_module")
+        second_result = export_urlconf.cached_as_json("mock_urlconf_module")
+        # Different arguments are cached separately
+        export_urlconf.cached_as_json("mock_urlconf_module", blacklist={"login"})
+    assert first_result == [{"regex": "^login/$", "name": "login"}]
+    assert second_result is first_result
+    assert mock_get_json_urlpatterns.call_count == 2
+
+
+def test_cached_as_json_is_cleared_with_url_caches(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    assert export_urlconf.cached_as_json("mock_urlconf_module") == [
+        {"regex": "^login/$", "name": "login"}
+    ]
+
+    mock_urlconf_module.urlpatterns = [url(r"^new-login/$", View.as_view(), name="login")]
+    clear_url_caches()
+    assert export_urlconf.cached_as_json("mock_urlconf_module") == [
+        {"regex": "^new-login/$", "name": "login"}
+    ]
+
+
+def test_cached_as_json_is_cleared_when_settings_change(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color")
+    ]
+    with override_settings(LANGUAGES=_mock_supported_languages[:1]):
+        assert export_urlconf.cached_as_json("mock_urlconf_module") == [
+            {"regex": {"en": "^color/$"}, "name": "color"}
+        ]
+    with override_settings(LANGUAGES=_mock_supported_languages):
+        assert export_urlconf.cached_as_json("mock_urlconf_module") == [
+            {"regex": {"en": "^color/$", "en-gb": "^colour/$", "fr": "^couleur/$"}, "name": "color"}
+        ]
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+def test_cached_as_json_languages(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color")
+    ]
+    # Each combination of arguments is cached separately
+    for kwargs in (
+        {"languages": ["en-gb"]},
+        {"languages": ["fr"]},
+        {"collapse_translations": True},
+        {},
+    ):
+        assert export_urlconf.cached_as_json(
+            "mock_urlconf_module", **kwargs
+        ) == export_urlconf.as_json("mock_urlconf_module", **kwargs)
+
+
+@override_settings(URLCONF_EXPORT_CACHE_SIZE=1)
+def test_cached_as_json_evicts_least_recently_used(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    first_result = export_urlconf.cached_as_json("mock_urlconf_module")
+    export_urlconf.cached_as_json("mock_urlconf_module", blacklist={"login"})
+    assert export_urlconf.cached_as_json("mock_urlconf_module") is not first_result
+
+
+def test_cached_get_all_allowed_url_names(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^logout/$", View.as_view(), name="logout"),
+    ]
+    url_names = export_urlconf.cached_get_all_allowed_url_names(
+        "mock_urlconf_module", blacklist={"logout"}
+    )
+    assert url_names == {"login"}
+    assert (
+        export_urlconf.cached_get_all_allowed_url_names("mock_urlconf_module", blacklist={"logout"})
+        is url_names
+    )
+
+
+def _set_complex_urlpatterns(mock_urlconf_module, mock_included_module):
+    mock_included_module.app_name = "admin"
+    mock_included_module.urlpatterns = [
+        url(r"^secret-1/$", View.as_view(), name="secret-1"),
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color"),
+        # Not exported because it has no name
+        url(r"^no-name/$", View.as_view()),
+    ]
+    mock_urlconf_module.urlpatterns = [
+        path("login/", View.as_view(), name="login"),
+        url(r"^admin/", include("mock_included_module", namespace="admin")),
+        # Not exported because it has no live urls
+        url(r"^empty/", include([url(r"^no-name/$", View.as_view())])),
+    ] + i18n_patterns(
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color"),
+        url(r"^nested/", include([url(r"^é/$", View.as_view(), name="unicode")])),
+    )
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+@pytest.mark.parametrize("blacklist", [None, {"admin"}, {".*"}])
+def test_write_json_from_iter_json_urlpatterns(
+    mock_urlconf_module, mock_included_module, blacklist
+):
+    _set_complex_urlpatterns(mock_urlconf_module, mock_included_module)
+    expected_json = json.dumps(export_urlconf.as_json("mock_urlconf_module", blacklist=blacklist))
+
+    stream = io.StringIO()
+    export_urlconf.write_json(
+        export_urlconf.iter_json_urlpatterns("mock_urlconf_module", blacklist=blacklist),
+        stream,
+        # Flush after every chunk
+        buffer_size=1,
+    )
+    assert stream.getvalue() == expected_json
+
+
+def test_iter_json_urlpatterns_includes_are_lazy(mock_urlconf_module, mock_included_module):
+    mock_included_module.urlpatterns = [url(r"^red/$", View.as_view(), name="red")]
+    mock_urlconf_module.urlpatterns = [url(r"^colors/", include("mock_included_module"))]
+
+    (json_url,) = export_urlconf.iter_json_urlpatterns("mock_urlconf_module")
+    assert not isinstance(json_url["includes"], list)
+    assert list(json_url["includes"]) == [{"regex": "^red/$", "name": "red"}]
+
+
+def test_get_fingerprint():
+    fingerprint = export_urlconf.get_fingerprint(
+        [{"regex": {"en": "^color/$", "fr": "^couleur/$"}, "name": "color"}]
+    )
+    # The order of languages and keys doesn't matter
+    assert fingerprint == export_urlconf.get_fingerprint(
+        [{"name": "color", "regex": {"fr": "^couleur/$", "en": "^color/$"}}]
+    )
+    # Any change to the urlconf changes the fingerprint
+    assert fingerprint != export_urlconf.get_fingerprint(
+        [{"regex": {"en": "^color/$", "fr": "^couleur/$"}, "name": "colour"}]
+    )
+
+
+def test_with_fingerprint():
+    json_urlpatterns = [{"route": "login/", "name": "login"}]
+    assert export_urlconf.with_fingerprint(json_urlpatterns) == {
+        "fingerprint": export_urlconf.get_fingerprint(json_urlpatterns),
+        "urlpatterns": json_urlpatterns,
+    }
+
+
+def test_export_very_deep_includes(mock_urlconf_module):
+    depth = sys.getrecursionlimit() * 2
+    urlpatterns = [path("page/", View.as_view(), name="page")]
+    for _ in range(depth):
+        urlpatterns = [URLResolver(RoutePattern("x/"), urlpatterns)]
+    mock_urlconf_module.urlpatterns = urlpatterns
+
+    json_url = export_urlconf.as_json("mock_urlconf_module")[0]
+    for _ in range(depth):
+        json_url = json_url["includes"][0]
+    assert json_url == {"route": "page/", "name": "page"}
+    assert export_urlconf.get_all_allowed_url_names("mock_urlconf_module") == {"page"}
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+def test_as_json_for_profiles(mock_urlconf_module, mock_included_module):
+    _set_complex_urlpatterns(mock_urlconf_module, mock_included_module)
+    profiles = {
+        "public": {"blacklist": ["admin"]},
+        "partner": {"whitelist": ["color", "admin"]},
+        "internal": {},
+        "nothing": {"blacklist": [".*"]},
+    }
+
+    with mock.patch(
+        "django.utils.translation.override", wraps=translation.override
+    ) as mock_override:
+        profile_json_urlpatterns = export_urlconf.as_json_for_profiles(
+            profiles, "mock_urlconf_module"
+        )
+    # Each language is activated once, for all the profiles
+    assert mock_override.call_count == 3
+
+    assert list(profile_json_urlpatterns) == list(profiles)
+    for profile, options in profiles.items():
+        assert profile_json_urlpatterns[profile] == export_urlconf.as_json(
+            "mock_urlconf_module", **options
+        )
+
+    # Translated regexes are shared
+    public_color = profile_json_urlpatterns["public"][-1]["includes"][0]
+    internal_color = profile_json_urlpatterns["internal"][-1]["includes"][0]
+    assert public_color is not internal_color
+    assert public_color["regex"] is internal_color["regex"]
+
+
+@override_settings(LANGUAGES=_mock_supported_languages, LANGUAGE_CODE="en")
+@pytest.mark.parametrize(
+    "languages, language_without_country, expected_languages",
+    [
+        (None, False, ["en", "en-gb", "fr"]),
+        # The fallback language is always exported
+        (["fr"], False, ["en", "fr"]),
+        ([], False, ["en"]),
+        # So is the language without country
+        (["en-GB"], False, ["en", "en-gb"]),
+        (["en-gb"], True, ["en"]),
+        # Unknown languages are ignored
+        (["fr", "de"], False, ["en", "fr"]),
+    ],
+)
+def test_get_export_languages(languages, language_without_country, expected_languages):
+    assert (
+        export_urlconf.get_export_languages(language_without_country, languages)
+        == expected_languages
+    )
+
+
+@override_settings(LANGUAGES=_mock_supported_languages, LANGUAGE_CODE="en-gb")
+def test_get_export_languages_fallback_language():
+    assert export_urlconf.get_export_languages(False, ["fr"]) == ["en-gb", "fr"]
+    assert export_urlconf.get_export_languages(True, ["fr"]) == ["en", "fr"]
+
+
+@override_settings(LANGUAGES=_mock_supported_languages, LANGUAGE_CODE="en")
+def test_export_languages(mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [
+        url(lazy(_get_color_url_pattern, str)(), View.as_view(), name="color")
+    ]
+    expected_json = [{"regex": {"en": "^color/$", "fr": "^couleur/$"}, "name": "color"}]
+    assert export_urlconf.as_json("mock_urlconf_module", languages=["fr"]) == expected_json
+    assert (
+        list(export_urlconf.iter_json_urlpatterns("mock_urlconf_module", languages=["fr"]))
+        == expected_json
+    )
+
+
+@pytest.mark.parametrize(
+    "regex_by_language, expected_regex",
+    [
+        ({"en": "^color/$", "fr": "^color/$"}, "^color/$"),
+        (
+            {"en": "^color/$", "de": "^color/$", "fr": "^couleur/$"},
+            {"default": "^color/$", "fr": "^couleur/$"},
+        ),
+        # en-gb is the same as the default, but is kept, because it would fall back to en
+        (
+            {"en": "^color/$", "en-gb": "^farbe/$", "de": "^farbe/$", "it": "^farbe/$"},
+            {"default": "^farbe/$", "en": "^color/$", "en-gb": "^farbe/$"},
+        ),
+        # en-gb is left out, because it falls back to en
+        (
+            {"en": "^color/$", "en-gb": "^color/$", "de": "^farbe/$", "it": "^farbe/$"},
+            {"default": "^color/$", "de": "^farbe/$", "it": "^farbe/$"},
+        ),
+    ],
+)
+def test_collapse_translations(regex_by_language, expected_regex):
+    assert export_urlconf._collapse_translations(regex_by_language) == expected_regex
+
+
+@override_settings(LANGUAGES=_mock_supported_languages)
+def test_export_collapsed_translations(mock_urlconf_module, mock_included_module):
+    _set_complex_urlpatterns(mock_urlconf_module, mock_included_module)
+    expected_regex = {"default": "^color/$", "en-gb": "^colour/$", "fr": "^couleur/$"}
+
+    json_urlpatterns = export_urlconf.as_json("mock_urlconf_module", collapse_translations=True)
+    assert json_urlpatterns[-1]["includes"][0] == {"regex": expected_regex, "name": "color"}
+    assert json.dumps(
+        list(
+            export_urlconf.iter_json_urlpatterns("mock_urlconf_module", collapse_translations=True)
+        ),
+        default=list,
+    ) == json.dumps(json_urlpatterns)
+
+    profile_json_urlpatterns = export_urlconf.as_json_for_profiles(
+        {"public": {"blacklist": ["admin"]}, "internal": {}},
+        "mock_urlconf_module",
+        collapse_translations=True,
     )
+    assert profile_json_urlpatterns["internal"] == json_urlpatterns
+    assert profile_json_urlpatterns["public"][-1]["includes"][0]["regex"] == expected_regex
@@ -0,0 +1,167 @@
+import contextlib
+import gzip
+import io
+import json
+
+import pytest
+from django.conf.urls import url
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.utils.functional import lazy
+from django.utils.translation import get_language
+from django.views import View
+
+from django_urlconf_export import compact_format, compression, export_urlconf
+from django_urlconf_export.management.commands import export_urlconf_to_file
+
+
+def test_export_urlconf_to_stdout(mock_urlconf_module, capsys):
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^logout/$", View.as_view(), name="logout"),
+    ]
+    call_command(
+        export_urlconf_to_file.Command(), urlconf="mock_urlconf_module", blacklist=["logout"]
+    )
+    expected_json = json.dumps(export_urlconf.as_json("mock_urlconf_module", blacklist=["logout"]))
+    assert capsys.readouterr().out == expected_json + "\n"
+
+
+def test_export_urlconf_to_text_stdout(mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        call_command(export_urlconf_to_file.Command(), urlconf="mock_urlconf_module")
+    expected_json = json.dumps(export_urlconf.as_json("mock_urlconf_module"))
+    assert stdout.getvalue() == expected_json + "\n"
+
+    with pytest.raises(CommandError):
+        call_command(
+            export_urlconf_to_file.Command(),
+            urlconf="mock_urlconf_module",
+            compress="gzip",
+            stdout=io.StringIO(),
+        )
+
+
+def test_export_urlconf_to_output_file(mock_urlconf_module, tmp_path):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    output_path = tmp_path / "urlconf.json"
+    call_command(
+        export_urlconf_to_file.Command(), urlconf="mock_urlconf_module", output=str(output_path)
+    )
+    assert (
+        output_path.read_text() == json.dumps(export_urlconf.as_json("mock_urlconf_module")) + "\n"
+    )
+
+
+@pytest.mark.parametrize("codec", compression.CODECS)
+def test_export_compressed_urlconf_to_output_file(mock_urlconf_module, tmp_path, codec):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    output_path = tmp_path / "urlconf.json"
+    call_command(
+        export_urlconf_to_file.Command(),
+        urlconf="mock_urlconf_module",
+        output=str(output_path),
+        compress=codec,
+    )
+    compressed_output = output_path.read_bytes()
+    assert compression.get_codec(compressed_output) == codec
+    expected_json = json.dumps(export_urlconf.as_json("mock_urlconf_module")) + "\n"
+    assert compression.decompress(compressed_output) == expected_json.encode()
+
+
+def test_export_compressed_urlconf_to_stdout(mock_urlconf_module, capsysbinary):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    call_command(export_urlconf_to_file.Command(), urlconf="mock_urlconf_module", compress="gzip")
+    expected_json = json.dumps(export_urlconf.as_json("mock_urlconf_module")) + "\n"
+    assert gzip.decompress(capsysbinary.readouterr().out) == expected_json.encode()
+
+
+def test_export_compact_urlconf(mock_urlconf_module, capsys):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    call_command(export_urlconf_to_file.Command(), urlconf="mock_urlconf_module", compact=True)
+    expected_json = json.dumps(
+        compact_format.compact(export_urlconf.as_json("mock_urlconf_module"))
+    )
+    assert capsys.readouterr().out == expected_json + "\n"
+
+
+def test_export_urlconf_with_fingerprint(mock_urlconf_module, capsys):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    stderr = io.StringIO()
+    call_command(
+        export_urlconf_to_file.Command(),
+        urlconf="mock_urlconf_module",
+        fingerprint=True,
+        stderr=stderr,
+    )
+    expected_envelope = export_urlconf.with_fingerprint(
+        export_urlconf.as_json("mock_urlconf_module")
+    )
+    assert capsys.readouterr().out == json.dumps(expected_envelope) + "\n"
+    assert stderr.getvalue() == expected_envelope["fingerprint"] + "\n"
+
+
+def test_export_urlconf_profiles(mock_urlconf_module, tmp_path):
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^logout/$", View.as_view(), name="logout"),
+    ]
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(json.dumps({"public": {"blacklist": ["logout"]}, "internal": {}}))
+
+    call_command(
+        export_urlconf_to_file.Command(),
+        urlconf="mock_urlconf_module",
+        export_profiles=str(profiles_path),
+        output=str(tmp_path / "urlconf-{profile}.json"),
+    )
+    assert json.loads((tmp_path / "urlconf-public.json").read_text()) == [
+        {"regex": "^login/$", "name": "login"}
+    ]
+    assert json.loads((tmp_path / "urlconf-internal.json").read_text()) == [
+        {"regex": "^login/$", "name": "login"},
+        {"regex": "^logout/$", "name": "logout"},
+    ]
+
+
+def test_export_urlconf_profiles_needs_output_per_profile(mock_urlconf_module, tmp_path):
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(json.dumps({"public": {}}))
+    with pytest.raises(CommandError):
+        call_command(
+            export_urlconf_to_file.Command(),
+            export_profiles=str(profiles_path),
+            output=str(tmp_path / "urlconf.json"),
+        )
+
+
+@override_settings(LANGUAGES=[("en", "English"), ("fr", "French")], LANGUAGE_CODE="en")
+def test_export_urlconf_languages(mock_urlconf_module, capsys):
+    mock_urlconf_module.urlpatterns = [
+        url(
+            lazy(lambda: {"en": "^color/$", "fr": "^couleur/$"}[get_language()], str)(),
+            View.as_view(),
+            name="color",
+        )
+    ]
+    call_command(export_urlconf_to_file.Command(), urlconf="mock_urlconf_module", languages=[])
+    assert json.loads(capsys.readouterr().out) == [{"regex": {"en": "^color/$"}, "name": "color"}]
+
+
+def test_export_urlconf_profile(mock_urlconf_module, capsys):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    stderr = io.StringIO()
+    call_command(
+        export_urlconf_to_file.Command(),
+        urlconf="mock_urlconf_module",
+        profile=True,
+        stderr=stderr,
+    )
+    output = capsys.readouterr().out
+    assert json.loads(output) == [{"regex": "^login/$", "name": "login"}]
+    assert stderr.getvalue().startswith("URLconf export stats\n")
+    assert "Patterns: regex 1" in stderr.getvalue()
+    assert f"Output size: {len(output) - 1} characters" in stderr.getvalue()
@@ -0,0 +1,276 @@
+import gzip
+import json
+
+import mock
+import pytest
+from django.conf.urls import url
+from django.test import RequestFactory, override_settings
+from django.urls import clear_url_caches
+from django.utils.functional import lazy
+from django.utils.translation import get_language
+from django.views import View
+
+from django_urlconf_export import compact_format, export_urlconf
+from django_urlconf_export.views import export as export_views
+
+
+@pytest.fixture()
+def clear_export_cache():
+    export_views.clear_cache()
+    yield
+    export_views.clear_cache()
+
+
+def _get(view, **headers):
+    return view(RequestFactory().get("/urlconf/", **headers))
+
+
+def test_export_view(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+
+    response = _get(view)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert json.loads(response.content) == [{"regex": "^login/$", "name": "login"}]
+    assert response["ETag"].startswith('"')
+
+
+def test_export_view_is_cached(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+
+    with mock.patch(
+        "django_urlconf_export.export_urlconf.as_json", wraps=export_urlconf.as_json
+    ) as mock_as_json:
+        first_response = _get(view)
+        second_response = _get(view)
+    assert mock_as_json.call_count == 1
+    assert first_response.content == second_response.content
+    assert first_response["ETag"] == second_response["ETag"]
+
+
+def test_export_view_cache_is_per_profile(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^logout/$", View.as_view(), name="logout"),
+    ]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    blacklist_view = export_views.URLConfExportView.as_view(
+        urlconf="mock_urlconf_module", blacklist=["logout"]
+    )
+
+    assert len(json.loads(_get(view).content)) == 2
+    assert json.loads(_get(blacklist_view).content) == [{"regex": "^login/$", "name": "login"}]
+
+
+def test_export_view_cache_is_cleared_with_url_caches(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    first_response = _get(view)
+
+    mock_urlconf_module.urlpatterns = [url(r"^new-login/$", View.as_view(), name="login")]
+    clear_url_caches()
+    second_response = _get(view)
+
+    assert json.loads(second_response.content) == [{"regex": "^new-login/$", "name": "login"}]
+    assert first_response["ETag"] != second_response["ETag"]
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected_status_code",
+    [
+        ("{etag}", 304),
+        ("W/{etag}", 304),
+        ('"other-etag", {etag}', 304),
+        ("*", 304),
+        ('"other-etag"', 200),
+    ],
+)
+def test_export_view_if_none_match(
+    clear_export_cache, mock_urlconf_module, if_none_match, expected_status_code
+):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    etag = _get(view)["ETag"]
+
+    response = _get(view, HTTP_IF_NONE_MATCH=if_none_match.format(etag=etag))
+    assert response.status_code == expected_status_code
+    assert response["ETag"] == etag
+    if expected_status_code == 304:
+        assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected_content_encoding",
+    [
+        ("", None),
+        ("gzip", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0", None),
+        ("br", None),
+    ],
+)
+def test_export_view_compression(
+    clear_export_cache, mock_urlconf_module, accept_encoding, expected_content_encoding
+):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    uncompressed_response = _get(view)
+
+    response = _get(view, HTTP_ACCEPT_ENCODING=accept_encoding)
+    assert response.get("Content-Encoding") == expected_content_encoding
+    assert response["Vary"] == "Accept-Encoding"
+    if expected_content_encoding:
+        assert gzip.decompress(response.content) == uncompressed_response.content
+        assert response["ETag"] != uncompressed_response["ETag"]
+        # The compressed content is cached too
+        assert _get(view, HTTP_ACCEPT_ENCODING=accept_encoding).content == response.content
+    else:
+        assert response.content == uncompressed_response.content
+        assert response["ETag"] == uncompressed_response["ETag"]
+
+
+def test_export_view_compressed_if_none_match(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    etag = _get(view, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+    response = _get(view, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    # The ETag is for the compressed content only
+    assert _get(view, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_export_view_compact(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    compact_view = export_views.URLConfExportView.as_view(
+        urlconf="mock_urlconf_module", compact=True
+    )
+
+    assert json.loads(_get(view).content) == [{"regex": "^login/$", "name": "login"}]
+    assert json.loads(_get(compact_view).content) == compact_format.compact(
+        [{"regex": "^login/$", "name": "login"}]
+    )
+
+
+def test_export_view_fingerprint(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    compact_view = export_views.URLConfExportView.as_view(
+        urlconf="mock_urlconf_module", compact=True
+    )
+
+    expected_fingerprint = export_urlconf.get_fingerprint([{"regex": "^login/$", "name": "login"}])
+    response = _get(view)
+    assert response[export_views.FINGERPRINT_HEADER] == expected_fingerprint
+    # The fingerprint doesn't depend on the format
+    assert _get(compact_view)[export_views.FINGERPRINT_HEADER] == expected_fingerprint
+    not_modified_response = _get(view, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified_response[export_views.FINGERPRINT_HEADER] == expected_fingerprint
+
+
+def test_export_view_delta(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    old_fingerprint = _get(view)[export_views.FINGERPRINT_HEADER]
+
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^logout/$", View.as_view(), name="logout"),
+    ]
+    clear_url_caches()
+    response = view(RequestFactory().get("/urlconf/", {"since": old_fingerprint}))
+    new_fingerprint = response[export_views.FINGERPRINT_HEADER]
+    assert json.loads(response.content) == {
+        "fingerprint": new_fingerprint,
+        "since": old_fingerprint,
+        "delta": {
+            "removed": [],
+            "changed": [],
+            "added": [
+                {"path": [], "after": "name:login", "url": {"regex": "^logout/$", "name": "logout"}}
+            ],
+        },
+    }
+
+
+def test_export_view_delta_from_unknown_export(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+
+    response = view(RequestFactory().get("/urlconf/", {"since": "unknown"}))
+    assert json.loads(response.content) == export_urlconf.with_fingerprint(
+        [{"regex": "^login/$", "name": "login"}]
+    )
+
+
+@override_settings(URLCONF_EXPORT_DELTA_HISTORY=2)
+def test_export_view_delta_history(clear_export_cache, mock_urlconf_module):
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    fingerprints = []
+    for name in ["one", "two", "three"]:
+        mock_urlconf_module.urlpatterns = [url(rf"^{name}/$", View.as_view(), name=name)]
+        clear_url_caches()
+        fingerprints.append(_get(view)[export_views.FINGERPRINT_HEADER])
+
+    # The oldest export was forgotten
+    response = view(RequestFactory().get("/urlconf/", {"since": fingerprints[0]}))
+    assert "urlpatterns" in json.loads(response.content)
+    response = view(RequestFactory().get("/urlconf/", {"since": fingerprints[1]}))
+    assert "delta" in json.loads(response.content)
+
+
+@override_settings(
+    CACHES={"urlconf": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    URLCONF_EXPORT_DELTA_CACHE="urlconf",
+)
+def test_export_view_delta_cache(clear_export_cache, mock_urlconf_module):
+    mock_urlconf_module.urlpatterns = [url(r"^login/$", View.as_view(), name="login")]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+    old_fingerprint = _get(view)[export_views.FINGERPRINT_HEADER]
+
+    # A new process after a deploy only has the new export
+    export_views.clear_cache()
+    mock_urlconf_module.urlpatterns = [
+        url(r"^login/$", View.as_view(), name="login"),
+        url(r"^logout/$", View.as_view(), name="logout"),
+    ]
+    clear_url_caches()
+    response = view(RequestFactory().get("/urlconf/", {"since": old_fingerprint}))
+    json_delta = json.loads(response.content)
+    assert json_delta["since"] == old_fingerprint
+    assert json_delta["delta"]["added"] == [
+        {"path": [], "after": "name:login", "url": {"regex": "^logout/$", "name": "logout"}}
+    ]
+
+
+@override_settings(
+    LANGUAGES=[("en", "English"), ("fr", "French"), ("de", "German")], LANGUAGE_CODE="en"
+)
+def test_export_view_languages(clear_export_cache, mock_urlconf_module):
+    def get_color_url_pattern():
+        return {"en": "^color/$", "fr": "^couleur/$", "de": "^farbe/$"}[get_language()]
+
+    mock_urlconf_module.urlpatterns = [
+        url(lazy(get_color_url_pattern, str)(), View.as_view(), name="color")
+    ]
+    view = export_views.URLConfExportView.as_view(urlconf="mock_urlconf_module")
+
+    response = view(RequestFactory().get("/urlconf/", {"languages": "fr"}))
+    assert json.loads(response.content) == [
+        {"regex": {"en": "^color/$", "fr": "^couleur/$"}, "name": "color"}
+    ]
+    # The same export languages share a cached export
+    with mock.patch(
+        "django_urlconf_export.export_urlconf.as_json", wraps=export_urlconf.as_json
+    ) as mock_as_json:
+        same_response = view(RequestFactory().get("/urlconf/", {"languages": "en,fr,xx"}))
+    assert not mock_as_json.called
+    assert same_response.content == response.content
+
+    assert json.loads(_get(view).content) == [
+        {"regex": {"en": "^color/$", "fr": "^couleur/$", "de": "^farbe/$"}, "name": "color"}
+    ]
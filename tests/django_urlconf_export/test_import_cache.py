@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from django_urlconf_export import export_urlconf, import_cache, import_urlconf
+
+LOGIN = [{"route": "login/", "name": "login"}]
+SIGN_IN = [{"route": "sign-in/", "name": "login"}]
+
+
+def _get_content(json_urlpatterns):
+    return json.dumps(export_urlconf.with_fingerprint(json_urlpatterns)).encode()
+
+
+def test_save_and_load(tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    import_cache.save(cache_path, LOGIN, http_validators={"uri": "x", "etag": '"1"'})
+    cached = import_cache.load(cache_path)
+    assert cached["urlpatterns"] == LOGIN
+    assert cached["fingerprint"] == export_urlconf.get_fingerprint(LOGIN)
+    assert cached["httpValidators"] == {"uri": "x", "etag": '"1"'}
+    # Only the cache file is left
+    assert os.listdir(str(tmp_path)) == ["urlconf.json"]
+
+
+def test_save_is_atomic(tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    import_cache.save(cache_path, LOGIN)
+    with pytest.raises(TypeError):
+        import_cache.save(cache_path, [{"route": object(), "name": "login"}])
+    # The old file is still there, and no temporary file is left
+    assert import_cache.load(cache_path)["urlpatterns"] == LOGIN
+    assert os.listdir(str(tmp_path)) == ["urlconf.json"]
+
+
+def test_load_missing_corrupt_or_stale_cache(tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    assert import_cache.load(cache_path) is None
+
+    with open(cache_path, "w") as cache_file:
+        cache_file.write('[{"route": "log')
+    assert import_cache.load(cache_path) is None
+
+    import_cache.save(cache_path, LOGIN)
+    an_hour_ago = time.time() - 3600
+    os.utime(cache_path, (an_hour_ago, an_hour_ago))
+    assert import_cache.load(cache_path, max_age=3000) is None
+    assert import_cache.load(cache_path, max_age=4000)["urlpatterns"] == LOGIN
+
+
+def test_from_uri_without_cache(http_server, mock_urlconf_module, tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    http_server.responses.append((200, {"ETag": '"1"'}, _get_content(LOGIN), 0))
+
+    assert import_cache.from_uri(http_server.url, cache_path, "mock_urlconf_module") is None
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+    cached = import_cache.load(cache_path)
+    assert cached["urlpatterns"] == LOGIN
+    assert cached["httpValidators"]["etag"] == '"1"'
+
+
+def test_from_uri_with_cache(http_server, mock_urlconf_module, tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    import_cache.save(cache_path, LOGIN)
+    # The exporter is slow, and has changed URLconf
+    http_server.responses.append((200, {}, _get_content(SIGN_IN), 0.2))
+
+    thread = import_cache.from_uri(http_server.url, cache_path, "mock_urlconf_module")
+    # The cache was imported without waiting
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+    thread.join()
+    assert reverse("login", urlconf="mock_urlconf_module") == "/sign-in/"
+    assert import_cache.load(cache_path)["urlpatterns"] == SIGN_IN
+
+
+@override_settings(URLCONF_IMPORT_CACHE_MAX_AGE=60)
+def test_from_uri_with_stale_cache(http_server, mock_urlconf_module, tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    import_cache.save(cache_path, LOGIN)
+    an_hour_ago = time.time() - 3600
+    os.utime(cache_path, (an_hour_ago, an_hour_ago))
+    http_server.responses.append((200, {}, _get_content(SIGN_IN), 0))
+
+    assert import_cache.from_uri(http_server.url, cache_path, "mock_urlconf_module") is None
+    assert reverse("login", urlconf="mock_urlconf_module") == "/sign-in/"
+
+
+def test_refresh_after_restart_is_conditional(http_server, mock_urlconf_module, tmp_path):
+    cache_path = str(tmp_path / "urlconf.json")
+    http_server.responses.extend(
+        [(200, {"ETag": '"1"'}, _get_content(LOGIN), 0), (304, {}, b"", 0)]
+    )
+    import_cache.from_uri(http_server.url, cache_path, "mock_urlconf_module")
+    an_hour_ago = time.time() - 3600
+    os.utime(cache_path, (an_hour_ago, an_hour_ago))
+
+    # Start again, with a new module
+    del sys.modules["mock_urlconf_module"]
+    import_cache.from_uri(http_server.url, cache_path, "mock_urlconf_module").join()
+    _, headers = http_server.requests[-1]
+    assert headers["If-None-Match"] == '"1"'
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+    # The cache was confirmed up to date
+    assert time.time() - os.path.getmtime(cache_path) < 60
+    assert import_urlconf.get_fingerprint("mock_urlconf_module") == export_urlconf.get_fingerprint(
+        LOGIN
+    )
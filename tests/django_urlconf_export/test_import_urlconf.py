@@ -1,12 +1,28 @@
+import json
 import sys
+import threading
+import time
 
 import mock
 import pytest
+import requests
+from django.conf.urls import url
 from django.test import override_settings
-from django.urls import LocalePrefixPattern, reverse
+from django.urls import LocalePrefixPattern, URLResolver, clear_url_caches, resolve, reverse
+from django.urls.resolvers import RoutePattern
 from django.utils import translation
-
-from django_urlconf_export import import_urlconf
+from django.utils.functional import lazy
+from django.utils.translation import get_language
+from django.views import View
+
+from django_urlconf_export import (
+    compact_format,
+    compression,
+    delta,
+    export_urlconf,
+    import_urlconf,
+    language_utils,
+)
 
 from tests.django_urlconf_export.test_export_urlconf import CustomLocalePrefixPattern
 
@@ -126,6 +142,250 @@ def test_import_multi_language_without_country(mock_urlconf_module):
         assert reverse("color", urlconf="mock_urlconf_module") == "/color/"
 
 
+def test_import_collapsed_translations(mock_urlconf_module):
+    import_urlconf.from_json(
+        [{"regex": {"default": "^color/$", "en-gb": "^colour/$"}, "name": "color"}],
+        urlconf="mock_urlconf_module",
+    )
+    with translation.override("en"):
+        assert reverse("color", urlconf="mock_urlconf_module") == "/color/"
+    with translation.override("en-gb"):
+        assert reverse("color", urlconf="mock_urlconf_module") == "/colour/"
+    with translation.override("fr"):
+        assert reverse("color", urlconf="mock_urlconf_module") == "/color/"
+
+
+@override_settings(URLCONF_IMPORT_LANGUAGE_FALLBACKS={"pt-br": ["pt", "en"], "ca": ["es"]})
+def test_import_language_fallbacks(mock_urlconf_module):
+    import_urlconf.from_json(
+        [{"regex": {"en": "^color/$", "es": "^color-es/$", "pt": "^cor/$"}, "name": "color"}],
+        urlconf="mock_urlconf_module",
+    )
+    expected_urls = {
+        "pt-br": "/cor/",
+        "ca": "/color-es/",
+        "ca-es": "/color-es/",
+        "en-gb": "/color/",
+    }
+    for language, expected_url in expected_urls.items():
+        with translation.override(language):
+            assert reverse("color", urlconf="mock_urlconf_module") == expected_url
+
+    # Without a fallback, a missing translation is a clear error
+    import_urlconf.from_json(
+        [{"regex": {"en": "^color/$", "pt": "^cor/$"}, "name": "color"}],
+        urlconf="mock_urlconf_module",
+    )
+    with translation.override("ca"):
+        with pytest.raises(language_utils.MissingTranslationError) as error:
+            reverse("color", urlconf="mock_urlconf_module")
+    assert str(error.value) == (
+        "Url pattern {'en': '^color/$', 'pt': '^cor/$'} has no translation for language ca. "
+        "Tried ca, default, es"
+    )
+
+
+def test_get_fallback_chain():
+    fallbacks = {"pt-br": ["pt", "en-gb"], "es": ["ca"]}
+    assert language_utils.get_fallback_chain("pt-br", fallbacks) == (
+        "pt-br",
+        "pt",
+        "default",
+        "en-gb",
+        "en",
+    )
+    assert language_utils.get_fallback_chain("es-mx", fallbacks) == ("es-mx", "es", "default", "ca")
+    assert language_utils.get_fallback_chain("fr") == ("fr", "default")
+
+
+def test_translated_pattern_is_only_looked_up_once_per_language():
+    translated_pattern = import_urlconf._TranslatedPattern({"en": "^color/$", "fr": "^couleur/$"})
+    with mock.patch.object(
+        language_utils, "get_translation", wraps=language_utils.get_translation
+    ) as mock_get_translation:
+        for _ in range(3):
+            with translation.override("fr"):
+                assert translated_pattern() == "^couleur/$"
+            with translation.override("en"):
+                assert translated_pattern() == "^color/$"
+    assert mock_get_translation.call_count == 2
+
+
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_import_low_memory(mock_urlconf_module, low_memory):
+    translations = {"en": "^color/(?P<shade>[a-z]+)/$", "fr": "^couleur/(?P<shade>[a-z]+)/$"}
+    with override_settings(URLCONF_IMPORT_LOW_MEMORY=low_memory):
+        import_urlconf.from_json(
+            [
+                {
+                    "route": "shop/",
+                    "namespace": "shop",
+                    "app_name": "shop",
+                    "includes": [
+                        {"route": "<int:pk>/", "name": "product"},
+                        {"regex": dict(translations), "name": "color"},
+                    ],
+                },
+                {"regex": dict(translations), "name": "color"},
+                {"route": "about/", "name": "about"},
+            ],
+            urlconf="mock_urlconf_module",
+        )
+    shop_resolver, color_pattern, about_pattern = mock_urlconf_module.urlpatterns
+    product_pattern, shop_color_pattern = shop_resolver.url_patterns
+
+    with translation.override("fr"):
+        assert reverse("color", "mock_urlconf_module", kwargs={"shade": "red"}) == "/couleur/red/"
+        assert (
+            reverse("shop:color", "mock_urlconf_module", kwargs={"shade": "red"})
+            == "/shop/couleur/red/"
+        )
+    assert reverse("shop:product", "mock_urlconf_module", kwargs={"pk": 1}) == "/shop/1/"
+    match = resolve("/shop/1/", urlconf="mock_urlconf_module")
+    assert match.kwargs == {"pk": 1}
+    assert match.view_name == "shop:product"
+    assert resolve("/about/", urlconf="mock_urlconf_module").kwargs == {}
+
+    # All translated patterns share one lazy class, not one each
+    assert type(color_pattern.pattern._regex) is type(shop_color_pattern.pattern._regex)
+
+    assert (color_pattern.callback is about_pattern.callback) == low_memory
+    assert (color_pattern.pattern._regex is shop_color_pattern.pattern._regex) == low_memory
+    if low_memory:
+        assert about_pattern.default_args is color_pattern.default_args
+        assert about_pattern.pattern.converters is color_pattern.pattern.converters
+        assert product_pattern.pattern.converters["pk"]
+        assert product_pattern.name is sys.intern("product")
+
+
+@pytest.mark.parametrize("lazy_namespaces", [False, True])
+def test_import_lazy_namespaces(mock_urlconf_module, lazy_namespaces):
+    with override_settings(URLCONF_IMPORT_LAZY_NAMESPACES=lazy_namespaces):
+        import_urlconf.from_json(
+            [
+                {"route": "", "name": "home"},
+                {
+                    "route": "shop/",
+                    "namespace": "shop",
+                    "app_name": "shop",
+                    "includes": [
+                        {"route": "<int:pk>/", "name": "product"},
+                        {
+                            "route": "<int:pk>/reviews/",
+                            "namespace": "reviews",
+                            "app_name": "reviews",
+                            "includes": [{"route": "<int:review>/", "name": "review"}],
+                        },
+                    ],
+                },
+                {
+                    "route": "pages/",
+                    "includes": [
+                        {
+                            "route": "blog/",
+                            "namespace": "blog",
+                            "app_name": "blog",
+                            "includes": [{"route": "<slug:slug>/", "name": "post"}],
+                        }
+                    ],
+                },
+            ],
+            urlconf="mock_urlconf_module",
+        )
+    _, shop_resolver, pages_resolver = mock_urlconf_module.urlpatterns
+    (blog_resolver,) = pages_resolver.url_patterns
+
+    def is_built(resolver):
+        if isinstance(resolver, import_urlconf._LazyURLResolver):
+            return resolver._url_patterns is not None
+        return "url_patterns" in resolver.__dict__
+
+    assert reverse("home", urlconf="mock_urlconf_module") == "/"
+    assert is_built(shop_resolver) != lazy_namespaces
+    assert is_built(blog_resolver) != lazy_namespaces
+
+    assert reverse("shop:product", "mock_urlconf_module", kwargs={"pk": 1}) == "/shop/1/"
+    assert is_built(shop_resolver)
+    _, reviews_resolver = shop_resolver.url_patterns
+    assert is_built(reviews_resolver) != lazy_namespaces
+
+    assert (
+        reverse("shop:reviews:review", "mock_urlconf_module", kwargs={"pk": 1, "review": 2})
+        == "/shop/1/reviews/2/"
+    )
+    assert is_built(blog_resolver) != lazy_namespaces
+
+    match = resolve("/pages/blog/hello/", urlconf="mock_urlconf_module")
+    assert match.view_name == "blog:post"
+    assert match.kwargs == {"slug": "hello"}
+    assert reverse("blog:post", "mock_urlconf_module", kwargs={"slug": "a"}) == "/pages/blog/a/"
+
+
+def test_lazy_namespace_is_built_once_by_concurrent_threads():
+    resolver = import_urlconf._LazyURLResolver(
+        RoutePattern("shop/", is_endpoint=False),
+        [{"route": "<int:pk>/", "name": "product"}],
+        app_name="shop",
+        namespace="shop",
+    )
+    get_django_urlpatterns = import_urlconf._get_django_urlpatterns
+
+    def slow_get_django_urlpatterns(*args, **kwargs):
+        # Give the other thread time to ask for the urls too
+        time.sleep(0.05)
+        return get_django_urlpatterns(*args, **kwargs)
+
+    results = []
+    with mock.patch.object(
+        import_urlconf, "_get_django_urlpatterns", side_effect=slow_get_django_urlpatterns
+    ) as mock_get_django_urlpatterns:
+        threads = [
+            threading.Thread(target=lambda: results.append(resolver.url_patterns)) for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_get_django_urlpatterns.call_count == 1
+    assert len(results) == 2
+    assert results[0] is results[1]
+    assert [url_pattern.name for url_pattern in results[0]] == ["product"]
+
+
+@override_settings(LANGUAGES=[("en", "English"), ("en-gb", "British English"), ("fr", "French")])
+@pytest.mark.parametrize("language_without_country", [False, True])
+def test_import_collapsed_export(mock_urlconf_module, language_without_country):
+    def get_color_url_pattern():
+        return {"en": "^color/$", "en-gb": "^colour/$", "fr": "^couleur/$"}[get_language()]
+
+    def get_shop_url_pattern():
+        return "^shop/$"
+
+    mock_urlconf_module.urlpatterns = [
+        url(lazy(get_color_url_pattern, str)(), View.as_view(), name="color"),
+        url(lazy(get_shop_url_pattern, str)(), View.as_view(), name="shop"),
+    ]
+    json_urlpatterns = export_urlconf.as_json(
+        "mock_urlconf_module",
+        language_without_country=language_without_country,
+        collapse_translations=True,
+    )
+    clear_url_caches()
+
+    django_urlpatterns = import_urlconf._get_django_urlpatterns(json_urlpatterns)
+    # A url that is the same in all languages is not lazy
+    assert django_urlpatterns[1].pattern._regex == "^shop/$"
+
+    mock_urlconf_module.urlpatterns = django_urlpatterns
+    expected_urls = {"en": "/color/", "en-gb": "/colour/", "fr": "/couleur/"}
+    if language_without_country:
+        expected_urls["en-gb"] = "/color/"
+    for language, expected_url in expected_urls.items():
+        with translation.override(language):
+            assert reverse("color", urlconf="mock_urlconf_module") == expected_url
+
+
 # The tests below use these constants
 METHOD_ARGUMENT = "method_argument"
 LIBRARY_SETTING = "library_setting"
@@ -257,3 +517,293 @@ def test_init_django_with_overridden_settings_when_already_initialized(
 
     assert not mock_django_settings.configure.called
     assert not mock_django_setup.called
+
+
+@pytest.mark.parametrize("codec", [None] + list(compression.CODECS))
+def test_import_from_file(mock_urlconf_module, tmp_path, codec):
+    content = json.dumps([{"route": "login/", "name": "login"}]).encode()
+    if codec:
+        content = compression.compress(content, codec)
+    file_path = tmp_path / "urlconf.json"
+    file_path.write_bytes(content)
+
+    import_urlconf.from_file(str(file_path), urlconf="mock_urlconf_module")
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+
+@pytest.mark.parametrize("codec", [None] + list(compression.CODECS))
+@pytest.mark.parametrize("compact", [False, True])
+def test_load_file(tmp_path, codec, compact):
+    json_urlpatterns = [{"route": "login/", "name": "login"}]
+    fingerprint = export_urlconf.get_fingerprint(json_urlpatterns)
+    if compact:
+        json_urlpatterns = compact_format.compact(json_urlpatterns)
+    envelope = export_urlconf.with_fingerprint(json_urlpatterns, fingerprint)
+    content = json.dumps(envelope).encode()
+    if codec:
+        content = compression.compress(content, codec)
+    file_path = tmp_path / "urlconf.json"
+    file_path.write_bytes(content)
+
+    loaded_file = import_urlconf.load_file(str(file_path))
+    assert loaded_file.json_urlpatterns == envelope
+    assert loaded_file.fingerprint == fingerprint
+    assert loaded_file.codec == codec
+    assert loaded_file.compact == compact
+    assert loaded_file.load_time > 0
+    assert loaded_file.parse_time > 0
+
+    # With the same fingerprint, the JSON is not parsed
+    with mock.patch.object(import_urlconf.json, "loads") as mock_loads:
+        loaded_file = import_urlconf.load_file(str(file_path), unless_fingerprint=fingerprint)
+    assert not mock_loads.called
+    assert loaded_file.json_urlpatterns is None
+    assert loaded_file.fingerprint == fingerprint
+    assert loaded_file.parse_time == 0
+
+
+@pytest.mark.parametrize("codec", [None, "gzip"])
+def test_import_from_file_unchanged(mock_urlconf_module, tmp_path, codec):
+    json_urlpatterns = [{"route": "login/", "name": "login"}]
+    content = json.dumps(export_urlconf.with_fingerprint(json_urlpatterns)).encode()
+    if codec:
+        content = compression.compress(content, codec)
+    file_path = tmp_path / "urlconf.json"
+    file_path.write_bytes(content)
+
+    assert import_urlconf.from_file(str(file_path), urlconf="mock_urlconf_module")
+    with mock.patch.object(import_urlconf.json, "loads") as mock_loads:
+        assert not import_urlconf.from_file(str(file_path), urlconf="mock_urlconf_module")
+    assert not mock_loads.called
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+
+@pytest.mark.parametrize("codec", [None, "gzip"])
+def test_import_from_uri(http_server, mock_urlconf_module, codec):
+    content = json.dumps([{"route": "login/", "name": "login"}]).encode()
+    if codec:
+        content = compression.compress(content, codec)
+    http_server.responses.append((200, {}, content, 0))
+
+    assert import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    assert [path for path, _ in http_server.requests] == ["/urlconf/"]
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+
+@pytest.mark.parametrize(
+    "validator_headers, conditional_headers",
+    [
+        ({"ETag": '"abc"'}, {"If-None-Match": '"abc"'}),
+        (
+            {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+            {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        ),
+    ],
+)
+def test_import_from_uri_is_conditional(
+    http_server, mock_urlconf_module, validator_headers, conditional_headers
+):
+    content = json.dumps([{"route": "login/", "name": "login"}]).encode()
+    http_server.responses.extend([(200, validator_headers, content, 0), (304, {}, b"", 0)])
+    assert import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+
+    # Not modified, so nothing is parsed or imported
+    with mock.patch("json.loads") as mock_json_loads:
+        assert not import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    assert not mock_json_loads.called
+    _, headers = http_server.requests[-1]
+    for key, value in conditional_headers.items():
+        assert headers[key] == value
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+    # Importing from anywhere else forgets the headers
+    import_urlconf.from_json([{"route": "login/", "name": "login"}], urlconf="mock_urlconf_module")
+    http_server.responses[:] = [(200, {}, content, 0)]
+    assert import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    _, headers = http_server.requests[-1]
+    for key in conditional_headers:
+        assert key not in headers
+
+
+@override_settings(URLCONF_IMPORT_RETRIES=2, URLCONF_IMPORT_BACKOFF_FACTOR=0)
+def test_import_from_uri_retries(http_server, mock_urlconf_module):
+    content = json.dumps([{"route": "login/", "name": "login"}]).encode()
+    http_server.responses.extend([(503, {}, b"", 0), (502, {}, b"", 0), (200, {}, content, 0)])
+    assert import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    assert len(http_server.requests) == 3
+
+    # After the last retry, the error is raised
+    http_server.responses[:] = [(503, {}, b"", 0)]
+    with pytest.raises(requests.HTTPError):
+        import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    assert len(http_server.requests) == 6
+
+
+@override_settings(URLCONF_IMPORT_RETRIES=0, URLCONF_IMPORT_TIMEOUT=0.1)
+def test_import_from_uri_timeout(http_server, mock_urlconf_module):
+    http_server.responses.append((200, {}, b"[]", 1))
+    with pytest.raises(requests.RequestException):
+        import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+
+
+def test_import_from_uri_reuses_session(http_server, mock_urlconf_module):
+    http_server.responses.append((200, {}, b"[]", 0))
+    import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    session = import_urlconf._get_session()
+    import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module")
+    assert import_urlconf._get_session() is session
+
+
+def test_import_with_fingerprint(mock_urlconf_module):
+    json_urlpatterns = export_urlconf.with_fingerprint([{"route": "login/", "name": "login"}])
+    assert import_urlconf.from_json(json_urlpatterns, urlconf="mock_urlconf_module")
+    assert import_urlconf.get_fingerprint("mock_urlconf_module") == json_urlpatterns["fingerprint"]
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+    # The same fingerprint is not imported again
+    with mock.patch(
+        "django_urlconf_export.import_urlconf._get_django_urlpatterns"
+    ) as mock_get_django_urlpatterns:
+        assert not import_urlconf.from_json(json_urlpatterns, urlconf="mock_urlconf_module")
+    assert not mock_get_django_urlpatterns.called
+
+    # A new fingerprint is imported
+    json_urlpatterns = export_urlconf.with_fingerprint([{"route": "new-login/", "name": "login"}])
+    assert import_urlconf.from_json(json_urlpatterns, urlconf="mock_urlconf_module")
+    assert reverse("login", urlconf="mock_urlconf_module") == "/new-login/"
+
+    # URLconf without a fingerprint is always imported
+    assert import_urlconf.from_json(
+        [{"route": "login/", "name": "login"}], urlconf="mock_urlconf_module"
+    )
+    assert import_urlconf.get_fingerprint("mock_urlconf_module") is None
+
+
+def test_import_compact_with_fingerprint(mock_urlconf_module):
+    json_urlpatterns = [{"route": "login/", "name": "login"}]
+    fingerprint = export_urlconf.get_fingerprint(json_urlpatterns)
+    import_urlconf.from_json(
+        export_urlconf.with_fingerprint(compact_format.compact(json_urlpatterns), fingerprint),
+        urlconf="mock_urlconf_module",
+    )
+    assert import_urlconf.get_fingerprint("mock_urlconf_module") == fingerprint
+    assert reverse("login", urlconf="mock_urlconf_module") == "/login/"
+
+
+def test_import_delta(mock_urlconf_module):
+    old_json_urlpatterns = [{"route": "login/", "name": "login"}]
+    new_json_urlpatterns = [
+        {"route": "sign-in/", "name": "login"},
+        {"route": "logout/", "name": "logout"},
+    ]
+    old_fingerprint = export_urlconf.get_fingerprint(old_json_urlpatterns)
+    json_delta = {
+        "fingerprint": export_urlconf.get_fingerprint(new_json_urlpatterns),
+        "since": old_fingerprint,
+        "delta": delta.make_delta(old_json_urlpatterns, new_json_urlpatterns),
+    }
+
+    import_urlconf.from_json(
+        export_urlconf.with_fingerprint(old_json_urlpatterns),
+        urlconf="mock_urlconf_module",
+        retain_json=True,
+    )
+    assert import_urlconf.from_json(json_delta, urlconf="mock_urlconf_module")
+    assert import_urlconf.get_fingerprint("mock_urlconf_module") == json_delta["fingerprint"]
+    assert reverse("login", urlconf="mock_urlconf_module") == "/sign-in/"
+    assert reverse("logout", urlconf="mock_urlconf_module") == "/logout/"
+
+    # The delta can't be applied again
+    json_delta["fingerprint"] = "other"
+    with pytest.raises(ValueError):
+        import_urlconf.from_json(json_delta, urlconf="mock_urlconf_module")
+
+
+def test_import_delta_without_retained_json(mock_urlconf_module):
+    json_urlpatterns = export_urlconf.with_fingerprint([{"route": "login/", "name": "login"}])
+    import_urlconf.from_json(json_urlpatterns, urlconf="mock_urlconf_module")
+    json_delta = {
+        "fingerprint": "new",
+        "since": json_urlpatterns["fingerprint"],
+        "delta": {"removed": [], "changed": [], "added": []},
+    }
+    with pytest.raises(ValueError):
+        import_urlconf.from_json(json_delta, urlconf="mock_urlconf_module")
+
+
+def test_import_from_uri_with_delta(http_server, mock_urlconf_module):
+    json_urlpatterns = export_urlconf.with_fingerprint([{"route": "login/", "name": "login"}])
+    http_server.responses.append((200, {}, json.dumps(json_urlpatterns).encode(), 0))
+
+    import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module", use_delta=True)
+    assert http_server.requests[-1][0] == "/urlconf/?since="
+    assert sys.modules["mock_urlconf_module"].urlconf_json == json_urlpatterns["urlpatterns"]
+
+    import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module", use_delta=True)
+    assert http_server.requests[-1][0] == f"/urlconf/?since={json_urlpatterns['fingerprint']}"
+
+
+def test_import_from_uri_with_delta_without_retained_json(http_server, mock_urlconf_module):
+    json_urlpatterns = export_urlconf.with_fingerprint([{"route": "login/", "name": "login"}])
+    import_urlconf.from_json(json_urlpatterns, urlconf="mock_urlconf_module")
+    http_server.responses.append((200, {}, json.dumps(json_urlpatterns).encode(), 0))
+
+    # No delta can be applied, so the full URLconf is asked for
+    import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module", use_delta=True)
+    assert http_server.requests[-1][0] == "/urlconf/?since="
+    # The URLconf is unchanged, but its JSON is kept for the next delta
+    assert sys.modules["mock_urlconf_module"].urlconf_json == json_urlpatterns["urlpatterns"]
+
+    import_urlconf.from_uri(http_server.url, urlconf="mock_urlconf_module", use_delta=True)
+    assert http_server.requests[-1][0] == f"/urlconf/?since={json_urlpatterns['fingerprint']}"
+
+
+@override_settings(LANGUAGES=[("en", "English"), ("fr", "French")])
+@pytest.mark.parametrize("threads", [0, 2])
+@pytest.mark.parametrize("lazy_namespaces", [False, True])
+def test_warm_up(mock_urlconf_module, threads, lazy_namespaces):
+    with override_settings(URLCONF_IMPORT_LAZY_NAMESPACES=lazy_namespaces):
+        import_urlconf.from_json(
+            [
+                {
+                    "isLocalePrefix": True,
+                    "classPath": "django.urls.resolvers.LocalePrefixPattern",
+                    "includes": [
+                        {"regex": {"en": "^color/$", "fr": "^couleur/$"}, "name": "color"},
+                        {
+                            "route": "admin/",
+                            "namespace": "admin",
+                            "app_name": "admin",
+                            "includes": [
+                                {
+                                    "route": {"en": "users/", "fr": "utilisateurs/"},
+                                    "namespace": "users",
+                                    "app_name": "users",
+                                    "includes": [{"route": "<int:pk>/", "name": "user"}],
+                                }
+                            ],
+                        },
+                    ],
+                }
+            ],
+            urlconf="mock_urlconf_module",
+        )
+    result = import_urlconf.warm_up("mock_urlconf_module", threads=threads)
+    assert set(result.language_times) == {"en", "fr"}
+    assert result.total_time > 0
+
+    # Nothing is left for reverse() to prepare
+    with mock.patch.object(URLResolver, "_populate") as mock_populate:
+        with translation.override("en"):
+            assert reverse("color", urlconf="mock_urlconf_module") == "/en/color/"
+            assert (
+                reverse("admin:users:user", urlconf="mock_urlconf_module", kwargs={"pk": 1})
+                == "/en/admin/users/1/"
+            )
+        with translation.override("fr"):
+            assert reverse("color", urlconf="mock_urlconf_module") == "/fr/couleur/"
+            assert (
+                reverse("admin:users:user", urlconf="mock_urlconf_module", kwargs={"pk": 1})
+                == "/fr/admin/utilisateurs/1/"
+            )
+    assert not mock_populate.called
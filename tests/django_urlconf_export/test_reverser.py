@@ -0,0 +1,216 @@
+import subprocess
+import sys
+
+import pytest
+from benchmarks.urlconf_generator import generate_urlconf
+from django.test import override_settings
+from django.urls import NoReverseMatch, reverse
+from django.utils import translation
+
+from django_urlconf_export import compact_format, export_urlconf, import_urlconf, language_utils
+from django_urlconf_export.reverser import Reverser
+
+COLORS = [
+    {
+        "regex": "^colors/",
+        "namespace": "colors_ns",
+        "app_name": "colors_app",
+        "includes": [
+            {"regex": "^red/$", "name": "red"},
+            {"route": "<int:pk>/", "name": "color"},
+            {"regex": r"^(?P<slug>[\w-]+)/(?:(?P<shade>[\w-]+)/)?$", "name": "shade"},
+        ],
+    }
+]
+
+TRANSLATED = [
+    {
+        "isLocalePrefix": True,
+        "classPath": "django.urls.resolvers.LocalePrefixPattern",
+        "includes": [
+            {"route": {"default": "color/", "en-gb": "colour/"}, "name": "color"},
+            {
+                "route": {"en": "shop/<slug:slug>/", "fr": "boutique/<slug:slug>/"},
+                "includes": [{"regex": "^$", "name": "shop"}],
+                "namespace": None,
+                "app_name": None,
+            },
+        ],
+    }
+]
+
+NESTED = [
+    {"route": "login/", "name": "login"},
+    {"route": "sign-in/", "name": "login"},
+    {
+        "route": "<int:year>/",
+        "namespace": None,
+        "app_name": None,
+        "includes": [
+            {
+                "route": "admin/",
+                "namespace": "admin",
+                "app_name": "admin",
+                "includes": [
+                    {"route": "<slug:slug>/", "name": "user"},
+                    {
+                        "route": "secret/",
+                        "namespace": "secret",
+                        "app_name": "secret",
+                        "includes": [{"route": "", "name": "index"}],
+                    },
+                ],
+            },
+            {
+                "route": "staff/",
+                "namespace": "staff",
+                "app_name": "admin",
+                "includes": [{"route": "<slug:slug>/", "name": "user"}],
+            },
+        ],
+    },
+    {"regex": "^search/(?P<query>.+)$", "name": "search"},
+]
+
+
+@pytest.mark.parametrize(
+    "json_urlpatterns, url_name, kwargs, language, expected_url",
+    [
+        (COLORS, "colors_ns:red", None, "en", "/colors/red/"),
+        # An app_name reverses its default instance
+        (COLORS, "colors_app:red", None, "en", "/colors/red/"),
+        (COLORS, "colors_ns:color", {"pk": 7}, "en", "/colors/7/"),
+        (COLORS, "colors_ns:color", {"pk": "seven"}, "en", NoReverseMatch),
+        (COLORS, "colors_ns:shade", {"slug": "red"}, "en", "/colors/red/"),
+        (COLORS, "colors_ns:shade", {"slug": "red", "shade": "dark"}, "en", "/colors/red/dark/"),
+        (COLORS, "colors_ns:shade", {"slug": "red wine"}, "en", NoReverseMatch),
+        (COLORS, "colors_ns:shade", {"shade": "dark"}, "en", NoReverseMatch),
+        (COLORS, "red", None, "en", NoReverseMatch),
+        (COLORS, "missing_ns:red", None, "en", NoReverseMatch),
+        (TRANSLATED, "color", None, "en", "/en/color/"),
+        (TRANSLATED, "color", None, "en-gb", "/en-gb/colour/"),
+        (TRANSLATED, "color", None, "fr", "/fr/color/"),
+        (TRANSLATED, "shop", {"slug": "hats"}, "en-gb", "/en-gb/shop/hats/"),
+        (TRANSLATED, "shop", {"slug": "hats"}, "fr", "/fr/boutique/hats/"),
+        (TRANSLATED, "shop", {"slug": "chapeaux été"}, "fr", NoReverseMatch),
+        # The last url with a name is reversed
+        (NESTED, "login", None, "en", "/sign-in/"),
+        (NESTED, "admin:user", {"year": 2020, "slug": "bob"}, "en", "/2020/admin/bob/"),
+        (NESTED, "staff:user", {"year": 2020, "slug": "bob"}, "en", "/2020/staff/bob/"),
+        (NESTED, "admin:user", {"slug": "bob"}, "en", NoReverseMatch),
+        (NESTED, "admin:secret:index", {"year": 2020}, "en", "/2020/admin/secret/"),
+        (NESTED, "staff:secret:index", {"year": 2020}, "en", NoReverseMatch),
+        (NESTED, "search", {"query": "a b/ü?"}, "en", "/search/a%20b/%C3%BC%3F"),
+    ],
+)
+def test_reverse(mock_urlconf_module, json_urlpatterns, url_name, kwargs, language, expected_url):
+    import_urlconf.from_json(json_urlpatterns, urlconf="mock_urlconf_module")
+    reverser = Reverser(json_urlpatterns)
+
+    if expected_url is NoReverseMatch:
+        with translation.override(language), pytest.raises(NoReverseMatch):
+            reverse(url_name, urlconf="mock_urlconf_module", kwargs=kwargs)
+        with pytest.raises(NoReverseMatch):
+            reverser.reverse(url_name, kwargs, language)
+    else:
+        with translation.override(language):
+            assert reverse(url_name, urlconf="mock_urlconf_module", kwargs=kwargs) == expected_url
+        assert reverser.reverse(url_name, kwargs, language) == expected_url
+
+
+def test_reverse_compact_json():
+    reverser = Reverser(export_urlconf.with_fingerprint(compact_format.compact(TRANSLATED)))
+    assert reverser.reverse("color", language="en-gb") == "/en-gb/colour/"
+
+
+def test_reverse_does_not_change_active_language():
+    reverser = Reverser(TRANSLATED, default_language="en-gb")
+    with translation.override("fr"):
+        assert reverser.reverse("color") == "/en-gb/colour/"
+        assert translation.get_language() == "fr"
+
+
+def test_get_url_names():
+    assert sorted(Reverser(NESTED).get_url_names()) == [
+        "admin:secret:index",
+        "admin:user",
+        "login",
+        "search",
+        "staff:user",
+    ]
+
+
+def test_reverse_generated_urlconf_like_django():
+    languages = ["en", "en-gb", "fr"]
+    url_names = generate_urlconf(
+        urlconf="test_reverser_urlconf",
+        patterns=200,
+        include_depth=2,
+        namespaces=3,
+        languages=languages,
+    )
+    try:
+        with override_settings(LANGUAGES=[(language, language) for language in languages]):
+            json_urlpatterns = export_urlconf.as_json("test_reverser_urlconf")
+        reverser = Reverser(json_urlpatterns, languages=languages)
+        for language in languages:
+            with translation.override(language):
+                for url_name in url_names:
+                    kwargs = {"slug": "a-slug"}
+                    assert reverser.reverse(url_name, kwargs, language) == reverse(
+                        url_name, urlconf="test_reverser_urlconf", kwargs=kwargs
+                    )
+    finally:
+        for module_name in list(sys.modules):
+            if module_name.startswith("test_reverser_urlconf"):
+                del sys.modules[module_name]
+
+
+def test_reverse_without_django_settings():
+    # Run in a new process, where Django settings are not configured
+    code = (
+        "from django_urlconf_export.reverser import Reverser\n"
+        "reverser = Reverser([{'route': 'users/<int:pk>/', 'name': 'user'}])\n"
+        "print(reverser.reverse('user', {'pk': 1}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    assert result.stdout == "/users/1/\n"
+
+
+def test_reverse_with_language_fallbacks():
+    reverser = Reverser(
+        [{"route": {"en": "color/", "pt": "cor/"}, "name": "color"}],
+        language_fallbacks={"pt-br": ["pt"], "ca": ["es"]},
+    )
+    assert reverser.reverse("color", language="pt-br") == "/cor/"
+    with pytest.raises(language_utils.MissingTranslationError):
+        reverser.reverse("color", language="ca")
+
+
+def test_reverse_many(mock_urlconf_module):
+    import_urlconf.from_json(NESTED, urlconf="mock_urlconf_module")
+    reverser = Reverser(NESTED)
+    all_kwargs = [{"year": 2020, "slug": f"user-{i}"} for i in range(3)]
+
+    expected_urls = [
+        reverse("admin:user", urlconf="mock_urlconf_module", kwargs=kwargs) for kwargs in all_kwargs
+    ]
+    assert list(reverser.reverse_many("admin:user", all_kwargs)) == expected_urls
+    assert list(reverser.reverse_many("admin:user", iter(all_kwargs), "fr")) == expected_urls
+
+    urls = reverser.reverse_many(
+        None, [("login", None), ("admin:user", all_kwargs[0]), ("search", {"query": "hats"})]
+    )
+    assert list(urls) == ["/sign-in/", expected_urls[0], "/search/hats"]
+
+
+def test_reverse_many_is_lazy():
+    reverser = Reverser(NESTED)
+    urls = reverser.reverse_many("search", ({"query": query} for query in ["hats", None, ""]))
+    assert next(urls) == "/search/hats"
+    assert next(urls) == "/search/None"
+    # Urls are made as they are iterated, so errors come when they are reached
+    with pytest.raises(NoReverseMatch):
+        next(urls)
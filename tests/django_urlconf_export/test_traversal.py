@@ -0,0 +1,85 @@
+import sys
+
+from django.urls import URLResolver, path
+from django.urls.resolvers import RoutePattern
+from django.views import View
+
+from django_urlconf_export import traversal
+
+JSON_URLPATTERNS = [
+    {"route": "login/", "name": "login"},
+    {
+        "route": "colors/",
+        "includes": [
+            {"route": "red/", "name": "red"},
+            {
+                "route": "blue/",
+                "includes": [{"route": "navy/", "name": "navy"}],
+                "app_name": None,
+                "namespace": "blue",
+            },
+        ],
+        "app_name": "colors",
+        "namespace": "colors",
+    },
+    {"route": "logout/", "name": "logout"},
+]
+
+
+def _get_events(events):
+    return [
+        (event, json_url.get("name", json_url.get("namespace")), [p["namespace"] for p in parents])
+        for event, json_url, parents in events
+    ]
+
+
+def test_walk_json():
+    assert _get_events(traversal.walk_json(JSON_URLPATTERNS)) == [
+        (traversal.URL, "login", []),
+        (traversal.ENTER, "colors", []),
+        (traversal.URL, "red", ["colors"]),
+        (traversal.ENTER, "blue", ["colors"]),
+        (traversal.URL, "navy", ["colors", "blue"]),
+        (traversal.LEAVE, "blue", ["colors"]),
+        (traversal.LEAVE, "colors", []),
+        (traversal.URL, "logout", []),
+    ]
+
+
+def test_walk_should_enter():
+    events = traversal.walk(
+        JSON_URLPATTERNS,
+        lambda json_url: json_url.get("includes"),
+        lambda json_url, parents: json_url["namespace"] != "blue",
+    )
+    assert _get_events(events) == [
+        (traversal.URL, "login", []),
+        (traversal.ENTER, "colors", []),
+        (traversal.URL, "red", ["colors"]),
+        (traversal.LEAVE, "colors", []),
+        (traversal.URL, "logout", []),
+    ]
+
+
+def test_walk_resolver():
+    login = path("login/", View.as_view(), name="login")
+    resolver = URLResolver(RoutePattern("/"), [URLResolver(RoutePattern("account/"), [login])])
+    events = list(traversal.walk_resolver(resolver))
+    included_resolver = resolver.url_patterns[0]
+    assert events == [
+        (traversal.ENTER, included_resolver, ()),
+        (traversal.URL, login, (included_resolver,)),
+        (traversal.LEAVE, included_resolver, ()),
+    ]
+
+
+def test_walk_very_deep_includes():
+    depth = sys.getrecursionlimit() * 2
+    json_urlpatterns = [{"route": "page/", "name": "page"}]
+    for _ in range(depth):
+        json_urlpatterns = [{"route": "x/", "includes": json_urlpatterns, "namespace": None}]
+
+    events = list(traversal.walk_json(json_urlpatterns))
+    assert len(events) == depth * 2 + 1
+    event, json_url, parents = events[depth]
+    assert (event, json_url["name"], len(parents)) == (traversal.URL, "page", depth)